@@ -6,14 +6,43 @@ Flask web app to view and analyze collected pain points.
 Run with: python app.py
 """
 
-from flask import Flask, render_template, request, jsonify
-from backend.models import Opportunity, Tweet, PainAnalysis
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
+from backend.models import Opportunity, Tweet, PainAnalysis, set_read_only_connections
+from backend.search import search_posts, search_opportunities
+from backend.pagination import encode_cursor, decode_cursor
+from backend.sources import SOURCES
 from datetime import datetime, timedelta
+import json
 import os
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 
+# Web requests only read; read-only connections never take the write lock,
+# so the dashboard stays responsive while collectors are writing
+set_read_only_connections(True)
+
+# Related posts shown per page on the opportunity detail page
+POSTS_PER_PAGE = 20
+
+# /api/opportunities page size (JSON format; NDJSON streams are unbounded)
+API_PAGE_SIZE = 50
+MAX_API_PAGE_SIZE = 500
+
+
+@app.template_filter('from_json')
+def from_json(value):
+    """Decode a JSON column (e.g. pain_keywords) in a template."""
+    return json.loads(value) if value else []
+
+
+def count_bands(summary, low, high=None):
+    """Opportunities in a get_stats summary scoring at least low (and below high)."""
+    return sum(
+        count for band, count in summary['bands'].items()
+        if band >= low and (high is None or band < high)
+    )
+
 
 @app.route('/')
 def index():
@@ -23,49 +52,33 @@ def index():
     days = int(request.args.get('days', 7))
     min_score = int(request.args.get('min_score', 40))
     source = request.args.get('source', 'all')
+    selected = source if source in SOURCES else None
 
     # Get opportunities
     opportunities = Opportunity.get_top_opportunities(
         limit=50,
         min_score=min_score,
-        days=days
+        days=days,
+        source=selected
     )
 
-    # Filter by source if specified
-    if source != 'all':
-        source_prefixes = {
-            'hackernews': '[HN]',
-            'stackoverflow': '[SO/',
-            'github': '[GH/',
-            'reddit': '[REDDIT]',
-            'twitter': '[TWITTER]'
-        }
-        prefix = source_prefixes.get(source, '')
-        opportunities = [o for o in opportunities if o['title'].startswith(prefix)]
-
-    # Calculate stats
-    total_opps = len(opportunities)
-    high_value = len([o for o in opportunities if o['score'] >= 70])
-    avg_score = sum(o['score'] for o in opportunities) / total_opps if total_opps > 0 else 0
-
-    # Count by source
-    sources = {
-        'HackerNews': len([o for o in opportunities if o['title'].startswith('[HN]')]),
-        'Stack Overflow': len([o for o in opportunities if '[SO/' in o['title']]),
-        'GitHub': len([o for o in opportunities if '[GH/' in o['title']]),
-        'Reddit': len([o for o in opportunities if '[REDDIT]' in o['title']]),
-        'Twitter': len([o for o in opportunities if '[TWITTER]' in o['title']]),
-    }
+    # Header stats and source counts over the whole date / score window,
+    # read from the daily rollups
+    summary = Opportunity.get_stats(min_score=min_score, days=days, source=selected)
+    counts = (Opportunity.count_by_source(min_score=min_score, days=days)
+              if selected else summary['sources'])
+    sources = {name: counts.get(key, 0) for key, name in SOURCES.items()}
 
     return render_template(
         'index.html',
         opportunities=opportunities,
         stats={
-            'total': total_opps,
-            'high_value': high_value,
-            'avg_score': round(avg_score, 1)
+            'total': summary['total'],
+            'high_value': count_bands(summary, 70),
+            'avg_score': round(summary['avg_score'], 1)
         },
         sources=sources,
+        source_names=SOURCES,
         filters={
             'days': days,
             'min_score': min_score,
@@ -78,71 +91,146 @@ def index():
 def opportunity_detail(opp_id):
     """View detailed information about an opportunity."""
 
+    page = max(1, int(request.args.get('page', 1)))
+
     # Get opportunity
     opp = Opportunity.get_by_id(opp_id)
 
     if not opp:
         return "Opportunity not found", 404
 
-    # Get associated tweets/posts
-    tweets = Opportunity.get_tweets(opp_id)
+    # One page of associated tweets/posts, with their pain analyses
+    tweets = Opportunity.get_tweets_with_analysis(
+        opp_id,
+        limit=POSTS_PER_PAGE,
+        offset=(page - 1) * POSTS_PER_PAGE
+    )
 
-    # Get pain analysis for each tweet
-    for tweet in tweets:
-        pain = PainAnalysis.get_by_tweet(tweet['id'])
-        if pain:
-            tweet['pain_analysis'] = pain
+    # tweet_count is kept current by triggers, so no COUNT(*) is needed
+    total_pages = max(1, -(-(opp['tweet_count'] or 0) // POSTS_PER_PAGE))
 
     return render_template(
         'opportunity.html',
         opportunity=opp,
-        tweets=tweets
+        tweets=tweets,
+        page=page,
+        total_pages=total_pages
     )
 
 
 @app.route('/api/opportunities')
 def api_opportunities():
-    """API endpoint for opportunities (JSON)."""
+    """
+    API endpoint for opportunities, best first.
+
+    Query params:
+        days, min_score, source: Filters
+        limit: Page size (default 50, max 500); no default for ndjson
+        cursor: The X-Next-Cursor header of the previous page
+        format: 'json' (default) for a list of opportunities, or 'ndjson'
+            to stream one opportunity per line straight from the database
+            cursor
+
+    When there are more results, a JSON page carries the cursor for the
+    next one in the X-Next-Cursor response header.
+    """
 
     days = int(request.args.get('days', 7))
     min_score = int(request.args.get('min_score', 40))
-    limit = int(request.args.get('limit', 50))
+    source = request.args.get('source')
+    response_format = request.args.get('format', 'json')
+    token = request.args.get('cursor')
 
-    opportunities = Opportunity.get_top_opportunities(
-        limit=limit,
-        min_score=min_score,
-        days=days
-    )
+    if response_format not in ('json', 'ndjson'):
+        return jsonify({'error': f"Unknown format: {response_format}"}), 400
 
-    return jsonify(opportunities)
+    try:
+        after = decode_cursor(token) if token else None
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    filters = {'min_score': min_score, 'days': days, 'source': source, 'after': after}
+
+    if response_format == 'ndjson':
+        limit = request.args.get('limit')
+        rows = Opportunity.iter_top_opportunities(
+            limit=int(limit) if limit else None,
+            **filters
+        )
+
+        return Response(
+            stream_with_context(json.dumps(opp) + '\n' for opp in rows),
+            mimetype='application/x-ndjson'
+        )
+
+    limit = min(max(1, int(request.args.get('limit', API_PAGE_SIZE))), MAX_API_PAGE_SIZE)
+
+    # One extra row tells whether there is a next page
+    opportunities = list(Opportunity.iter_top_opportunities(limit=limit + 1, **filters))
+    has_more = len(opportunities) > limit
+    opportunities = opportunities[:limit]
+
+    response = jsonify(opportunities)
+    if has_more:
+        response.headers['X-Next-Cursor'] = encode_cursor(opportunities[-1])
+    return response
 
 
 @app.route('/api/stats')
 def api_stats():
-    """API endpoint for statistics (JSON)."""
+    """API endpoint for statistics (JSON), read from the daily rollups."""
 
     days = int(request.args.get('days', 7))
+    min_score = int(request.args.get('min_score', 0))
 
-    all_opps = Opportunity.get_top_opportunities(limit=1000, min_score=0, days=days)
+    summary = Opportunity.get_stats(min_score=min_score, days=days)
 
     stats = {
-        'total_opportunities': len(all_opps),
-        'high_value': len([o for o in all_opps if o['score'] >= 70]),
-        'medium_value': len([o for o in all_opps if 50 <= o['score'] < 70]),
-        'low_value': len([o for o in all_opps if 40 <= o['score'] < 50]),
-        'avg_score': sum(o['score'] for o in all_opps) / len(all_opps) if all_opps else 0,
-        'sources': {
-            'hackernews': len([o for o in all_opps if o['title'].startswith('[HN]')]),
-            'stackoverflow': len([o for o in all_opps if '[SO/' in o['title']]),
-            'github': len([o for o in all_opps if '[GH/' in o['title']]),
-            'reddit': len([o for o in all_opps if '[REDDIT]' in o['title']]),
-            'twitter': len([o for o in all_opps if '[TWITTER]' in o['title']]),
-        }
+        'total_opportunities': summary['total'],
+        'high_value': count_bands(summary, 70),
+        'medium_value': count_bands(summary, 50, 70),
+        'low_value': count_bands(summary, 40, 50),
+        'avg_score': summary['avg_score'],
+        'sources': {key: summary['sources'].get(key, 0) for key in SOURCES},
+        'posts_today': Tweet.count_today(),
     }
 
     return jsonify(stats)
 
 
+@app.route('/api/search')
+def api_search():
+    """
+    Full-text search over posts and opportunities (JSON).
+
+    Query params:
+        q: Search words (all must match; "word*" for prefix)
+        type: 'opportunities', 'posts' or 'all' (default)
+        page, per_page: Pagination (per_page max 100)
+    """
+
+    query = request.args.get('q', '').strip()
+    search_type = request.args.get('type', 'all')
+    page = int(request.args.get('page', 1))
+    per_page = int(request.args.get('per_page', 20))
+
+    if not query:
+        return jsonify({'error': 'Missing search query (q)'}), 400
+
+    if search_type not in ('all', 'opportunities', 'posts'):
+        return jsonify({'error': f"Unknown search type: {search_type}"}), 400
+
+    results = {'query': query}
+
+    if search_type in ('all', 'opportunities'):
+        results['opportunities'] = search_opportunities(query, page=page, per_page=per_page)
+
+    if search_type in ('all', 'posts'):
+        results['posts'] = search_posts(query, page=page, per_page=per_page)
+
+    return jsonify(results)
+
+
 if __name__ == '__main__':
     # Run in development mode
     # For production, use gunicorn or similar WSGI server
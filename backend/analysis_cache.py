@@ -0,0 +1,329 @@
+"""
+Pain Analysis Cache
+
+Memoizes analyze_pain results in a SQLite side table so the same post
+(re-fetched by several queries, cross-posted to several subreddits, ...)
+is only analyzed once.
+
+Cache keys are a hash of the normalized text plus the lexicon
+fingerprint from pain_detector, so any lexicon change invalidates old
+entries automatically. Entries are evicted least-recently-used first
+once the cache is full, and expire after a TTL.
+
+Cache hits are read-only: the keys they touch are buffered and their
+last_used_at written in one statement batch with the next put (or
+eviction, or every TOUCH_FLUSH_EVERY hits), so a hit never takes the
+write lock that collectors are competing for.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from backend.models import get_db_connection
+from backend.pain_detector import (
+    LEXICON_FINGERPRINT,
+    STREAM_WINDOW_SIZE,
+    analyze_pain,
+    analyze_pain_batch,
+    pain_columns,
+)
+
+
+# Run eviction every N writes rather than on every insert
+EVICT_EVERY = 500
+
+# Write buffered last_used_at updates after at most this many cache hits
+TOUCH_FLUSH_EVERY = 200
+
+CACHE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS pain_analysis_cache (
+        cache_key TEXT PRIMARY KEY,
+        lexicon_version TEXT NOT NULL,
+        result TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_analysis_cache_last_used ON pain_analysis_cache(last_used_at)",
+]
+
+
+def create_cache_table(conn):
+    """Create the cache table and its LRU index if missing."""
+    cursor = conn.cursor()
+
+    for statement in CACHE_SCHEMA:
+        cursor.execute(statement)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for cache keys.
+
+    Only changes that can't affect analyze_pain output (surrounding
+    whitespace, line endings), so equal keys always mean equal results.
+    """
+    return text.replace('\r\n', '\n').strip()
+
+
+def normalized_windows(text: str, window_size: int = STREAM_WINDOW_SIZE) -> Iterator[str]:
+    """
+    normalize_text(text), as consecutive pieces of about window_size
+    characters, without copying the whole text.
+
+    Windows never end on a '\r' (so a '\r\n' is never split), and
+    trailing whitespace is held back until non-whitespace follows it.
+    """
+    started = False
+    pending = ''
+    start = 0
+
+    while start < len(text):
+        end = start + window_size
+        while text[end - 1:end] == '\r':
+            end += 1
+        window = text[start:end].replace('\r\n', '\n')
+        start = end
+
+        if not started:
+            window = window.lstrip()
+            if not window:
+                continue
+            started = True
+
+        body = window.rstrip()
+        if body:
+            yield pending + body
+            pending = window[len(body):]
+        else:
+            pending += window
+
+
+def make_cache_key(text: str, fingerprint: str = LEXICON_FINGERPRINT) -> str:
+    """
+    Build cache key from lexicon fingerprint + normalized text.
+
+    The text is hashed window by window, so keying a multi-megabyte page
+    (see analyze_pain_stream) stays in bounded memory.
+    """
+    digest = hashlib.sha256()
+    digest.update(fingerprint.encode('utf-8'))
+    digest.update(b'\0')
+    for window in normalized_windows(text):
+        digest.update(window.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """
+    SQLite-backed LRU/TTL cache of analyze_pain results.
+
+    max_entries and ttl_days default to ANALYSIS_CACHE_MAX_ENTRIES and
+    ANALYSIS_CACHE_TTL_DAYS; 0 turns off the size bound / expiry.
+    """
+
+    def __init__(self, max_entries: int = None, ttl_days: int = None):
+        if max_entries is None:
+            max_entries = int(os.getenv('ANALYSIS_CACHE_MAX_ENTRIES', 100000))
+        if ttl_days is None:
+            ttl_days = int(os.getenv('ANALYSIS_CACHE_TTL_DAYS', 30))
+
+        self.max_entries = max_entries
+        self.ttl_days = ttl_days
+        self._writes = 0
+        # cache_key -> time of its latest hit, not yet written
+        self._touched = {}
+
+    def get(self, text: str) -> Optional[Dict]:
+        """Get cached analysis for text, or None on a miss."""
+        cache_key = make_cache_key(text)
+        return self._get_keys([cache_key]).get(cache_key)
+
+    def _get_keys(self, cache_keys: Sequence[str]) -> Dict[str, Dict]:
+        """Cached analyses of the keys that hit, in one query."""
+        if not cache_keys:
+            return {}
+
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT cache_key, result FROM pain_analysis_cache
+                WHERE cache_key IN ({', '.join('?' * len(cache_keys))})
+                AND (? = 0 OR created_at >= DATETIME('now', '-' || ? || ' days'))
+            """, (*cache_keys, self.ttl_days, self.ttl_days))
+            rows = cursor.fetchall()
+
+        # Mark as recently used (LRU); written with the next flush
+        used_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        for row in rows:
+            self._touched[row['cache_key']] = used_at
+        if len(self._touched) >= TOUCH_FLUSH_EVERY:
+            self.flush()
+
+        return {row['cache_key']: json.loads(row['result']) for row in rows}
+
+    def put(self, text: str, analysis: Dict):
+        """Store analysis for text."""
+        self._put_keys([(make_cache_key(text), analysis)])
+
+    def _put_keys(self, entries: List[Tuple[str, Dict]]):
+        """Store (cache_key, analysis) pairs in one transaction."""
+        with get_db_connection() as conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO pain_analysis_cache
+                (cache_key, lexicon_version, result)
+                VALUES (?, ?, ?)
+            """, [(cache_key, LEXICON_FINGERPRINT, json.dumps(analysis))
+                  for cache_key, analysis in entries])
+            self._write_touched(conn.cursor())
+            conn.commit()
+
+        # Evict whenever the write count crosses a multiple of EVICT_EVERY
+        before = self._writes
+        self._writes += len(entries)
+        if self._writes // EVICT_EVERY > before // EVICT_EVERY:
+            self.evict()
+
+    def _write_touched(self, cursor):
+        """Write buffered last_used_at updates without committing."""
+        if not self._touched:
+            return
+
+        cursor.executemany("""
+            UPDATE pain_analysis_cache
+            SET last_used_at = MAX(last_used_at, ?)
+            WHERE cache_key = ?
+        """, [(used_at, cache_key) for cache_key, used_at in self._touched.items()])
+        self._touched = {}
+
+    def flush(self):
+        """Write buffered last_used_at updates in one transaction."""
+        if not self._touched:
+            return
+
+        with get_db_connection() as conn:
+            self._write_touched(conn.cursor())
+            conn.commit()
+
+    def analyze(self, text: str, analyzer: Callable[[str], Dict] = analyze_pain) -> Dict:
+        """
+        Get analysis from cache, running analyzer on a miss.
+
+        analyzer must produce the same result as analyze_pain (e.g.
+        analyze_pain_stream for very long documents).
+        """
+        cache_key = make_cache_key(text)
+        analysis = self._get_keys([cache_key]).get(cache_key)
+
+        if analysis is None:
+            analysis = analyzer(text)
+            self._put_keys([(cache_key, analysis)])
+
+        return analysis
+
+    def analyze_many(self, texts: Sequence[str]) -> List[Dict]:
+        """
+        Analyses of many texts: one cache lookup for all of them, and the
+        misses analyzed together with analyze_pain_batch and stored in
+        one transaction.
+        """
+        cache_keys = [make_cache_key(text) for text in texts]
+        analyses = self._get_keys(list(set(cache_keys)))
+
+        # Texts that miss, once each
+        missing = {}
+        for cache_key, text in zip(cache_keys, texts):
+            if cache_key not in analyses:
+                missing.setdefault(cache_key, text)
+
+        if missing:
+            fresh = dict(zip(missing, analyze_pain_batch(list(missing.values()))['analyses']))
+            self._put_keys(list(fresh.items()))
+            analyses.update(fresh)
+
+        return [analyses[cache_key] for cache_key in cache_keys]
+
+    def evict(self) -> int:
+        """
+        Evict stale entries.
+
+        Removes entries from other lexicon versions, entries past the TTL
+        (unless ttl_days is 0), and least-recently-used entries beyond
+        max_entries (unless it is 0).
+
+        Returns number of entries removed.
+        """
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+
+            # LRU order must include the hits not written yet
+            self._write_touched(cursor)
+
+            cursor.execute("""
+                DELETE FROM pain_analysis_cache
+                WHERE lexicon_version != ?
+                OR (? > 0 AND created_at < DATETIME('now', '-' || ? || ' days'))
+            """, (LEXICON_FINGERPRINT, self.ttl_days, self.ttl_days))
+            removed = cursor.rowcount
+
+            if self.max_entries > 0:
+                cursor.execute("""
+                    DELETE FROM pain_analysis_cache
+                    WHERE cache_key IN (
+                        SELECT cache_key FROM pain_analysis_cache
+                        ORDER BY last_used_at DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_entries,))
+                removed += cursor.rowcount
+
+            conn.commit()
+            return removed
+
+
+_default_cache = None
+
+
+def _cache_disabled() -> bool:
+    """Whether ANALYSIS_CACHE=0 bypasses the cache."""
+    return os.getenv('ANALYSIS_CACHE', '1') == '0'
+
+
+def get_cache() -> AnalysisCache:
+    """Get the shared cache (its buffered hits are written at exit)."""
+    global _default_cache
+
+    if _default_cache is None:
+        _default_cache = AnalysisCache()
+        atexit.register(_default_cache.flush)
+
+    return _default_cache
+
+
+def cached_analyze_pain(text: str, analyzer: Callable[[str], Dict] = analyze_pain) -> Dict:
+    """
+    Drop-in replacement for analyze_pain backed by the shared cache.
+
+    Set ANALYSIS_CACHE=0 to bypass the cache entirely.
+    """
+    if _cache_disabled():
+        return analyzer(text)
+
+    return get_cache().analyze(text, analyzer)
+
+
+def cached_analyze_pain_batch(texts: Sequence[str]) -> Dict:
+    """
+    Drop-in replacement for analyze_pain_batch backed by the shared cache.
+
+    Set ANALYSIS_CACHE=0 to bypass the cache entirely.
+    """
+    if _cache_disabled():
+        return analyze_pain_batch(texts)
+
+    return pain_columns(get_cache().analyze_many(texts))
@@ -0,0 +1,364 @@
+"""
+Online Opportunity Clustering
+
+Assigns each new post to an existing opportunity about the same problem,
+or starts a new opportunity, as posts arrive.
+
+- Posts are vectorized with hashed TF-IDF (terms hashed into a fixed
+  number of buckets; document frequencies kept in SQLite).
+- Candidate opportunities come from a MinHash LSH index over the post's
+  term set, so each insert only looks at opportunities sharing an LSH
+  bucket, never the whole table.
+- Candidates are ranked by cosine similarity between the post vector and
+  each opportunity's centroid vector.
+"""
+
+import json
+import math
+import os
+import random
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from backend.dedupe import feature_hash, to_signed
+from backend.models import get_db_connection
+
+
+# Hashed feature space for TF-IDF terms
+HASH_BUCKETS = 1 << 18
+
+# MinHash LSH: BANDS x ROWS hash functions. Two posts become candidates if
+# all ROWS minhashes agree in any band (~25% Jaccard similarity threshold)
+LSH_BANDS = 16
+LSH_ROWS = 2
+
+# Ignore LSH buckets beyond this many opportunities (keeps lookups bounded)
+MAX_CANDIDATES_PER_BUCKET = 50
+
+# Terms kept in each opportunity centroid
+CENTROID_TERMS = 100
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+# Fixed seed: signatures must be identical across processes and runs
+_rng = random.Random(1729)
+_MINHASH_COEFFICIENTS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(LSH_BANDS * LSH_ROWS)
+]
+
+WORD_PATTERN = re.compile(r'[a-z][a-z0-9\'-]+')
+
+STOPWORDS = {
+    'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'any', 'can',
+    'had', 'her', 'was', 'one', 'our', 'out', 'has', 'have', 'his', 'how',
+    'its', 'may', 'new', 'now', 'old', 'see', 'two', 'way', 'who', 'did',
+    'get', 'got', 'let', 'say', 'she', 'too', 'use', 'with', 'that', 'this',
+    'from', 'they', 'will', 'would', 'there', 'their', 'what', 'about',
+    'which', 'when', 'make', 'like', 'just', 'than', 'them', 'been', 'into',
+    'some', 'could', 'then', 'does', 'also', 'your', 'more', 'very', 'want',
+    'anyone', 'know', 'why', 'i\'m', 'it\'s', 'don\'t', 'really', 'still',
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase terms, minus stopwords and very short words."""
+    return [
+        word for word in WORD_PATTERN.findall(text.lower())
+        if len(word) > 2 and word not in STOPWORDS
+    ]
+
+
+def term_bucket(term: str) -> int:
+    """Hash a term into the TF-IDF feature space."""
+    return feature_hash(term) % HASH_BUCKETS
+
+
+def minhash_signature(buckets: Set[int]) -> List[int]:
+    """MinHash signature of a set of term buckets."""
+    if not buckets:
+        return []
+
+    return [
+        min((a * bucket + b) % _MERSENNE_PRIME for bucket in buckets)
+        for a, b in _MINHASH_COEFFICIENTS
+    ]
+
+
+def lsh_keys(signature: List[int]) -> List[Tuple[int, int]]:
+    """(band, bucket) LSH keys for a MinHash signature."""
+    keys = []
+
+    for band in range(LSH_BANDS if signature else 0):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        keys.append((band, to_signed(feature_hash(','.join(map(str, rows))))))
+
+    return keys
+
+
+def cosine(a: Dict[int, float], b: Dict[int, float]) -> float:
+    """Cosine similarity of two L2-normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(bucket, 0.0) for bucket, weight in a.items())
+
+
+def normalize(vector: Dict[int, float], max_terms: int = None) -> Dict[int, float]:
+    """L2-normalize a sparse vector, optionally keeping only its heaviest terms."""
+    if max_terms and len(vector) > max_terms:
+        vector = dict(sorted(vector.items(), key=lambda item: item[1], reverse=True)[:max_terms])
+
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if not norm:
+        return {}
+
+    return {bucket: weight / norm for bucket, weight in vector.items()}
+
+
+CLUSTER_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS cluster_term_df (
+        bucket INTEGER PRIMARY KEY,
+        df INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS cluster_meta (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS opportunity_vectors (
+        opportunity_id INTEGER PRIMARY KEY,
+        vector TEXT NOT NULL,
+        post_count INTEGER NOT NULL DEFAULT 1,
+        FOREIGN KEY (opportunity_id) REFERENCES opportunities(id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS opportunity_lsh_bands (
+        band INTEGER NOT NULL,
+        bucket INTEGER NOT NULL,
+        opportunity_id INTEGER NOT NULL,
+        PRIMARY KEY (band, bucket, opportunity_id)
+    ) WITHOUT ROWID
+    """,
+]
+
+
+def create_cluster_tables(conn):
+    """Create the clustering tables if missing."""
+    cursor = conn.cursor()
+
+    for statement in CLUSTER_SCHEMA:
+        cursor.execute(statement)
+
+
+class OpportunityClusterer:
+    """Incremental clustering of posts into opportunities."""
+
+    def __init__(self, similarity_threshold: float = None):
+        self.similarity_threshold = similarity_threshold or float(
+            os.getenv('CLUSTER_SIMILARITY_THRESHOLD', 0.35))
+
+    def _observe(self, conn, buckets: Set[int]) -> Dict[int, float]:
+        """Record a document's terms in the DF table and return their IDF weights."""
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            INSERT INTO cluster_meta (key, value) VALUES ('document_count', 1)
+            ON CONFLICT(key) DO UPDATE SET value = value + 1
+        """)
+        cursor.executemany("""
+            INSERT INTO cluster_term_df (bucket, df) VALUES (?, 1)
+            ON CONFLICT(bucket) DO UPDATE SET df = df + 1
+        """, [(bucket,) for bucket in buckets])
+
+        cursor.execute("SELECT value FROM cluster_meta WHERE key = 'document_count'")
+        document_count = cursor.fetchone()['value']
+
+        placeholders = ','.join('?' * len(buckets))
+        cursor.execute(f"""
+            SELECT bucket, df FROM cluster_term_df
+            WHERE bucket IN ({placeholders})
+        """, list(buckets))
+
+        return {
+            row['bucket']: math.log((1 + document_count) / (1 + row['df'])) + 1
+            for row in cursor.fetchall()
+        }
+
+    def vectorize(self, conn, text: str) -> Tuple[Dict[int, float], Set[int]]:
+        """Hashed TF-IDF vector (L2-normalized) and term bucket set for a new post."""
+        counts = Counter(term_bucket(term) for term in tokenize(text))
+        if not counts:
+            return {}, set()
+
+        idf = self._observe(conn, set(counts))
+        vector = {
+            bucket: (1 + math.log(count)) * idf[bucket]
+            for bucket, count in counts.items()
+        }
+
+        return normalize(vector), set(counts)
+
+    def find_match(self, conn, vector: Dict[int, float],
+                   keys: List[Tuple[int, int]]) -> Tuple[Optional[int], float]:
+        """Find the most similar opportunity among LSH candidates."""
+        if not vector or not keys:
+            return None, 0.0
+
+        cursor = conn.cursor()
+        candidates = set()
+
+        for band, bucket in keys:
+            cursor.execute("""
+                SELECT opportunity_id FROM opportunity_lsh_bands
+                WHERE band = ? AND bucket = ?
+                ORDER BY opportunity_id DESC
+                LIMIT ?
+            """, (band, bucket, MAX_CANDIDATES_PER_BUCKET))
+            candidates.update(row['opportunity_id'] for row in cursor.fetchall())
+
+        if not candidates:
+            return None, 0.0
+
+        placeholders = ','.join('?' * len(candidates))
+        cursor.execute(f"""
+            SELECT opportunity_id, vector FROM opportunity_vectors
+            WHERE opportunity_id IN ({placeholders})
+        """, list(candidates))
+
+        best_id, best_similarity = None, 0.0
+        for row in cursor.fetchall():
+            centroid = {int(k): v for k, v in json.loads(row['vector']).items()}
+            similarity = cosine(vector, centroid)
+            if similarity > best_similarity:
+                best_id, best_similarity = row['opportunity_id'], similarity
+
+        if best_similarity < self.similarity_threshold:
+            return None, best_similarity
+
+        return best_id, best_similarity
+
+    def _index(self, conn, opportunity_id: int, vector: Dict[int, float],
+               keys: List[Tuple[int, int]]):
+        """Fold a post vector into an opportunity's centroid and LSH buckets."""
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT vector, post_count FROM opportunity_vectors
+            WHERE opportunity_id = ?
+        """, (opportunity_id,))
+        row = cursor.fetchone()
+
+        if row:
+            # Running mean of member vectors
+            count = row['post_count']
+            centroid = {int(k): v * count for k, v in json.loads(row['vector']).items()}
+            for bucket, weight in vector.items():
+                centroid[bucket] = centroid.get(bucket, 0.0) + weight
+            count += 1
+        else:
+            centroid, count = dict(vector), 1
+
+        centroid = normalize(centroid, max_terms=CENTROID_TERMS)
+
+        cursor.execute("""
+            INSERT OR REPLACE INTO opportunity_vectors (opportunity_id, vector, post_count)
+            VALUES (?, ?, ?)
+        """, (opportunity_id, json.dumps(centroid), count))
+
+        cursor.executemany("""
+            INSERT OR IGNORE INTO opportunity_lsh_bands (band, bucket, opportunity_id)
+            VALUES (?, ?, ?)
+        """, [(band, bucket, opportunity_id) for band, bucket in keys])
+
+    def assign(self, tweet_id: int, text: str, score: int,
+               title: str, description: str, source: str = None) -> Tuple[int, bool]:
+        """
+        Assign a stored post to an opportunity.
+
+        Joins the most similar existing opportunity (raising its score if
+        this post scores higher, and updating tweet_count / last_seen), or
+        creates a new opportunity from title/description/source.
+
+        Returns:
+            Tuple of (opportunity_id, created: bool)
+        """
+        with get_db_connection() as conn:
+            try:
+                assignment = self.write(conn.cursor(), tweet_id, text, score,
+                                        title, description, source)
+                conn.commit()
+
+            except Exception:
+                conn.rollback()
+                raise
+
+        return assignment
+
+    def write(self, cursor, tweet_id: int, text: str, score: int,
+              title: str, description: str, source: str = None) -> Tuple[int, bool]:
+        """
+        Assign a stored post to an opportunity without committing (see assign).
+
+        DF counts, opportunity, link and index rows are written together,
+        so a failure can't leave an opportunity without a vector (one that
+        could never be matched again).
+        """
+        conn = cursor.connection
+
+        vector, buckets = self.vectorize(conn, text)
+        keys = lsh_keys(minhash_signature(buckets))
+        opportunity_id, _ = self.find_match(conn, vector, keys)
+
+        created = opportunity_id is None
+
+        if created:
+            now = datetime.now().isoformat()
+            cursor.execute("""
+                INSERT INTO opportunities
+                (title, description, score, tweet_count, first_seen, last_seen, source)
+                VALUES (?, ?, ?, 0, ?, ?, ?)
+                RETURNING id
+            """, (title, description, score, now, now, source))
+            opportunity_id = cursor.fetchone()[0]
+        else:
+            cursor.execute("""
+                UPDATE opportunities
+                SET score = MAX(score, ?)
+                WHERE id = ?
+            """, (score, opportunity_id))
+
+        # tweet_count / last_seen are updated by triggers (backend/counters.py)
+        cursor.execute("""
+            INSERT OR IGNORE INTO opportunity_tweets (opportunity_id, tweet_id)
+            VALUES (?, ?)
+        """, (opportunity_id, tweet_id))
+
+        self._index(conn, opportunity_id, vector, keys)
+
+        return opportunity_id, created
+
+
+_default_clusterer = None
+
+
+def get_clusterer() -> OpportunityClusterer:
+    """Get the shared clusterer."""
+    global _default_clusterer
+
+    if _default_clusterer is None:
+        _default_clusterer = OpportunityClusterer()
+
+    return _default_clusterer
+
+
+def assign_to_opportunity(tweet_id: int, text: str, score: int,
+                          title: str, description: str, source: str = None) -> Tuple[int, bool]:
+    """Assign a stored post to an opportunity using the shared clusterer."""
+    return get_clusterer().assign(tweet_id, text, score, title, description, source)
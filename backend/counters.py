@@ -0,0 +1,153 @@
+"""
+Opportunity Counters
+
+Triggers on opportunity_tweets keep each opportunity's aggregates current
+as posts are linked and unlinked:
+
+- tweet_count: number of linked posts
+- max_engagement: highest engagement_score among linked posts
+- last_seen: when a post was last linked
+
+Linking a post is then O(1) instead of recounting every link of the
+opportunity (popular clusters hold thousands of posts).
+
+reconcile_counters() recomputes tweet_count and max_engagement from the
+links, one range of opportunities per transaction; run it periodically
+(collect_all.py does, at the end of every run) to repair any drift, e.g.
+from rows edited by hand.
+"""
+
+from backend.migrations import BATCH_PAUSE_SECONDS, BATCH_SIZE, id_batches, run_batched
+
+
+# Same format as datetime.now().isoformat() (local time, so values compare
+# correctly with the ones the models write)
+NOW_ISO = "strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')"
+
+COUNTER_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS opportunity_tweets_counters_insert
+    AFTER INSERT ON opportunity_tweets BEGIN
+        UPDATE opportunities
+        SET tweet_count = COALESCE(tweet_count, 0) + 1,
+            max_engagement = MAX(
+                COALESCE(max_engagement, 0),
+                COALESCE((SELECT engagement_score FROM posts WHERE id = new.tweet_id), 0)
+            ),
+            last_seen = MAX(COALESCE(last_seen, ''), {NOW_ISO})
+        WHERE id = new.opportunity_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS opportunity_tweets_counters_delete
+    AFTER DELETE ON opportunity_tweets BEGIN
+        UPDATE opportunities
+        SET tweet_count = MAX(COALESCE(tweet_count, 0) - 1, 0),
+            max_engagement = COALESCE((
+                SELECT MAX(t.engagement_score) FROM opportunity_tweets ot
+                JOIN posts t ON t.id = ot.tweet_id
+                WHERE ot.opportunity_id = old.opportunity_id
+            ), 0)
+        WHERE id = old.opportunity_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tweets_counters_engagement
+    AFTER UPDATE OF engagement_score ON posts BEGIN
+        UPDATE opportunities
+        SET max_engagement = MAX(COALESCE(max_engagement, 0), COALESCE(new.engagement_score, 0))
+        WHERE id IN (SELECT opportunity_id FROM opportunity_tweets WHERE tweet_id = new.id);
+    END
+    """,
+]
+
+
+def create_counter_triggers(conn) -> bool:
+    """
+    Add the max_engagement column and counter triggers if missing.
+
+    Existing counters are reconciled, in batches, after the triggers are
+    first created (reconciling sets each counter to its true value, so
+    links made by the triggers meanwhile aren't lost).
+
+    Returns:
+        True if the triggers were created now
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT 1 FROM sqlite_master
+        WHERE type = 'trigger' AND name = 'opportunity_tweets_counters_insert'
+    """)
+    created = cursor.fetchone() is None
+
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(opportunities)")]
+    if 'max_engagement' not in columns:
+        cursor.execute("ALTER TABLE opportunities ADD COLUMN max_engagement INTEGER DEFAULT 0")
+
+    for statement in COUNTER_TRIGGERS:
+        cursor.execute(statement)
+    conn.commit()
+
+    if created:
+        reconcile_counters(conn)
+
+    return created
+
+
+def ensure_counter_triggers(conn):
+    """Create the counter triggers on a database that has opportunities but no triggers yet."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT name FROM sqlite_master
+        WHERE (type = 'table' AND name = 'opportunity_tweets')
+           OR (type = 'trigger' AND name = 'opportunity_tweets_counters_insert')
+    """)
+    names = {row[0] for row in cursor.fetchall()}
+
+    if names == {'opportunity_tweets'}:
+        create_counter_triggers(conn)
+
+
+def reconcile_counters(conn, batch_size: int = BATCH_SIZE,
+                       pause: float = BATCH_PAUSE_SECONDS) -> int:
+    """
+    Recompute tweet_count and max_engagement for every opportunity.
+
+    Opportunities are visited in id ranges, one transaction each, and
+    only rows whose stored values are wrong are written.
+
+    Returns:
+        Number of opportunities corrected
+    """
+    corrected = 0
+
+    for low, high in id_batches(conn, 'opportunities', batch_size=batch_size, pause=pause):
+        corrected += conn.execute("""
+            UPDATE opportunities
+            SET tweet_count = stats.tweet_count,
+                max_engagement = stats.max_engagement
+            FROM (
+                SELECT ot.opportunity_id,
+                       COUNT(*) AS tweet_count,
+                       COALESCE(MAX(t.engagement_score), 0) AS max_engagement
+                FROM opportunity_tweets ot
+                LEFT JOIN posts t ON t.id = ot.tweet_id
+                WHERE ot.opportunity_id > ? AND ot.opportunity_id <= ?
+                GROUP BY ot.opportunity_id
+            ) AS stats
+            WHERE opportunities.id = stats.opportunity_id
+            AND (opportunities.tweet_count IS NOT stats.tweet_count
+                 OR opportunities.max_engagement IS NOT stats.max_engagement)
+        """, (low, high)).rowcount
+        conn.commit()
+
+    corrected += run_batched(conn, 'opportunities', """
+        UPDATE opportunities
+        SET tweet_count = 0, max_engagement = 0
+        WHERE (tweet_count IS NOT 0 OR max_engagement IS NOT 0)
+        AND NOT EXISTS (
+            SELECT 1 FROM opportunity_tweets ot WHERE ot.opportunity_id = opportunities.id
+        )
+    """, batch_size, pause)
+
+    return corrected
@@ -0,0 +1,278 @@
+"""
+Near-Duplicate Detection
+
+SimHash fingerprints of stored posts, indexed with LSH banding so that
+"is this a near-duplicate?" is answered without scanning every post.
+
+A 64-bit fingerprint is split into 4 bands of 16 bits. Two posts within
+Hamming distance 3 must agree exactly on at least one band, so looking
+up the 4 bands of a new post finds every near-duplicate candidate; only
+those few candidates are compared bit by bit.
+
+Text without any words (empty, punctuation or emoji only) has no
+fingerprint: all such posts would hash to 0 and "match" each other, so
+they are never looked up or indexed.
+"""
+
+import hashlib
+import re
+from typing import Dict, Iterable, List, Optional
+
+from backend.models import get_db_connection
+
+
+FINGERPRINT_BITS = 64
+BAND_COUNT = 4
+BAND_BITS = FINGERPRINT_BITS // BAND_COUNT
+
+# Max differing bits to still count as a near-duplicate (must be < BAND_COUNT)
+MAX_HAMMING_DISTANCE = 3
+
+FINGERPRINT_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS post_fingerprints (
+        tweet_id INTEGER PRIMARY KEY,
+        simhash INTEGER NOT NULL,
+        FOREIGN KEY (tweet_id) REFERENCES posts(id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS post_fingerprint_bands (
+        band INTEGER NOT NULL,
+        band_value INTEGER NOT NULL,
+        tweet_id INTEGER NOT NULL,
+        PRIMARY KEY (band, band_value, tweet_id)
+    ) WITHOUT ROWID
+    """,
+]
+
+# Words per shingle
+SHINGLE_SIZE = 3
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def feature_hash(feature: str) -> int:
+    """Stable 64-bit hash of a feature (unlike hash(), the same in every process)."""
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(features: Dict[str, float]) -> int:
+    """
+    Weighted SimHash of a feature -> weight mapping.
+
+    Similar feature sets get fingerprints that differ in few bits.
+    """
+    totals = [0.0] * FINGERPRINT_BITS
+
+    for feature, weight in features.items():
+        h = feature_hash(feature)
+        for bit in range(FINGERPRINT_BITS):
+            if (h >> bit) & 1:
+                totals[bit] += weight
+            else:
+                totals[bit] -= weight
+
+    fingerprint = 0
+    for bit, total in enumerate(totals):
+        if total > 0:
+            fingerprint |= 1 << bit
+
+    return fingerprint
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Dict[str, float]:
+    """Word shingles of normalized text (lowercase, punctuation stripped)."""
+    words = WORD_PATTERN.findall(text.lower())
+
+    if len(words) < size:
+        return {' '.join(words): 1.0} if words else {}
+
+    return {' '.join(words[i:i + size]): 1.0 for i in range(len(words) - size + 1)}
+
+
+def fingerprint(text: str) -> Optional[int]:
+    """SimHash fingerprint of a post's text, or None if it has no words."""
+    features = shingles(text)
+    return simhash(features) if features else None
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return bin(a ^ b).count('1')
+
+
+def split_bands(value: int, band_count: int = BAND_COUNT,
+                band_bits: int = BAND_BITS) -> List[int]:
+    """Split a fingerprint into band values."""
+    mask = (1 << band_bits) - 1
+    return [(value >> (band * band_bits)) & mask for band in range(band_count)]
+
+
+def to_signed(value: int) -> int:
+    """Convert unsigned 64-bit fingerprint to SQLite's signed INTEGER."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def to_unsigned(value: int) -> int:
+    """Convert SQLite's signed INTEGER back to unsigned 64-bit fingerprint."""
+    return value + (1 << 64) if value < 0 else value
+
+
+def create_fingerprint_tables(conn):
+    """Create the near-duplicate index tables if missing."""
+    cursor = conn.cursor()
+
+    for statement in FINGERPRINT_SCHEMA:
+        cursor.execute(statement)
+
+
+class NearDuplicateIndex:
+    """LSH index of stored post fingerprints (post_fingerprints tables)."""
+
+    def __init__(self, max_distance: int = MAX_HAMMING_DISTANCE):
+        if max_distance >= BAND_COUNT:
+            raise ValueError(f"max_distance must be < {BAND_COUNT} for banded lookup")
+
+        self.max_distance = max_distance
+
+    def find(self, text: str) -> Optional[int]:
+        """
+        Find a stored near-duplicate of text.
+
+        Returns the internal tweet id of the closest match, or None.
+        """
+        return self.find_fingerprint(fingerprint(text))
+
+    def find_fingerprint(self, value: Optional[int]) -> Optional[int]:
+        """Find the closest stored post within max_distance of a fingerprint."""
+        if value is None:
+            return None
+
+        bands = split_bands(value)
+
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+
+            clauses = ' OR '.join(['(b.band = ? AND b.band_value = ?)'] * BAND_COUNT)
+            params = [p for band, band_value in enumerate(bands) for p in (band, band_value)]
+
+            cursor.execute(f"""
+                SELECT DISTINCT f.tweet_id, f.simhash
+                FROM post_fingerprint_bands b
+                JOIN post_fingerprints f ON f.tweet_id = b.tweet_id
+                WHERE {clauses}
+            """, params)
+
+            best_id = None
+            best_distance = self.max_distance + 1
+
+            for row in cursor.fetchall():
+                distance = hamming_distance(value, to_unsigned(row['simhash']))
+                if distance < best_distance:
+                    best_id, best_distance = row['tweet_id'], distance
+
+            return best_id
+
+    def add(self, tweet_id: int, text: str):
+        """Index a stored post (no-op for text without words)."""
+        value = fingerprint(text)
+        if value is not None:
+            self.add_many([(tweet_id, value)])
+
+    def add_many(self, fingerprints: Iterable):
+        """Index (tweet_id, fingerprint) pairs in one transaction."""
+        with get_db_connection() as conn:
+            self.write(conn.cursor(), fingerprints)
+            conn.commit()
+
+    def write(self, cursor, fingerprints: Iterable):
+        """Index (tweet_id, fingerprint) pairs without committing."""
+        fingerprints = list(fingerprints)
+
+        cursor.executemany("""
+            INSERT OR REPLACE INTO post_fingerprints (tweet_id, simhash)
+            VALUES (?, ?)
+        """, [(tweet_id, to_signed(value)) for tweet_id, value in fingerprints])
+
+        cursor.executemany("""
+            INSERT OR IGNORE INTO post_fingerprint_bands (band, band_value, tweet_id)
+            VALUES (?, ?, ?)
+        """, [
+            (band, band_value, tweet_id)
+            for tweet_id, value in fingerprints
+            for band, band_value in enumerate(split_bands(value))
+        ])
+
+
+_default_index = None
+
+
+def get_index() -> NearDuplicateIndex:
+    """Get the shared near-duplicate index."""
+    global _default_index
+
+    if _default_index is None:
+        _default_index = NearDuplicateIndex()
+
+    return _default_index
+
+
+def find_near_duplicate(post_fingerprint: Optional[int]) -> Optional[int]:
+    """Find a stored post near a fingerprint. Returns internal tweet id or None."""
+    return get_index().find_fingerprint(post_fingerprint)
+
+
+def index_post(tweet_id: int, post_fingerprint: Optional[int]):
+    """Add a stored post's fingerprint to the near-duplicate index (if it has one)."""
+    if post_fingerprint is not None:
+        get_index().add_many([(tweet_id, post_fingerprint)])
+
+
+def attach_near_duplicate(original_tweet_id: int, post: Dict) -> Optional[int]:
+    """
+    Store a near-duplicate post and attach it to the original's opportunities.
+
+    The post is stored (so exact-ID dedupe catches it next time) but is not
+    analyzed and does not get an opportunity of its own. Both happen in one
+    transaction (see ingest_post). Nothing is stored if the original isn't
+    linked to any opportunity, i.e. it didn't pass the score threshold.
+
+    Args:
+        original_tweet_id: Internal id of the stored near-duplicate
+        post: Tweet.create keyword arguments for the new post
+
+    Returns:
+        Internal id of the new post, or None if nothing was stored
+    """
+    from backend.ingest import ingest_post
+
+    stored = ingest_post(post, attach_to=original_tweet_id)
+    return stored['tweet_id'] if stored else None
+
+
+def rebuild_index(batch_size: int = 1000) -> int:
+    """Fingerprint every stored post that isn't indexed yet. Returns posts indexed."""
+    index = get_index()
+    last_id = 0
+    indexed = 0
+
+    while True:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT t.id, t.text FROM posts t
+                LEFT JOIN post_fingerprints f ON f.tweet_id = t.id
+                WHERE t.id > ? AND f.tweet_id IS NULL
+                ORDER BY t.id
+                LIMIT ?
+            """, (last_id, batch_size))
+            rows = cursor.fetchall()
+
+        if not rows:
+            return indexed
+
+        fingerprints = ((row['id'], fingerprint(row['text'])) for row in rows)
+        index.add_many((tweet_id, value) for tweet_id, value in fingerprints if value is not None)
+        indexed += len(rows)
+        last_id = rows[-1]['id']
@@ -0,0 +1,507 @@
+"""
+Feature Store
+
+Typed, one-row-per-post table (post_features) of everything analyze_pain
+measures, written at ingest time (migration 0009 backfills older posts).
+Scoring formulas can then be re-run over the stored numbers without
+re-analyzing any text.
+
+MicroSaaS scoring also looks at the opportunity's own title and
+description; those phrase counts live in opportunity_features and are
+computed once per opportunity (titles and descriptions never change).
+
+The SEO component counts distinct phrases found anywhere in title,
+description and the post's pain keywords, so each side stores which
+phrases it hit as bit masks (MicroSaaSScorer.seo_masks): the post's
+keyword masks in post_features, the title + description masks in
+opportunity_features. Scoring ORs them and counts the bits. Unlike the
+text scorer, a phrase that only occurs across the description/keywords
+boundary isn't counted.
+"""
+
+import json
+from typing import Dict, List
+
+from backend.models import get_db_connection
+from backend.microsaas_scoring import IN_KEYWORDS, get_scorer, calculate_microsaas_scores
+from backend.migrations import BATCH_PAUSE_SECONDS, BATCH_SIZE, id_batches
+from backend.pain_detector import analyze_pain
+from backend.scoring import calculate_opportunity_scores
+
+
+POST_FEATURE_COLUMNS = [
+    'frustration_score',
+    'budget_signal_score',
+    'has_solution_seeking',
+    'has_time_investment',
+    'has_paid_tool',
+    'dollar_amount_count',
+    'max_dollar_amount',
+    'exclamation_count',
+    'caps_ratio',
+    'frustration_hits',
+    'solution_seeking_hits',
+    'budget_hits',
+    'paid_tool_hits',
+    'time_investment_hits',
+    'product_count',
+    'pain_keyword_count',
+    'extreme_pain_hits',
+    'keyword_intent_mask',
+    'keyword_problem_mask',
+    'keyword_b2b_mask',
+]
+
+# Opportunity text features (see MicroSaaSScorer.features)
+OPPORTUNITY_FEATURE_COLUMNS = [
+    'intent_hits',
+    'problem_hits',
+    'b2b_hits',
+    'self_service_points',
+    'mentions_smb',
+    'enterprise_only',
+    'recurring_points',
+    'one_time',
+    'intent_mask',
+    'problem_mask',
+    'b2b_mask',
+]
+
+# SEO phrase masks: (opportunity column, post column, feature it counts)
+SEO_MASKS = [
+    ('intent_mask', 'keyword_intent_mask', 'intent_hits'),
+    ('problem_mask', 'keyword_problem_mask', 'problem_hits'),
+    ('b2b_mask', 'keyword_b2b_mask', 'b2b_hits'),
+]
+
+FEATURE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS post_features (
+        tweet_id INTEGER PRIMARY KEY,
+        frustration_score INTEGER NOT NULL,
+        budget_signal_score INTEGER NOT NULL,
+        has_solution_seeking INTEGER NOT NULL,
+        has_time_investment INTEGER NOT NULL,
+        has_paid_tool INTEGER NOT NULL,
+        dollar_amount_count INTEGER NOT NULL,
+        max_dollar_amount REAL,
+        exclamation_count INTEGER NOT NULL,
+        caps_ratio REAL NOT NULL,
+        frustration_hits INTEGER NOT NULL,
+        solution_seeking_hits INTEGER NOT NULL,
+        budget_hits INTEGER NOT NULL,
+        paid_tool_hits INTEGER NOT NULL,
+        time_investment_hits INTEGER NOT NULL,
+        product_count INTEGER NOT NULL,
+        pain_keyword_count INTEGER NOT NULL,
+        extreme_pain_hits INTEGER NOT NULL,
+        keyword_intent_mask INTEGER NOT NULL DEFAULT 0,
+        keyword_problem_mask INTEGER NOT NULL DEFAULT 0,
+        keyword_b2b_mask INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (tweet_id) REFERENCES posts(id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS opportunity_features (
+        opportunity_id INTEGER PRIMARY KEY,
+        intent_hits INTEGER NOT NULL,
+        problem_hits INTEGER NOT NULL,
+        b2b_hits INTEGER NOT NULL,
+        self_service_points INTEGER NOT NULL,
+        mentions_smb INTEGER NOT NULL,
+        enterprise_only INTEGER NOT NULL,
+        recurring_points INTEGER NOT NULL,
+        one_time INTEGER NOT NULL,
+        intent_mask INTEGER NOT NULL DEFAULT 0,
+        problem_mask INTEGER NOT NULL DEFAULT 0,
+        b2b_mask INTEGER NOT NULL DEFAULT 0,
+        FOREIGN KEY (opportunity_id) REFERENCES opportunities(id) ON DELETE CASCADE
+    )
+    """,
+]
+
+
+def create_feature_tables(conn):
+    """Create post_features and opportunity_features if missing."""
+    cursor = conn.cursor()
+
+    for statement in FEATURE_SCHEMA:
+        cursor.execute(statement)
+
+
+def parse_dollar_amount(amount: str) -> float:
+    """Numeric value of an extracted dollar amount ('$1,000/mo' -> 1000.0)."""
+    return float(amount.lstrip('$').split('/')[0].replace(',', ''))
+
+
+def post_feature_row(pain_analysis: Dict) -> Dict:
+    """Flatten an analyze_pain result into post_features columns."""
+    hit_counts = pain_analysis.get('hit_counts', {})
+    dollar_amounts = pain_analysis.get('dollar_amounts', [])
+    keywords = {'pain_keywords': pain_analysis['pain_keywords']}
+    keyword_features = get_scorer().features({}, keywords)
+    keyword_masks = get_scorer().seo_masks({}, keywords, IN_KEYWORDS)
+
+    return {
+        'frustration_score': pain_analysis['frustration_score'],
+        'budget_signal_score': pain_analysis['budget_signal_score'],
+        'has_solution_seeking': int(pain_analysis.get('has_solution_seeking', False)),
+        'has_time_investment': int(pain_analysis.get('has_time_investment', False)),
+        'has_paid_tool': int(hit_counts.get('paid_tool', 0) > 0),
+        'dollar_amount_count': len(dollar_amounts),
+        'max_dollar_amount': max(map(parse_dollar_amount, dollar_amounts), default=None),
+        'exclamation_count': pain_analysis.get('exclamation_count', 0),
+        'caps_ratio': pain_analysis.get('caps_ratio', 0.0),
+        'frustration_hits': hit_counts.get('frustration', 0),
+        'solution_seeking_hits': hit_counts.get('solution_seeking', 0),
+        'budget_hits': hit_counts.get('budget', 0),
+        'paid_tool_hits': hit_counts.get('paid_tool', 0),
+        'time_investment_hits': hit_counts.get('time_investment', 0),
+        'product_count': len(pain_analysis.get('products_mentioned', [])),
+        'pain_keyword_count': len(pain_analysis['pain_keywords']),
+        'extreme_pain_hits': keyword_features['extreme_pain_hits'],
+        'keyword_intent_mask': keyword_masks['intent_mask'],
+        'keyword_problem_mask': keyword_masks['problem_mask'],
+        'keyword_b2b_mask': keyword_masks['b2b_mask'],
+    }
+
+
+def opportunity_feature_row(opportunity: Dict) -> Dict:
+    """Text features of an opportunity's title and description (opportunity_features columns)."""
+    scorer = get_scorer()
+    row = scorer.features(opportunity, {})
+    row.update(scorer.seo_masks(opportunity, {}))
+    return {column: int(row[column]) for column in OPPORTUNITY_FEATURE_COLUMNS}
+
+
+def store_post_features(tweet_id: int, pain_analysis: Dict):
+    """Write the feature row for a stored post."""
+    store_post_features_many([(tweet_id, pain_analysis)])
+
+
+def store_post_features_many(analyses):
+    """Write feature rows for (tweet_id, pain_analysis) pairs in one transaction."""
+    with get_db_connection() as conn:
+        write_post_features(conn.cursor(), analyses)
+        conn.commit()
+
+
+def write_post_features(cursor, analyses):
+    """Write feature rows for (tweet_id, pain_analysis) pairs without committing."""
+    rows = [
+        [tweet_id] + [row[column] for column in POST_FEATURE_COLUMNS]
+        for tweet_id, row in ((tweet_id, post_feature_row(analysis))
+                              for tweet_id, analysis in analyses)
+    ]
+
+    placeholders = ', '.join('?' * (len(POST_FEATURE_COLUMNS) + 1))
+
+    cursor.executemany(f"""
+        INSERT OR REPLACE INTO post_features
+        (tweet_id, {', '.join(POST_FEATURE_COLUMNS)})
+        VALUES ({placeholders})
+    """, rows)
+
+
+def write_opportunity_features(cursor, opportunities):
+    """Write feature rows for opportunity dicts (id, title, description) without committing."""
+    placeholders = ', '.join('?' * (len(OPPORTUNITY_FEATURE_COLUMNS) + 1))
+
+    values = []
+    for opportunity in opportunities:
+        features = opportunity_feature_row(opportunity)
+        values.append([opportunity['id']] + [features[c] for c in OPPORTUNITY_FEATURE_COLUMNS])
+
+    cursor.executemany(f"""
+        INSERT OR REPLACE INTO opportunity_features
+        (opportunity_id, {', '.join(OPPORTUNITY_FEATURE_COLUMNS)})
+        VALUES ({placeholders})
+    """, values)
+
+
+def index_opportunity_features(batch_size: int = 1000, low: int = 0, high: int = None) -> int:
+    """
+    Compute text features for opportunities that don't have them yet.
+
+    Only opportunities with low < id <= high are indexed (no upper bound
+    if high is None). Returns count added.
+    """
+    added = 0
+
+    while True:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT o.id, o.title, o.description FROM opportunities o
+                LEFT JOIN opportunity_features f ON f.opportunity_id = o.id
+                WHERE f.opportunity_id IS NULL
+                AND o.id > ? AND (? IS NULL OR o.id <= ?)
+                LIMIT ?
+            """, (low, high, high, batch_size))
+            rows = [dict(row) for row in cursor.fetchall()]
+
+            if not rows:
+                return added
+
+            write_opportunity_features(cursor, rows)
+            conn.commit()
+            added += len(rows)
+
+
+def backfill_features(conn, batch_size: int = BATCH_SIZE,
+                      pause: float = BATCH_PAUSE_SECONDS) -> int:
+    """
+    Write the feature rows of posts and opportunities stored without them.
+
+    A post's row is computed by re-analyzing its text, with the scores,
+    products and keywords of its latest stored pain analysis kept as
+    they are, so stored-feature scoring agrees with the analysis text
+    scoring reads (a NULL score counts as 0). Posts without a pain
+    analysis get no row. Rows are
+    visited in id ranges, one transaction each; only missing rows are
+    written, so an interrupted run resumes where it stopped.
+
+    Returns:
+        Number of feature rows written
+    """
+    written = 0
+
+    for low, high in id_batches(conn, 'posts', batch_size=batch_size, pause=pause):
+        rows = conn.execute("""
+            SELECT t.id, t.text, COALESCE(pa.frustration_score, 0),
+                   COALESCE(pa.budget_signal_score, 0), pa.products_mentioned, pa.pain_keywords
+            FROM posts t
+            JOIN pain_analysis pa ON pa.id = (
+                SELECT MAX(id) FROM pain_analysis WHERE tweet_id = t.id
+            )
+            LEFT JOIN post_features f ON f.tweet_id = t.id
+            WHERE t.id > ? AND t.id <= ? AND f.tweet_id IS NULL
+        """, (low, high)).fetchall()
+
+        analyses = []
+        for tweet_id, text, frustration, budget, products, keywords in rows:
+            analysis = analyze_pain(text or '')
+            analysis.update(
+                frustration_score=frustration,
+                budget_signal_score=budget,
+                products_mentioned=json.loads(products or '[]'),
+                pain_keywords=json.loads(keywords or '[]'),
+            )
+            analyses.append((tweet_id, analysis))
+
+        write_post_features(conn.cursor(), analyses)
+        conn.commit()
+        written += len(analyses)
+
+    for low, high in id_batches(conn, 'opportunities', batch_size=batch_size, pause=pause):
+        rows = conn.execute("""
+            SELECT o.id, o.title, o.description
+            FROM opportunities o
+            LEFT JOIN opportunity_features f ON f.opportunity_id = o.id
+            WHERE o.id > ? AND o.id <= ? AND f.opportunity_id IS NULL
+        """, (low, high)).fetchall()
+
+        write_opportunity_features(conn.cursor(), [
+            {'id': opportunity_id, 'title': title, 'description': description}
+            for opportunity_id, title, description in rows
+        ])
+        conn.commit()
+        written += len(rows)
+
+    return written
+
+
+def backfill_seo_masks(conn, batch_size: int = BATCH_SIZE,
+                       pause: float = BATCH_PAUSE_SECONDS) -> int:
+    """
+    Fill in the SEO phrase masks of feature rows written before they existed.
+
+    Post masks come from the post's latest pain analysis, opportunity
+    masks from its title and description. Rows are visited in id
+    ranges, one transaction each; only rows whose masks are all 0 are
+    recomputed, so an interrupted run resumes where it stopped.
+
+    Returns:
+        Number of feature rows updated
+    """
+    scorer = get_scorer()
+    updated = 0
+
+    for low, high in id_batches(conn, 'posts', batch_size=batch_size, pause=pause):
+        rows = conn.execute("""
+            SELECT f.tweet_id, pa.pain_keywords
+            FROM post_features f
+            JOIN pain_analysis pa ON pa.id = (
+                SELECT MAX(id) FROM pain_analysis WHERE tweet_id = f.tweet_id
+            )
+            WHERE f.tweet_id > ? AND f.tweet_id <= ?
+            AND f.keyword_intent_mask = 0 AND f.keyword_problem_mask = 0
+            AND f.keyword_b2b_mask = 0
+        """, (low, high)).fetchall()
+
+        values = []
+        for tweet_id, keywords in rows:
+            masks = scorer.seo_masks({}, {'pain_keywords': json.loads(keywords or '[]')}, IN_KEYWORDS)
+            values.append((masks['intent_mask'], masks['problem_mask'], masks['b2b_mask'], tweet_id))
+
+        conn.executemany("""
+            UPDATE post_features
+            SET keyword_intent_mask = ?, keyword_problem_mask = ?, keyword_b2b_mask = ?
+            WHERE tweet_id = ?
+        """, values)
+        conn.commit()
+        updated += len(values)
+
+    for low, high in id_batches(conn, 'opportunities', batch_size=batch_size, pause=pause):
+        rows = conn.execute("""
+            SELECT o.id, o.title, o.description
+            FROM opportunity_features f
+            JOIN opportunities o ON o.id = f.opportunity_id
+            WHERE f.opportunity_id > ? AND f.opportunity_id <= ?
+            AND f.intent_mask = 0 AND f.problem_mask = 0 AND f.b2b_mask = 0
+        """, (low, high)).fetchall()
+
+        values = []
+        for opportunity_id, title, description in rows:
+            masks = scorer.seo_masks({'title': title, 'description': description}, {})
+            values.append((masks['intent_mask'], masks['problem_mask'], masks['b2b_mask'], opportunity_id))
+
+        conn.executemany("""
+            UPDATE opportunity_features
+            SET intent_mask = ?, problem_mask = ?, b2b_mask = ?
+            WHERE opportunity_id = ?
+        """, values)
+        conn.commit()
+        updated += len(values)
+
+    return updated
+
+
+def _count_bits(*masks):
+    """Number of bits set in the OR of integer mask arrays, per element."""
+    import numpy as np
+
+    masks = np.bitwise_or.reduce([np.asarray(m, dtype=np.int64) for m in masks])
+    counts = np.zeros(masks.shape, dtype=np.int32)
+
+    while masks.any():
+        counts += (masks & 1).astype(np.int32)
+        masks = masks >> 1
+
+    return counts
+
+
+def _columns(rows, names: List[str]) -> Dict:
+    """Turn fetched rows into a dict of NumPy columns."""
+    import numpy as np
+
+    return {name: np.array([row[name] for row in rows]) for name in names}
+
+
+def load_post_features() -> Dict:
+    """
+    Load every post's features (plus engagement counts) as NumPy columns.
+
+    Returns dict with tweet_id, likes, retweets, replies and every
+    POST_FEATURE_COLUMNS entry (max_dollar_amount is NaN where absent).
+    """
+    import numpy as np
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT f.tweet_id, t.likes, t.retweets, t.replies,
+                   {', '.join('f.' + c for c in POST_FEATURE_COLUMNS)}
+            FROM post_features f
+            JOIN posts t ON t.id = f.tweet_id
+            ORDER BY f.tweet_id
+        """)
+        rows = cursor.fetchall()
+
+    columns = _columns(rows, ['tweet_id', 'likes', 'retweets', 'replies'] + POST_FEATURE_COLUMNS)
+    columns['max_dollar_amount'] = np.array(
+        [np.nan if row['max_dollar_amount'] is None else row['max_dollar_amount'] for row in rows],
+        dtype=np.float64)
+    return columns
+
+
+def score_posts() -> Dict:
+    """
+    Opportunity scores for every stored post, from stored features only.
+
+    Returns calculate_opportunity_scores output plus the tweet_id column.
+    """
+    features = load_post_features()
+
+    scores = calculate_opportunity_scores(
+        features['likes'],
+        features['retweets'],
+        features['frustration_score'],
+        features['budget_signal_score'],
+        features['has_solution_seeking'],
+        features['has_time_investment'],
+    )
+    scores['tweet_id'] = features['tweet_id']
+    return scores
+
+
+def score_opportunities_microsaas(low: int = 0, high: int = None) -> Dict:
+    """
+    MicroSaaS scores for opportunities with low < id <= high (every
+    opportunity by default), from stored features only.
+
+    Each opportunity is scored with its primary post (highest engagement),
+    as rescore_microsaas.py does. Opportunities without an analyzed post
+    are skipped. SEO phrase hits are the phrases found in the title and
+    description or in the post's pain keywords (masks OR-ed together).
+
+    Returns calculate_microsaas_scores output plus the opportunity_id column.
+    """
+    index_opportunity_features(low=low, high=high)
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            WITH primary_posts AS (
+                SELECT ot.opportunity_id, ot.tweet_id,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY ot.opportunity_id
+                           ORDER BY t.engagement_score DESC, t.id
+                       ) AS rank
+                FROM opportunity_tweets ot
+                JOIN posts t ON t.id = ot.tweet_id
+                WHERE ot.opportunity_id > ? AND (? IS NULL OR ot.opportunity_id <= ?)
+            )
+            SELECT o.opportunity_id,
+                   {', '.join('o.' + c for c in OPPORTUNITY_FEATURE_COLUMNS)},
+                   f.frustration_score, f.budget_signal_score, f.extreme_pain_hits,
+                   {', '.join('f.' + post for _, post, _ in SEO_MASKS)}
+            FROM opportunity_features o
+            JOIN primary_posts p ON p.opportunity_id = o.opportunity_id AND p.rank = 1
+            JOIN post_features f ON f.tweet_id = p.tweet_id
+            ORDER BY o.opportunity_id
+        """, (low, high, high))
+        rows = cursor.fetchall()
+
+    columns = _columns(rows, ['opportunity_id'] + OPPORTUNITY_FEATURE_COLUMNS
+                       + ['frustration_score', 'budget_signal_score', 'extreme_pain_hits']
+                       + [post for _, post, _ in SEO_MASKS])
+
+    for opportunity, post, hits in SEO_MASKS:
+        columns[hits] = _count_bits(columns[opportunity], columns[post])
+
+    scores = calculate_microsaas_scores(
+        intent_hits=columns['intent_hits'],
+        problem_hits=columns['problem_hits'],
+        b2b_hits=columns['b2b_hits'],
+        self_service_points=columns['self_service_points'],
+        mentions_smb=columns['mentions_smb'],
+        enterprise_only=columns['enterprise_only'],
+        frustration_score=columns['frustration_score'],
+        budget_score=columns['budget_signal_score'],
+        extreme_pain_hits=columns['extreme_pain_hits'],
+        recurring_points=columns['recurring_points'],
+        one_time=columns['one_time'],
+    )
+    scores['opportunity_id'] = columns['opportunity_id']
+    return scores
@@ -0,0 +1,178 @@
+"""
+Dashboard Query Indexes
+
+The dashboard's recency filters are timestamp ranges on the raw column
+(created_at >= DATE('now', '-N days')) instead of DATE(column)
+comparisons, so SQLite can search an index rather than evaluate DATE()
+on every row.
+
+idx_opportunities_recent holds the columns those queries filter and
+sort on (created_at, score, tweet_count): the score filter is applied
+from the index and only matching rows are read from the table. source
+is appended so per-source counts that can't come from the daily
+rollups (see backend/rollups.py) are answered from the index alone.
+
+check_query_plans() runs the dashboard queries against a database and
+checks with EXPLAIN QUERY PLAN that each one still uses its index.
+"""
+
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+DASHBOARD_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_opportunities_recent ON opportunities(created_at, score, tweet_count, source)",
+    "CREATE INDEX IF NOT EXISTS idx_tweets_collected_at ON posts(collected_at)",
+]
+
+# Indexes only the dashboard queries used; dropped so the planner can't
+# pick them over the range search (and they only slow down writes)
+SUPERSEDED_INDEXES = ['idx_opportunities_created', 'idx_opportunities_score']
+
+
+def create_dashboard_indexes(conn):
+    """
+    Create the dashboard indexes and drop the ones they supersede.
+
+    Each index is built in its own transaction, so on a large database
+    the write lock is released between builds.
+    """
+    cursor = conn.cursor()
+
+    for statement in DASHBOARD_INDEXES:
+        cursor.execute(statement)
+        conn.commit()
+
+    for name in SUPERSEDED_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+    conn.commit()
+
+
+def ensure_dashboard_indexes(conn):
+    """Create the dashboard indexes on a database that has opportunities but not the indexes yet."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT name FROM sqlite_master
+        WHERE (type = 'table' AND name = 'opportunities')
+           OR (type = 'index' AND name = 'idx_opportunities_recent')
+    """)
+    names = {row[0] for row in cursor.fetchall()}
+
+    if names == {'opportunities'}:
+        create_dashboard_indexes(conn)
+
+
+def query_plan(conn, sql: str) -> List[str]:
+    """Return the EXPLAIN QUERY PLAN steps for a statement (parameters already bound)."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+@contextmanager
+def captured_queries(conn):
+    """Collect the SELECT statements run on conn, with parameter values expanded."""
+    statements = []
+
+    def trace(sql):
+        if sql.lstrip().upper().startswith('SELECT'):
+            statements.append(sql)
+
+    conn.set_trace_callback(trace)
+    try:
+        yield statements
+    finally:
+        conn.set_trace_callback(None)
+
+
+def _dashboard_checks() -> List[Dict]:
+    """Dashboard queries and the index each must use."""
+    from backend.models import Opportunity, Tweet
+    from backend.mentions import posts_mentioning, top_keywords, top_products
+
+    return [
+        {
+            'name': 'Opportunity.get_top_opportunities',
+            'run': lambda: Opportunity.get_top_opportunities(limit=50, min_score=40, days=7),
+            'index': 'idx_opportunities_recent',
+        },
+        {
+            'name': 'Opportunity.get_top_opportunities(source)',
+            'run': lambda: Opportunity.get_top_opportunities(limit=50, min_score=40, days=7,
+                                                             source='hackernews'),
+            'index': 'idx_opportunities_source',
+        },
+        {
+            'name': 'Opportunity.get_stats',
+            'run': lambda: Opportunity.get_stats(min_score=40, days=7),
+            'index': 'PRIMARY KEY',
+        },
+        {
+            'name': 'Opportunity.get_stats(partial band)',
+            'run': lambda: Opportunity.get_stats(min_score=45, days=7),
+            'index': 'idx_opportunities_recent',
+        },
+        {
+            'name': 'Tweet.count_today',
+            'run': Tweet.count_today,
+            'index': 'PRIMARY KEY',
+        },
+        {
+            'name': 'Tweet.exists_in_source',
+            'run': lambda: Tweet.exists_in_source('hackernews', '1'),
+            'index': 'idx_posts_source_external_id',
+        },
+        {
+            'name': 'mentions.posts_mentioning',
+            'run': lambda: posts_mentioning('airtable'),
+            'index': 'idx_product_mentions_product',
+        },
+        {
+            'name': 'mentions.top_keywords',
+            'run': lambda: top_keywords(days=7),
+            'index': 'idx_tweets_collected_at',
+        },
+        {
+            'name': 'mentions.top_products',
+            'run': lambda: top_products(days=7),
+            'index': 'idx_tweets_collected_at',
+        },
+    ]
+
+
+def check_query_plans(checks: List[Dict] = None) -> List[Dict]:
+    """
+    Run the dashboard queries and check that each one searches its index.
+
+    Args:
+        checks: Dicts with 'name', 'run' (callable issuing the query
+            through backend.models) and 'index' (expected index name, or
+            'PRIMARY KEY' for a WITHOUT ROWID table's key).
+            Defaults to the dashboard queries.
+
+    Returns:
+        One dict per check with name, index, plan (list of steps) and ok
+    """
+    from backend.models import get_db_connection
+
+    results = []
+
+    for check in checks or _dashboard_checks():
+        run: Callable = check['run']
+
+        with get_db_connection() as conn:
+            with captured_queries(conn) as statements:
+                run()
+
+            plan = [step for sql in statements for step in query_plan(conn, sql)]
+
+        uses_index = any(
+            step.startswith('SEARCH') and f" {check['index']} (" in step
+            for step in plan
+        )
+        results.append({
+            'name': check['name'],
+            'index': check['index'],
+            'plan': plan,
+            'ok': uses_index,
+        })
+
+    return results
@@ -0,0 +1,137 @@
+"""
+Post Ingest
+
+ingest_post() stores a collected post together with everything derived
+from it (pain analysis, feature row, product mention and keyword hit
+rows, near-duplicate fingerprint, and its opportunity plus the link
+between them) in a single transaction. The opportunity is either a new
+one per post, or the one found by clustering (backend/clustering.py).
+
+Either all of it is written or none of it is: a crash or error partway
+through can't leave a stored post without its analysis or opportunity.
+
+Near-duplicates of a stored post go through the same path with
+attach_to: the post is stored and linked to the original's
+opportunities in one transaction, without an analysis of its own.
+"""
+
+import json
+from datetime import datetime
+from typing import Dict, Optional
+
+from backend.models import get_db_connection, post_row, POST_COLUMNS
+from backend.mentions import write_mentions
+from backend import features
+from backend.dedupe import get_index
+from backend.clustering import get_clusterer
+
+
+def ingest_post(post: Dict, pain_analysis: Dict = None, opportunity: Dict = None,
+                post_fingerprint: int = None, attach_to: int = None,
+                cluster: Dict = None) -> Optional[Dict]:
+    """
+    Store a post, its pain analysis and its opportunity atomically.
+
+    Args:
+        post: Tweet.create keyword arguments
+        pain_analysis: analyze_pain result for the post (None for a
+            near-duplicate stored with attach_to)
+        opportunity: Opportunity.create keyword arguments (title,
+            description, score, optional first_seen / last_seen / source /
+            external_id; source and external_id default to the post's), or
+            None to store the post without an opportunity
+        post_fingerprint: SimHash fingerprint to add to the near-duplicate
+            index, if any
+        attach_to: Internal id of a stored post this one is a near-duplicate
+            of; the post is linked to all of that post's opportunities
+        cluster: Instead of opportunity, OpportunityClusterer.assign keyword
+            arguments (title, description, score, optional source): the
+            post joins the most similar opportunity or starts a new one
+
+    Returns:
+        Dict with the new tweet_id and opportunity_id (None without an
+        opportunity), or None if nothing was written: the post is already
+        stored under the same (source, external_id), or attach_to isn't
+        linked to any opportunity (it didn't pass the score threshold)
+    """
+    index = get_index()
+    clusterer = get_clusterer() if cluster else None
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(f"""
+                INSERT INTO posts ({', '.join(POST_COLUMNS)})
+                VALUES ({', '.join('?' * len(POST_COLUMNS))})
+                ON CONFLICT DO NOTHING
+                RETURNING id
+            """, post_row(post))
+            row = cursor.fetchone()
+
+            if row is None:
+                conn.rollback()
+                return None
+
+            tweet_id = row['id']
+
+            if attach_to is not None:
+                cursor.execute("""
+                    INSERT INTO opportunity_tweets (opportunity_id, tweet_id)
+                    SELECT opportunity_id, ? FROM opportunity_tweets
+                    WHERE tweet_id = ?
+                """, (tweet_id, attach_to))
+
+                if cursor.rowcount == 0:
+                    conn.rollback()
+                    return None
+
+            if pain_analysis is not None:
+                cursor.execute("""
+                    INSERT INTO pain_analysis
+                    (tweet_id, frustration_score, budget_signal_score, products_mentioned, pain_keywords)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (tweet_id, pain_analysis['frustration_score'], pain_analysis['budget_signal_score'],
+                      json.dumps(pain_analysis.get('products_mentioned') or []),
+                      json.dumps(pain_analysis.get('pain_keywords') or [])))
+
+                features.write_post_features(cursor, [(tweet_id, pain_analysis)])
+                write_mentions(cursor, [(tweet_id, pain_analysis)])
+
+            if post_fingerprint is not None:
+                index.write(cursor, [(tweet_id, post_fingerprint)])
+
+            opportunity_id = None
+            if opportunity:
+                now = datetime.now().isoformat()
+                cursor.execute("""
+                    INSERT INTO opportunities
+                    (title, description, score, tweet_count, first_seen, last_seen,
+                     source, external_id)
+                    VALUES (?, ?, ?, 0, ?, ?, ?, ?)
+                    RETURNING id
+                """, (opportunity['title'], opportunity['description'], opportunity['score'],
+                      opportunity.get('first_seen') or now, opportunity.get('last_seen') or now,
+                      opportunity.get('source', post.get('source')),
+                      opportunity.get('external_id', post.get('external_id'))))
+                opportunity_id = cursor.fetchone()['id']
+
+                cursor.execute("""
+                    INSERT INTO opportunity_tweets (opportunity_id, tweet_id)
+                    VALUES (?, ?)
+                """, (opportunity_id, tweet_id))
+
+            elif cluster:
+                opportunity_id, _ = clusterer.write(
+                    cursor, tweet_id, post['text'], cluster['score'],
+                    cluster['title'], cluster['description'],
+                    cluster.get('source', post.get('source'))
+                )
+
+            conn.commit()
+
+        except Exception:
+            conn.rollback()
+            raise
+
+    return {'tweet_id': tweet_id, 'opportunity_id': opportunity_id}
@@ -0,0 +1,259 @@
+"""
+Product Mentions and Keyword Hits
+
+pain_analysis keeps products_mentioned and pain_keywords as JSON text,
+which can only be searched by decoding every row. The same values are
+also written, one row per (post, value), to two indexed tables:
+
+- product_mentions(post_id, product): case-insensitive product names
+- keyword_hits(post_id, keyword, category): pain keywords with their
+  lexicon category (frustration, solution_seeking, time_investment;
+  NULL for keywords that aren't in the lexicons)
+
+post_id is posts.id. Rows are written together with the pain analysis
+(write_mentions replaces a post's rows, so re-analysis doesn't leave
+stale ones). backfill_mentions() fills them in for analyses stored
+before the tables existed (scripts/backfill_mentions.py).
+"""
+
+import json
+from typing import Dict, Iterable, List, Tuple
+
+from backend.migrations import BATCH_PAUSE_SECONDS, id_batches
+from backend.pain_detector import LEXICONS
+
+# Lexicon categories that make up pain_keywords (see extract_pain_keywords)
+KEYWORD_CATEGORIES = {
+    keyword: category
+    for category in ('frustration', 'solution_seeking', 'time_investment')
+    for keyword in LEXICONS[category]
+}
+
+BACKFILL_BATCH_SIZE = 1000
+
+MENTION_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS product_mentions (
+        post_id INTEGER NOT NULL,
+        product TEXT NOT NULL COLLATE NOCASE,
+        PRIMARY KEY (post_id, product),
+        FOREIGN KEY (post_id) REFERENCES posts(id) ON DELETE CASCADE
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_product_mentions_product ON product_mentions(product, post_id)",
+    """
+    CREATE TABLE IF NOT EXISTS keyword_hits (
+        post_id INTEGER NOT NULL,
+        keyword TEXT NOT NULL,
+        category TEXT,
+        PRIMARY KEY (post_id, keyword),
+        FOREIGN KEY (post_id) REFERENCES posts(id) ON DELETE CASCADE
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_keyword_hits_keyword ON keyword_hits(keyword, post_id)",
+    "CREATE INDEX IF NOT EXISTS idx_keyword_hits_category ON keyword_hits(category, keyword)",
+    # Foreign keys aren't enforced on every connection, so clean up explicitly
+    """
+    CREATE TRIGGER IF NOT EXISTS tweets_mentions_delete AFTER DELETE ON posts BEGIN
+        DELETE FROM product_mentions WHERE post_id = old.id;
+        DELETE FROM keyword_hits WHERE post_id = old.id;
+    END
+    """,
+]
+
+
+def create_mention_tables(conn):
+    """Create the mention tables, their indexes and cleanup trigger if missing."""
+    cursor = conn.cursor()
+
+    for statement in MENTION_SCHEMA:
+        cursor.execute(statement)
+
+    conn.commit()
+
+
+def ensure_mention_tables(conn):
+    """Create the mention tables on a database that has posts but not the tables yet."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type = 'table' AND name IN ('posts', 'product_mentions')
+    """)
+    names = {row[0] for row in cursor.fetchall()}
+
+    if names == {'posts'}:
+        create_mention_tables(conn)
+
+
+def as_list(value) -> List[str]:
+    """
+    Normalize a products_mentioned / pain_keywords value to a list.
+
+    Accepts a list, its JSON encoding, or a comma-separated string (as
+    some seed scripts store).
+    """
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            pass
+
+    if isinstance(value, str):
+        value = value.split(',')
+
+    return [item.strip() for item in value or [] if isinstance(item, str) and item.strip()]
+
+
+def write_mentions(cursor, analyses: Iterable[Tuple[int, Dict]]):
+    """
+    Replace the mention rows of (post_id, pain_analysis) pairs without committing.
+
+    pain_analysis needs products_mentioned and pain_keywords (lists or
+    their JSON text).
+    """
+    analyses = list(analyses)
+    post_ids = [(post_id,) for post_id, _ in analyses]
+
+    cursor.executemany("DELETE FROM product_mentions WHERE post_id = ?", post_ids)
+    cursor.executemany("DELETE FROM keyword_hits WHERE post_id = ?", post_ids)
+
+    cursor.executemany(
+        "INSERT OR IGNORE INTO product_mentions (post_id, product) VALUES (?, ?)",
+        [(post_id, product)
+         for post_id, analysis in analyses
+         for product in as_list(analysis.get('products_mentioned'))]
+    )
+    cursor.executemany(
+        "INSERT OR IGNORE INTO keyword_hits (post_id, keyword, category) VALUES (?, ?, ?)",
+        [(post_id, keyword, KEYWORD_CATEGORIES.get(keyword.lower()))
+         for post_id, analysis in analyses
+         for keyword in as_list(analysis.get('pain_keywords'))]
+    )
+
+
+def backfill_mentions(batch_size: int = BACKFILL_BATCH_SIZE, conn=None,
+                      missing_only: bool = False, pause: float = BATCH_PAUSE_SECONDS) -> int:
+    """
+    Write mention rows for analyzed posts, from their latest pain analysis.
+
+    Walks posts in id ranges and commits once per range, pausing in
+    between, so it can be interrupted and re-run (rows are replaced,
+    never duplicated).
+
+    Args:
+        batch_size: Post ids per transaction
+        conn: Writable connection to use (default: a pooled one)
+        missing_only: Only posts with no product_mentions or
+            keyword_hits rows yet, so a re-run resumes where an
+            interrupted one stopped
+        pause: Seconds to wait between transactions
+
+    Returns:
+        Number of posts processed
+    """
+    if conn is None:
+        from backend.models import get_db_connection
+
+        with get_db_connection(read_only=False) as conn:
+            return backfill_mentions(batch_size, conn, missing_only, pause)
+
+    missing = """
+        AND NOT EXISTS (SELECT 1 FROM product_mentions pm WHERE pm.post_id = t.id)
+        AND NOT EXISTS (SELECT 1 FROM keyword_hits kh WHERE kh.post_id = t.id)
+    """ if missing_only else ""
+
+    processed = 0
+
+    for low, high in id_batches(conn, 'posts', batch_size=batch_size, pause=pause):
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT t.id, pa.products_mentioned, pa.pain_keywords
+            FROM posts t
+            JOIN pain_analysis pa ON pa.id = (
+                SELECT MAX(id) FROM pain_analysis WHERE tweet_id = t.id
+            )
+            WHERE t.id > ? AND t.id <= ?
+            {missing}
+        """, (low, high))
+        rows = cursor.fetchall()
+
+        write_mentions(cursor, [
+            (post_id, {'products_mentioned': products, 'pain_keywords': keywords})
+            for post_id, products, keywords in rows
+        ])
+        conn.commit()
+
+        processed += len(rows)
+
+    return processed
+
+
+def posts_mentioning(product: str, limit: int = 50) -> List[Dict]:
+    """Posts mentioning a product (case-insensitive), newest first."""
+    from backend.models import get_db_connection
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT t.* FROM product_mentions pm
+            JOIN posts t ON t.id = pm.post_id
+            WHERE pm.product = ?
+            ORDER BY pm.post_id DESC
+            LIMIT ?
+        """, (product, limit))
+        return [dict(row) for row in cursor.fetchall()]
+
+
+def top_keywords(days: int = 7, limit: int = 20, category: str = None) -> List[Dict]:
+    """
+    Most common pain keywords among posts collected in recent days.
+
+    Returns:
+        Dicts with keyword, category and posts (number of posts), most
+        common first
+    """
+    from backend.models import get_db_connection
+
+    # CROSS JOIN keeps posts (searched by collected_at) as the outer loop,
+    # instead of scanning every keyword row in keyword order
+    category_filter = "AND kh.category = ?" if category else ""
+    params = [days] + ([category] if category else []) + [limit]
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT kh.keyword, kh.category, COUNT(*) AS posts
+            FROM posts t
+            CROSS JOIN keyword_hits kh ON kh.post_id = t.id
+            WHERE t.collected_at >= DATE('now', '-' || ? || ' days')
+            {category_filter}
+            GROUP BY kh.keyword
+            ORDER BY posts DESC, kh.keyword
+            LIMIT ?
+        """, params)
+        return [dict(row) for row in cursor.fetchall()]
+
+
+def top_products(days: int = 7, limit: int = 20) -> List[Dict]:
+    """
+    Most mentioned products among posts collected in recent days.
+
+    Returns:
+        Dicts with product and posts (number of posts), most mentioned first
+    """
+    from backend.models import get_db_connection
+
+    # CROSS JOIN: see top_keywords
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT pm.product, COUNT(*) AS posts
+            FROM posts t
+            CROSS JOIN product_mentions pm ON pm.post_id = t.id
+            WHERE t.collected_at >= DATE('now', '-' || ? || ' days')
+            GROUP BY pm.product
+            ORDER BY posts DESC, pm.product
+            LIMIT ?
+        """, (days, limit))
+        return [dict(row) for row in cursor.fetchall()]
@@ -15,6 +15,93 @@ MicroSaaS sweet spot:
 - Can explain in one sentence
 """
 
+from typing import Dict
+
+
+# High-intent search phrases (people looking for solutions)
+HIGH_INTENT_PHRASES = [
+    'how to prevent',
+    'best tool for',
+    'software for',
+    'platform for',
+    'solution for',
+    'alternative to',
+    'prevention',
+    'automation',
+    'tracking',
+    'monitoring',
+    'detection',
+    'verification',
+    'management',
+]
+
+# Clear problem statement (good for SEO)
+PROBLEM_INDICATORS = [
+    'theft', 'fraud', 'loss', 'missing', 'stolen',
+    'slow', 'manual', 'inefficient', 'expensive',
+    'complicated', 'difficult', 'frustrating'
+]
+
+# B2B keywords (good search volume, less competitive than B2C)
+B2B_KEYWORDS = ['freight', 'cargo', 'compliance', 'verification', 'reporting', 'api']
+
+# Positive indicators (self-service friendly)
+SELF_SERVICE_INDICATORS = [
+    ('api', 5),           # APIs are self-service
+    ('dashboard', 5),     # Dashboards are self-serve
+    ('automated', 5),     # Automation = less human touch
+    ('real-time', 4),     # Real-time products sell themselves
+    ('instant', 4),       # Instant value = self-serve
+    ('platform', 3),      # Platforms can be self-serve
+    ('saas', 4),          # SaaS keyword
+    ('subscription', 4),  # Recurring revenue
+]
+
+# Negative indicators (requires sales team)
+SALES_REQUIRED_INDICATORS = [
+    ('enterprise', -8),   # Enterprise needs sales
+    ('custom', -5),       # Customization needs sales
+    ('integration', -3),  # Complex integrations need help
+    ('consulting', -8),   # Consulting = not self-serve
+    ('implementation', -5),
+]
+
+# MicroSaaS sweet spot: SMB/mid-market, not enterprise
+SMB_INDICATORS = ['small business', 'smb']
+
+EXTREME_PAIN_PHRASES = [
+    'existential', 'crisis', 'emergency', 'urgent',
+    'losing money', 'losing customers', 'costing',
+    'theft', 'fraud', 'stolen', 'breach'
+]
+
+# Recurring problem indicators
+RECURRING_INDICATORS = [
+    ('daily', 5),
+    ('every', 4),
+    ('ongoing', 4),
+    ('continuous', 4),
+    ('monitoring', 5),
+    ('tracking', 5),
+    ('real-time', 5),
+    ('subscription', 5),
+    ('monthly', 4),
+    ('recurring', 5),
+]
+
+# One-time problem (bad for MicroSaaS)
+ONE_TIME_INDICATORS = ['one-time', 'once']
+
+
+def _keywords_text(keywords) -> str:
+    """Lowercase keywords given as a string or list."""
+    if isinstance(keywords, list):
+        return ' '.join(keywords).lower()
+    elif keywords:
+        return keywords.lower()
+    else:
+        return ""
+
 
 def calculate_seo_potential(title: str, description: str, keywords: str) -> int:
     """
@@ -24,54 +111,17 @@ def calculate_seo_potential(title: str, description: str, keywords: str) -> int:
     """
     score = 0
 
-    title_lower = title.lower()
-    desc_lower = description.lower()
+    combined_text = f"{title.lower()} {description.lower()} {_keywords_text(keywords)}"
 
-    # Handle keywords as string or list
-    if isinstance(keywords, list):
-        kw_lower = ' '.join(keywords).lower()
-    elif keywords:
-        kw_lower = keywords.lower()
-    else:
-        kw_lower = ""
-
-    combined_text = f"{title_lower} {desc_lower} {kw_lower}"
-
-    # High-intent search phrases (people looking for solutions)
-    high_intent_phrases = [
-        'how to prevent',
-        'best tool for',
-        'software for',
-        'platform for',
-        'solution for',
-        'alternative to',
-        'prevention',
-        'automation',
-        'tracking',
-        'monitoring',
-        'detection',
-        'verification',
-        'management',
-    ]
-
-    for phrase in high_intent_phrases:
+    for phrase in HIGH_INTENT_PHRASES:
         if phrase in combined_text:
             score += 3
 
-    # Clear problem statement (good for SEO)
-    problem_indicators = [
-        'theft', 'fraud', 'loss', 'missing', 'stolen',
-        'slow', 'manual', 'inefficient', 'expensive',
-        'complicated', 'difficult', 'frustrating'
-    ]
-
-    for indicator in problem_indicators:
+    for indicator in PROBLEM_INDICATORS:
         if indicator in combined_text:
             score += 2
 
-    # Bonus for B2B keywords (good search volume, less competitive than B2C)
-    b2b_keywords = ['freight', 'cargo', 'compliance', 'verification', 'reporting', 'api']
-    for kw in b2b_keywords:
+    for kw in B2B_KEYWORDS:
         if kw in combined_text:
             score += 3
 
@@ -89,38 +139,12 @@ def calculate_self_service_potential(title: str, description: str) -> int:
     desc_lower = description.lower()
     title_lower = title.lower()
 
-    # Positive indicators (self-service friendly)
-    self_service_indicators = [
-        ('api', 5),           # APIs are self-service
-        ('dashboard', 5),     # Dashboards are self-serve
-        ('automated', 5),     # Automation = less human touch
-        ('real-time', 4),     # Real-time products sell themselves
-        ('instant', 4),       # Instant value = self-serve
-        ('platform', 3),      # Platforms can be self-serve
-        ('saas', 4),          # SaaS keyword
-        ('subscription', 4),  # Recurring revenue
-    ]
-
-    for indicator, points in self_service_indicators:
-        if indicator in desc_lower or indicator in title_lower:
-            score += points
-
-    # Negative indicators (requires sales team)
-    sales_required = [
-        ('enterprise', -8),   # Enterprise needs sales
-        ('custom', -5),       # Customization needs sales
-        ('integration', -3),  # Complex integrations need help
-        ('consulting', -8),   # Consulting = not self-serve
-        ('implementation', -5),
-    ]
-
-    for indicator, points in sales_required:
+    for indicator, points in SELF_SERVICE_INDICATORS + SALES_REQUIRED_INDICATORS:
         if indicator in desc_lower or indicator in title_lower:
             score += points
 
     # Market size indicators
-    # MicroSaaS sweet spot: SMB/mid-market, not enterprise
-    if 'small business' in desc_lower or 'smb' in desc_lower:
+    if any(indicator in desc_lower for indicator in SMB_INDICATORS):
         score += 5
 
     if 'enterprise' in desc_lower and 'only' in desc_lower:
@@ -144,22 +168,11 @@ def calculate_pain_intensity(frustration_score: int, budget_score: int, keywords
     score += min(10, budget_score)
 
     # Extreme pain keywords
-    if keywords:
-        # Handle keywords as string or list
-        if isinstance(keywords, list):
-            kw_lower = ' '.join(keywords).lower()
-        else:
-            kw_lower = keywords.lower()
-
-        extreme_pain = [
-            'existential', 'crisis', 'emergency', 'urgent',
-            'losing money', 'losing customers', 'costing',
-            'theft', 'fraud', 'stolen', 'breach'
-        ]
-
-        for pain_kw in extreme_pain:
-            if pain_kw in kw_lower:
-                score += 2
+    kw_lower = _keywords_text(keywords)
+
+    for pain_kw in EXTREME_PAIN_PHRASES:
+        if pain_kw in kw_lower:
+            score += 2
 
     return min(30, score)
 
@@ -174,31 +187,239 @@ def calculate_recurring_potential(description: str) -> int:
 
     desc_lower = description.lower()
 
-    # Recurring problem indicators
-    recurring_indicators = [
-        ('daily', 5),
-        ('every', 4),
-        ('ongoing', 4),
-        ('continuous', 4),
-        ('monitoring', 5),
-        ('tracking', 5),
-        ('real-time', 5),
-        ('subscription', 5),
-        ('monthly', 4),
-        ('recurring', 5),
-    ]
-
-    for indicator, points in recurring_indicators:
+    for indicator, points in RECURRING_INDICATORS:
         if indicator in desc_lower:
             score += points
 
-    # One-time problem (bad for MicroSaaS)
-    if 'one-time' in desc_lower or 'once' in desc_lower:
+    if any(indicator in desc_lower for indicator in ONE_TIME_INDICATORS):
         score -= 5
 
     return max(0, min(20, score))
 
 
+# Where a phrase occurred (bit flags)
+IN_TITLE = 1
+IN_DESCRIPTION = 2
+IN_KEYWORDS = 4
+IN_COMBINED = 8  # Anywhere in "title description keywords", even across the joins
+
+
+class MicroSaaSScorer:
+    """
+    Compiled MicroSaaS scorer.
+
+    Builds a deduplicated phrase table over every lexicon above once, then
+    scores an opportunity by lowercasing its text once and checking each
+    distinct phrase once against the combined title + description +
+    keywords text. Where a phrase was found (title, description, keywords)
+    is only checked for the few phrases that hit. Results are identical to
+    the per-component calculate_* functions.
+    """
+
+    def __init__(self):
+        phrases = []
+        for group in (HIGH_INTENT_PHRASES, PROBLEM_INDICATORS, B2B_KEYWORDS,
+                      [p for p, _ in SELF_SERVICE_INDICATORS + SALES_REQUIRED_INDICATORS],
+                      SMB_INDICATORS, ['enterprise', 'only'], EXTREME_PAIN_PHRASES,
+                      [p for p, _ in RECURRING_INDICATORS], ONE_TIME_INDICATORS):
+            for phrase in group:
+                if phrase not in phrases:
+                    phrases.append(phrase)
+
+        self._phrases = phrases
+        ids = {phrase: pattern_id for pattern_id, phrase in enumerate(phrases)}
+
+        self._intent = [ids[p] for p in HIGH_INTENT_PHRASES]
+        self._problem = [ids[p] for p in PROBLEM_INDICATORS]
+        self._b2b = [ids[p] for p in B2B_KEYWORDS]
+        self._self_service = [(ids[p], points) for p, points
+                              in SELF_SERVICE_INDICATORS + SALES_REQUIRED_INDICATORS]
+        self._smb = [ids[p] for p in SMB_INDICATORS]
+        self._enterprise = ids['enterprise']
+        self._only = ids['only']
+        self._extreme = [ids[p] for p in EXTREME_PAIN_PHRASES]
+        self._recurring = [(ids[p], points) for p, points in RECURRING_INDICATORS]
+        self._one_time = [ids[p] for p in ONE_TIME_INDICATORS]
+
+        # (phrase, points) tables for total(), which skips the phrase ids
+        self._seo_points = tuple([(p, 3) for p in HIGH_INTENT_PHRASES]
+                                 + [(p, 2) for p in PROBLEM_INDICATORS]
+                                 + [(p, 3) for p in B2B_KEYWORDS])
+        self._self_service_points = tuple(SELF_SERVICE_INDICATORS + SALES_REQUIRED_INDICATORS)
+        self._recurring_points = tuple(RECURRING_INDICATORS)
+
+    def _scan(self, title: str, description: str, keywords) -> Dict[int, int]:
+        """Map phrase id -> IN_* flags for every phrase found."""
+        title_lower = title.lower()
+        desc_lower = description.lower()
+        kw_lower = _keywords_text(keywords)
+        combined_text = f"{title_lower} {desc_lower} {kw_lower}"
+
+        found = {}
+
+        for phrase_id, phrase in enumerate(self._phrases):
+            if phrase not in combined_text:
+                continue
+
+            where = IN_COMBINED
+            if phrase in title_lower:
+                where |= IN_TITLE
+            if phrase in desc_lower:
+                where |= IN_DESCRIPTION
+            if phrase in kw_lower:
+                where |= IN_KEYWORDS
+
+            found[phrase_id] = where
+
+        return found
+
+    def features(self, opportunity_data: dict, pain_analysis: dict) -> dict:
+        """
+        Phrase-hit counts and flags for one opportunity.
+
+        Keys match the arguments of calculate_microsaas_scores, so rows of
+        features can be scored in bulk.
+        """
+        found = self._scan(opportunity_data.get('title') or '',
+                           opportunity_data.get('description') or '',
+                           pain_analysis.get('pain_keywords', ''))
+
+        def count(ids, where):
+            return sum(1 for i in ids if found.get(i, 0) & where)
+
+        def points(weighted, where):
+            return sum(p for i, p in weighted if found.get(i, 0) & where)
+
+        return {
+            'intent_hits': count(self._intent, IN_COMBINED),
+            'problem_hits': count(self._problem, IN_COMBINED),
+            'b2b_hits': count(self._b2b, IN_COMBINED),
+            'self_service_points': points(self._self_service, IN_TITLE | IN_DESCRIPTION),
+            'mentions_smb': count(self._smb, IN_DESCRIPTION) > 0,
+            'enterprise_only': bool(found.get(self._enterprise, 0) & IN_DESCRIPTION
+                                    and found.get(self._only, 0) & IN_DESCRIPTION),
+            'frustration_score': pain_analysis.get('frustration_score', 0),
+            'budget_score': pain_analysis.get('budget_signal_score', 0),
+            'extreme_pain_hits': count(self._extreme, IN_KEYWORDS),
+            'recurring_points': points(self._recurring, IN_DESCRIPTION),
+            'one_time': count(self._one_time, IN_DESCRIPTION) > 0,
+        }
+
+    def seo_masks(self, opportunity_data: dict, pain_analysis: dict, where: int = IN_COMBINED) -> dict:
+        """
+        Which SEO phrases hit, as bit masks.
+
+        Bit i of intent_mask / problem_mask / b2b_mask is set when the
+        i-th phrase of HIGH_INTENT_PHRASES / PROBLEM_INDICATORS /
+        B2B_KEYWORDS was found (in the parts selected by where). Masks of
+        different texts can be OR-ed together, so phrases found in both
+        count once, as in calculate_seo_potential.
+        """
+        found = self._scan(opportunity_data.get('title') or '',
+                           opportunity_data.get('description') or '',
+                           pain_analysis.get('pain_keywords', ''))
+
+        def mask(ids):
+            return sum(1 << bit for bit, i in enumerate(ids) if found.get(i, 0) & where)
+
+        return {
+            'intent_mask': mask(self._intent),
+            'problem_mask': mask(self._problem),
+            'b2b_mask': mask(self._b2b),
+        }
+
+    def score(self, opportunity_data: dict, pain_analysis: dict) -> dict:
+        """
+        Score one opportunity.
+
+        Returns the same dict as get_microsaas_breakdown (components and total).
+        """
+        f = self.features(opportunity_data, pain_analysis)
+
+        seo_score = min(25, 3 * f['intent_hits'] + 2 * f['problem_hits'] + 3 * f['b2b_hits'])
+
+        self_service_score = f['self_service_points']
+        if f['mentions_smb']:
+            self_service_score += 5
+        if f['enterprise_only']:
+            self_service_score -= 10
+        self_service_score = max(0, min(25, self_service_score))
+
+        pain_score = min(15, f['frustration_score'] * 1.5) + min(10, f['budget_score'])
+        pain_score = min(30, pain_score + 2 * f['extreme_pain_hits'])
+
+        recurring_score = f['recurring_points'] - (5 if f['one_time'] else 0)
+        recurring_score = max(0, min(20, recurring_score))
+
+        return {
+            'seo_potential': seo_score,
+            'self_service': self_service_score,
+            'pain_intensity': pain_score,
+            'recurring': recurring_score,
+            'total': min(100, seo_score + self_service_score + pain_score + recurring_score)
+        }
+
+    def total(self, opportunity_data: dict, pain_analysis: dict) -> float:
+        """
+        Total score only, the same as score()['total'].
+
+        Checks each lexicon directly against the lowercased text without
+        building the found-phrase map or the breakdown. Title and
+        description are searched as one newline-joined string: no
+        self-service phrase contains a newline, so none can match across
+        the join.
+        """
+        title_lower = (opportunity_data.get('title') or '').lower()
+        desc_lower = (opportunity_data.get('description') or '').lower()
+        kw_lower = _keywords_text(pain_analysis.get('pain_keywords', ''))
+        combined_text = f"{title_lower} {desc_lower} {kw_lower}"
+        title_desc = f"{title_lower}\n{desc_lower}"
+
+        seo_score = 0
+        for phrase, points in self._seo_points:
+            if phrase in combined_text:
+                seo_score += points
+
+        self_service_score = 0
+        for phrase, points in self._self_service_points:
+            if phrase in title_desc:
+                self_service_score += points
+        if any(phrase in desc_lower for phrase in SMB_INDICATORS):
+            self_service_score += 5
+        if 'enterprise' in desc_lower and 'only' in desc_lower:
+            self_service_score -= 10
+
+        pain_score = (min(15, pain_analysis.get('frustration_score', 0) * 1.5)
+                      + min(10, pain_analysis.get('budget_signal_score', 0)))
+        if kw_lower:
+            for phrase in EXTREME_PAIN_PHRASES:
+                if phrase in kw_lower:
+                    pain_score += 2
+
+        recurring_score = 0
+        for phrase, points in self._recurring_points:
+            if phrase in desc_lower:
+                recurring_score += points
+        if any(phrase in desc_lower for phrase in ONE_TIME_INDICATORS):
+            recurring_score -= 5
+
+        return min(100, min(25, seo_score) + max(0, min(25, self_service_score))
+                   + min(30, pain_score) + max(0, min(20, recurring_score)))
+
+
+_default_scorer = None
+
+
+def get_scorer() -> MicroSaaSScorer:
+    """Get the shared compiled scorer."""
+    global _default_scorer
+
+    if _default_scorer is None:
+        _default_scorer = MicroSaaSScorer()
+
+    return _default_scorer
+
+
 def calculate_microsaas_score(opportunity_data: dict, pain_analysis: dict) -> int:
     """
     Calculate MicroSaaS viability score (0-100).
@@ -211,40 +432,67 @@ def calculate_microsaas_score(opportunity_data: dict, pain_analysis: dict) -> in
 
     Total: 100 points
     """
+    return get_scorer().total(opportunity_data, pain_analysis)
+
+
+def get_microsaas_breakdown(opportunity_data: dict, pain_analysis: dict) -> dict:
+    """
+    Get detailed scoring breakdown (components and total) in one pass.
+    """
+    return get_scorer().score(opportunity_data, pain_analysis)
 
-    title = opportunity_data.get('title', '')
-    description = opportunity_data.get('description', '')
 
-    frustration_score = pain_analysis.get('frustration_score', 0)
-    budget_score = pain_analysis.get('budget_signal_score', 0)
-    keywords = pain_analysis.get('pain_keywords', '')
+def calculate_microsaas_scores(intent_hits, problem_hits, b2b_hits,
+                               self_service_points, mentions_smb, enterprise_only,
+                               frustration_score, budget_score, extreme_pain_hits,
+                               recurring_points, one_time) -> dict:
+    """
+    Vectorized MicroSaaS scoring over whole columns.
+
+    Takes equal-length array-likes of per-opportunity phrase-hit counts and
+    flags (the same quantities the per-row functions compute from text)
+    and returns every score in one call:
+
+    - intent_hits, problem_hits, b2b_hits: distinct high-intent, problem
+      and B2B phrases found in title + description + keywords
+    - self_service_points: summed points of self-service / sales-required
+      indicators found in title or description
+    - mentions_smb, enterprise_only: market size flags from the description
+    - frustration_score, budget_score: from pain analysis
+    - extreme_pain_hits: distinct extreme pain phrases in the keywords
+    - recurring_points: summed points of recurring indicators in the description
+    - one_time: one-time problem flag from the description
+
+    Returns dictionary of NumPy arrays with the same keys as
+    get_microsaas_breakdown (pain_intensity and total are float64, since
+    frustration is scaled by 1.5; the rest are int32).
+    """
+    import numpy as np
 
-    # Calculate components
-    seo_score = calculate_seo_potential(title, description, keywords)
-    self_service_score = calculate_self_service_potential(title, description)
-    pain_score = calculate_pain_intensity(frustration_score, budget_score, keywords)
-    recurring_score = calculate_recurring_potential(description)
+    def column(values, dtype=np.int32):
+        return np.asarray(values, dtype=dtype)
 
-    total_score = seo_score + self_service_score + pain_score + recurring_score
+    seo = 3 * column(intent_hits) + 2 * column(problem_hits) + 3 * column(b2b_hits)
+    seo = np.minimum(25, seo)
 
-    return min(100, total_score)
+    self_service = (column(self_service_points)
+                    + 5 * column(mentions_smb, bool)
+                    - 10 * column(enterprise_only, bool))
+    self_service = np.clip(self_service, 0, 25)
 
+    pain = (np.minimum(15, column(frustration_score, np.float64) * 1.5)
+            + np.minimum(10, column(budget_score, np.float64))
+            + 2 * column(extreme_pain_hits))
+    pain = np.minimum(30, pain)
 
-def get_microsaas_breakdown(opportunity_data: dict, pain_analysis: dict) -> dict:
-    """
-    Get detailed scoring breakdown for debugging.
-    """
+    recurring = np.clip(column(recurring_points) - 5 * column(one_time, bool), 0, 20)
 
-    title = opportunity_data.get('title', '')
-    description = opportunity_data.get('description', '')
-    frustration_score = pain_analysis.get('frustration_score', 0)
-    budget_score = pain_analysis.get('budget_signal_score', 0)
-    keywords = pain_analysis.get('pain_keywords', '')
+    total = np.minimum(100, seo + self_service + pain + recurring)
 
     return {
-        'seo_potential': calculate_seo_potential(title, description, keywords),
-        'self_service': calculate_self_service_potential(title, description),
-        'pain_intensity': calculate_pain_intensity(frustration_score, budget_score, keywords),
-        'recurring': calculate_recurring_potential(description),
-        'total': calculate_microsaas_score(opportunity_data, pain_analysis)
+        'seo_potential': seo.astype(np.int32),
+        'self_service': self_service.astype(np.int32),
+        'pain_intensity': pain,
+        'recurring': recurring.astype(np.int32),
+        'total': total,
     }
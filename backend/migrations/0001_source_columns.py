@@ -0,0 +1,17 @@
+"""
+Add source / external_id to posts and opportunities.
+
+Rows stored before the columns existed are backfilled in batches.
+"""
+
+from backend.migrations import run_batched
+from backend.posts import posts_table
+from backend.sources import BACKFILL_OPPORTUNITIES, BACKFILL_TWEETS, create_source_columns
+
+
+def upgrade(conn):
+    create_source_columns(conn, backfill=False)
+
+    posts = posts_table(conn)
+    run_batched(conn, posts, BACKFILL_TWEETS.format(posts=posts))
+    run_batched(conn, 'opportunities', BACKFILL_OPPORTUNITIES)
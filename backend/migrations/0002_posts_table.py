@@ -0,0 +1,11 @@
+"""
+Rename tweets to posts, with the tweets compatibility view.
+
+The rename moves rows, indexes and triggers without copying data.
+"""
+
+from backend.posts import ensure_posts_table
+
+
+def upgrade(conn):
+    ensure_posts_table(conn)
@@ -0,0 +1,9 @@
+"""
+Maintain opportunity tweet_count / max_engagement with triggers.
+"""
+
+from backend.counters import ensure_counter_triggers
+
+
+def upgrade(conn):
+    ensure_counter_triggers(conn)
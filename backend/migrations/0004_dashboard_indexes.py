@@ -0,0 +1,11 @@
+"""
+Add the dashboard range-search indexes and drop the ones they supersede.
+
+Each index is built in its own transaction.
+"""
+
+from backend.indexes import create_dashboard_indexes
+
+
+def upgrade(conn):
+    create_dashboard_indexes(conn)
@@ -0,0 +1,9 @@
+"""
+Add the daily rollup tables and their triggers.
+"""
+
+from backend.rollups import ensure_rollup_tables
+
+
+def upgrade(conn):
+    ensure_rollup_tables(conn)
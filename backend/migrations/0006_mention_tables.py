@@ -0,0 +1,14 @@
+"""
+Add product_mentions / keyword_hits.
+
+They are filled in from existing pain analyses in batches. Only posts
+that have no mention rows yet are written, so an interrupted run
+resumes where it stopped.
+"""
+
+from backend.mentions import backfill_mentions, create_mention_tables
+
+
+def upgrade(conn):
+    create_mention_tables(conn)
+    backfill_mentions(conn=conn, missing_only=True)
@@ -0,0 +1,12 @@
+"""
+Add the full-text search index.
+
+Existing posts and opportunities are indexed in batches; an interrupted
+run resumes after the last indexed row.
+"""
+
+from backend.search import create_search_index
+
+
+def upgrade(conn):
+    create_search_index(conn)
@@ -0,0 +1,26 @@
+"""
+Add SEO phrase masks to post_features / opportunity_features.
+
+Existing feature rows are filled in from their pain analysis, title and
+description in batches.
+"""
+
+from backend.features import backfill_seo_masks, create_feature_tables
+
+NEW_COLUMNS = {
+    'post_features': ['keyword_intent_mask', 'keyword_problem_mask', 'keyword_b2b_mask'],
+    'opportunity_features': ['intent_mask', 'problem_mask', 'b2b_mask'],
+}
+
+
+def upgrade(conn):
+    create_feature_tables(conn)
+
+    for table, columns in NEW_COLUMNS.items():
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for column in columns:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+    conn.commit()
+
+    backfill_seo_masks(conn)
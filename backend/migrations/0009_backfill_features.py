@@ -0,0 +1,13 @@
+"""
+Backfill post_features / opportunity_features for rows stored without them.
+
+Posts analyzed before the feature store existed only have a
+pain_analysis row, so stored-feature scoring skipped them. Their feature
+rows are computed from the post text and latest analysis in batches.
+"""
+
+from backend.features import backfill_features
+
+
+def upgrade(conn):
+    backfill_features(conn)
@@ -0,0 +1,17 @@
+"""
+Create the analysis cache, near-duplicate index and clustering tables.
+
+They used to be created on first use by whichever process touched them;
+the app now expects them to exist like every other table.
+"""
+
+from backend.analysis_cache import create_cache_table
+from backend.clustering import create_cluster_tables
+from backend.dedupe import create_fingerprint_tables
+
+
+def upgrade(conn):
+    create_cache_table(conn)
+    create_fingerprint_tables(conn)
+    create_cluster_tables(conn)
+    conn.commit()
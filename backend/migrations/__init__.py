@@ -0,0 +1,218 @@
+"""
+Schema Migrations
+
+scripts/init_database.py creates the current schema on a new database;
+existing databases are brought up to date by the numbered migrations in
+this package, applied in order and recorded in `schema_version`:
+
+    backend/migrations/0001_source_columns.py
+    backend/migrations/0002_posts_table.py
+    ...
+
+Each migration module has a docstring (its description) and an
+upgrade(conn) function. Migrations must be safe to re-run: a database
+that was partly upgraded before schema_version existed, or two
+processes upgrading at once, simply repeat a step that's already done.
+
+Migrations are applied only by scripts/migrate.py (and by
+scripts/init_database.py). Connections opened through backend.models
+don't migrate: they raise SchemaVersionError while migrations are
+pending, so a collector or the web app never starts a long upgrade on
+its own, or runs against a schema it doesn't know.
+
+Long data changes are done in id ranges (id_batches(), run_batched()):
+one short transaction per range, with a pause between ranges, so
+collectors waiting on the write lock (busy_timeout) get it between
+batches instead of timing out behind one long statement.
+"""
+
+import importlib
+import pkgutil
+import re
+import time
+from typing import Dict, Iterator, List, Tuple
+
+# Rows per backfill transaction, and the pause between transactions
+BATCH_SIZE = 1000
+BATCH_PAUSE_SECONDS = 0.05
+
+SCHEMA_VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+MIGRATION_NAME = re.compile(r'^(\d{4})_(\w+)$')
+
+_migrations = None
+
+
+class SchemaVersionError(RuntimeError):
+    """The database has migrations that haven't been applied yet."""
+
+
+def get_migrations() -> List[Dict]:
+    """
+    All migrations in this package, oldest first.
+
+    Returns:
+        Dicts with version, name, description and upgrade (callable)
+    """
+    global _migrations
+
+    if _migrations is None:
+        migrations = []
+
+        for module_info in pkgutil.iter_modules(__path__):
+            match = MIGRATION_NAME.match(module_info.name)
+            if not match:
+                continue
+
+            module = importlib.import_module(f"{__name__}.{module_info.name}")
+            migrations.append({
+                'version': int(match.group(1)),
+                'name': match.group(2),
+                'description': (module.__doc__ or '').strip().splitlines()[0],
+                'upgrade': module.upgrade,
+            })
+
+        migrations.sort(key=lambda migration: migration['version'])
+        _migrations = migrations
+
+    return _migrations
+
+
+def has_schema(conn) -> bool:
+    """Whether the database has been initialized (has a posts or tweets table)."""
+    row = conn.execute("""
+        SELECT 1 FROM sqlite_master
+        WHERE type = 'table' AND name IN ('posts', 'tweets')
+    """).fetchone()
+    return row is not None
+
+
+def applied_versions(conn) -> set:
+    """Versions recorded in schema_version (empty if it doesn't exist yet)."""
+    row = conn.execute("""
+        SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'
+    """).fetchone()
+    if row is None:
+        return set()
+
+    return {row[0] for row in conn.execute("SELECT version FROM schema_version")}
+
+
+def pending_migrations(conn) -> List[Dict]:
+    """Migrations not yet applied to the database, oldest first."""
+    applied = applied_versions(conn)
+    return [migration for migration in get_migrations() if migration['version'] not in applied]
+
+
+def check_schema_version(conn):
+    """
+    Raise SchemaVersionError if an initialized database has pending migrations.
+
+    A database without a schema yet passes (init_database creates it).
+    """
+    if not has_schema(conn):
+        return
+
+    pending = pending_migrations(conn)
+    if pending:
+        names = ', '.join(f"{migration['version']:04d}_{migration['name']}" for migration in pending)
+        raise SchemaVersionError(
+            f"Database needs migrations {names}; run scripts/migrate.py"
+        )
+
+
+def migrate(conn, target: int = None) -> List[Dict]:
+    """
+    Apply pending migrations in order, recording each in schema_version.
+
+    Does nothing on a database that hasn't been initialized yet
+    (init_database creates the current schema and then records the
+    migrations as applied).
+
+    Args:
+        conn: Writable connection
+        target: Stop after this version (default: apply all)
+
+    Returns:
+        The migrations applied now
+    """
+    if not has_schema(conn):
+        return []
+
+    pending = [
+        migration for migration in pending_migrations(conn)
+        if target is None or migration['version'] <= target
+    ]
+    if not pending:
+        return []
+
+    conn.execute(SCHEMA_VERSION_TABLE)
+    conn.commit()
+
+    applied = []
+
+    for migration in pending:
+        # Another process may have applied it in the meantime
+        if migration['version'] in applied_versions(conn):
+            continue
+
+        migration['upgrade'](conn)
+
+        conn.execute(
+            "INSERT OR IGNORE INTO schema_version (version, name) VALUES (?, ?)",
+            (migration['version'], migration['name'])
+        )
+        conn.commit()
+        applied.append(migration)
+
+    return applied
+
+
+def id_batches(conn, table: str, start: int = 0, batch_size: int = BATCH_SIZE,
+               pause: float = BATCH_PAUSE_SECONDS) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (low, high] id ranges covering a table's rows above start.
+
+    The caller runs and commits one transaction per range; the pause
+    comes between ranges. Rows inserted after the first range is
+    yielded are not covered.
+    """
+    max_id = conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0] or 0
+    low = start
+
+    while low < max_id:
+        high = low + batch_size
+        yield low, high
+
+        low = high
+        if pause and low < max_id:
+            time.sleep(pause)
+
+
+def run_batched(conn, table: str, statement: str, batch_size: int = BATCH_SIZE,
+                pause: float = BATCH_PAUSE_SECONDS) -> int:
+    """
+    Run an UPDATE or DELETE over a table in id ranges, committing each range.
+
+    statement must end with a WHERE clause; `AND {table}.id > ? AND
+    {table}.id <= ?` is appended for each batch. Rows are visited once
+    each, so the statement should only touch rows that still need it
+    (e.g. WHERE source IS NULL) for the run to be resumable.
+
+    Returns:
+        Number of rows changed
+    """
+    batched = f"{statement.rstrip()} AND {table}.id > ? AND {table}.id <= ?"
+    changed = 0
+
+    for low, high in id_batches(conn, table, batch_size=batch_size, pause=pause):
+        changed += conn.execute(batched, (low, high)).rowcount
+        conn.commit()
+
+    return changed
@@ -5,85 +5,261 @@ This module provides Python classes for interacting with the SQLite database.
 """
 
 import sqlite3
+import threading
 import os
 import json
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from pathlib import Path
+from typing import Iterator, List, Dict, Optional, Tuple
 from contextlib import contextmanager
 
+from backend.storage import configure_connection, checkpoint, maybe_checkpoint
+from backend.counters import reconcile_counters
+from backend.rollups import rebuild_rollups, score_band, SCORE_BAND_WIDTH
+from backend.mentions import write_mentions
+from backend.migrations import check_schema_version
+
 
 def get_db_path():
     """Get database path from environment or use default."""
     return os.getenv('DATABASE_PATH', 'data/ppde.db')
 
 
-@contextmanager
-def get_db_connection():
-    """Context manager for database connections."""
-    conn = sqlite3.connect(get_db_path())
+# Prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# One open connection per (thread, process, database path, read-only)
+_local = threading.local()
+
+# Default for get_db_connection(read_only=None); the web app turns this on
+_read_only_default = False
+
+
+def set_read_only_connections(enabled: bool = True):
+    """Make this process's connections read-only by default (e.g. for the web app)."""
+    global _read_only_default
+    _read_only_default = enabled
+
+
+def _open_connection(db_path: str, read_only: bool = False) -> sqlite3.Connection:
+    """Open and configure a new connection (settings applied once per connection)."""
+    if read_only:
+        uri = Path(db_path).resolve().as_uri() + '?mode=ro'
+        conn = sqlite3.connect(uri, uri=True, cached_statements=STATEMENT_CACHE_SIZE)
+    else:
+        conn = sqlite3.connect(db_path, cached_statements=STATEMENT_CACHE_SIZE)
+
     conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+    configure_connection(conn, read_only=read_only)
+
+    # Databases created by older versions are upgraded by scripts/migrate.py
+    try:
+        check_schema_version(conn)
+    except Exception:
+        conn.close()
+        raise
+
+    return conn
+
+
+def _pooled_connection(read_only: bool) -> Tuple[sqlite3.Connection, Dict]:
+    """Get this thread's connection to the current database, opening it if needed."""
+    pool = getattr(_local, 'pool', None)
+
+    # Connections can't be shared with a forked child (e.g. ProcessPoolExecutor)
+    if pool is None or _local.pid != os.getpid():
+        pool = _local.pool = {}
+        _local.pid = os.getpid()
+
+    key = (get_db_path(), read_only)
+    entry = pool.get(key)
+
+    if entry is None:
+        entry = pool[key] = {'conn': _open_connection(*key), 'depth': 0}
+
+    return entry['conn'], entry
+
+
+@contextmanager
+def get_db_connection(read_only: bool = None):
+    """
+    Context manager for database connections.
+
+    Connections are pooled: each thread reuses one connection per database
+    (keeping its statement cache) instead of connecting on every call.
+    Work that hasn't been committed when the outermost block exits is
+    rolled back, exactly as closing a fresh connection used to do.
+
+    Args:
+        read_only: Open a read-only connection. Defaults to the process
+            setting (see set_read_only_connections).
+    """
+    if read_only is None:
+        read_only = _read_only_default
+
+    conn, entry = _pooled_connection(read_only)
+    entry['depth'] += 1
+
     try:
         yield conn
     finally:
-        conn.close()
+        entry['depth'] -= 1
+        if entry['depth'] == 0:
+            if conn.in_transaction:
+                conn.rollback()
+            if not read_only:
+                maybe_checkpoint(conn, get_db_path())
+
+
+def checkpoint_database(mode: str = 'TRUNCATE'):
+    """Checkpoint the WAL into the database file (e.g. at the end of a collection run)."""
+    with get_db_connection(read_only=False) as conn:
+        return checkpoint(conn, mode)
+
+
+def close_db_connections():
+    """Close this thread's pooled connections."""
+    pool = getattr(_local, 'pool', None) or {}
+
+    for entry in pool.values():
+        entry['conn'].close()
+
+    pool.clear()
+
+
+# pain_analysis columns selected alongside tweet columns
+PAIN_ANALYSIS_FIELDS = ['pain_analysis_id', 'frustration_score', 'budget_signal_score',
+                        'products_mentioned', 'pain_keywords', 'analyzed_at']
+
+
+def _insert_many(cursor, sql: str, rows: List[Tuple]) -> List[int]:
+    """
+    Insert rows with one executemany and return their generated ids.
+
+    The caller commits. Once the first row is written this connection holds
+    the write lock until commit, so no other writer can insert in between
+    and the new rowids are consecutive, ending at last_insert_rowid().
+    (Rows written by triggers don't change last_insert_rowid.)
+    """
+    if not rows:
+        return []
+
+    cursor.executemany(sql, rows)
+    last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+    return list(range(last_id - len(rows) + 1, last_id + 1))
+
+
+# Columns written for a new post, in post_row order
+POST_COLUMNS = ['tweet_id', 'text', 'created_at', 'author_username', 'author_followers',
+                'likes', 'retweets', 'replies', 'engagement_score', 'source', 'external_id',
+                'points', 'comment_count', 'view_count', 'author_reputation']
+
+
+def post_row(post: Dict) -> Tuple:
+    """POST_COLUMNS values for a dict of Tweet.create keyword arguments."""
+    likes = post.get('likes', 0)
+    retweets = post.get('retweets', 0)
+    external_id = post.get('external_id')
+
+    return (post['tweet_id'], post['text'], post['created_at'],
+            post.get('author_username'), post.get('author_followers', 0),
+            likes, retweets, post.get('replies', 0), likes + (retweets * 2),
+            post.get('source'),
+            str(external_id) if external_id is not None else post['tweet_id'],
+            post.get('points'), post.get('comment_count'),
+            post.get('view_count'), post.get('author_reputation'))
 
 
 class Tweet:
-    """Model for tweets table."""
+    """Model for posts (the posts table; see backend/posts.py)."""
 
     @staticmethod
     def create(tweet_id: str, text: str, created_at: str, author_username: str = None,
                author_followers: int = 0, likes: int = 0, retweets: int = 0,
-               replies: int = 0) -> int:
-        """Create a new tweet record."""
+               replies: int = 0, source: str = None, external_id: str = None,
+               points: int = None, comment_count: int = None, view_count: int = None,
+               author_reputation: int = None) -> int:
+        """
+        Create a new post record.
+
+        source is a backend.sources.SOURCES key and external_id the post's
+        id on that site (defaults to tweet_id). points, comment_count,
+        view_count and author_reputation are the source's own metrics.
+        """
+        return Tweet.create_many([{
+            'tweet_id': tweet_id, 'text': text, 'created_at': created_at,
+            'author_username': author_username, 'author_followers': author_followers,
+            'likes': likes, 'retweets': retweets, 'replies': replies,
+            'source': source, 'external_id': external_id,
+            'points': points, 'comment_count': comment_count,
+            'view_count': view_count, 'author_reputation': author_reputation,
+        }])[0]
+
+    @staticmethod
+    def create_many(tweets: List[Dict]) -> List[int]:
+        """
+        Create post records in one transaction.
 
-        engagement_score = likes + (retweets * 2)
+        Args:
+            tweets: Dicts of Tweet.create keyword arguments
+
+        Returns:
+            New ids, in the same order as tweets. A post already stored
+            under the same (source, external_id) fails the whole batch
+            (nothing is written).
+        """
+        rows = [post_row(tweet) for tweet in tweets]
 
         with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO tweets
-                (tweet_id, text, created_at, author_username, author_followers,
-                 likes, retweets, replies, engagement_score)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (tweet_id, text, created_at, author_username, author_followers,
-                  likes, retweets, replies, engagement_score))
+            ids = _insert_many(conn.cursor(), f"""
+                INSERT INTO posts ({', '.join(POST_COLUMNS)})
+                VALUES ({', '.join('?' * len(POST_COLUMNS))})
+            """, rows)
             conn.commit()
-            return cursor.lastrowid
+            return ids
 
     @staticmethod
     def get_by_id(tweet_id: int) -> Optional[Dict]:
-        """Get tweet by internal ID."""
+        """Get post by internal ID."""
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM tweets WHERE id = ?", (tweet_id,))
+            cursor.execute("SELECT * FROM posts WHERE id = ?", (tweet_id,))
             row = cursor.fetchone()
             return dict(row) if row else None
 
     @staticmethod
     def get_by_tweet_id(tweet_id: str) -> Optional[Dict]:
-        """Get tweet by Twitter's tweet_id."""
+        """Get post by its legacy tweet_id."""
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM tweets WHERE tweet_id = ?", (tweet_id,))
+            cursor.execute("SELECT * FROM posts WHERE tweet_id = ?", (tweet_id,))
             row = cursor.fetchone()
             return dict(row) if row else None
 
     @staticmethod
     def exists(tweet_id: str) -> bool:
-        """Check if tweet already exists."""
+        """Check if a post with this legacy tweet_id already exists."""
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT 1 FROM tweets WHERE tweet_id = ?", (tweet_id,))
+            cursor.execute("SELECT 1 FROM posts WHERE tweet_id = ?", (tweet_id,))
+            return cursor.fetchone() is not None
+
+    @staticmethod
+    def exists_in_source(source: str, external_id: str) -> bool:
+        """Check if a source's post is already stored (one idx_posts_source_external_id lookup)."""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM posts WHERE source = ? AND external_id = ?",
+                           (source, str(external_id)))
             return cursor.fetchone() is not None
 
     @staticmethod
     def get_recent(limit: int = 100) -> List[Dict]:
-        """Get most recent tweets."""
+        """Get most recent posts."""
         with get_db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT * FROM tweets
+                SELECT * FROM posts
                 ORDER BY created_at DESC
                 LIMIT ?
             """, (limit,))
@@ -91,13 +267,13 @@ class Tweet:
 
     @staticmethod
     def count_today() -> int:
-        """Count tweets collected today."""
+        """Count posts collected today (UTC), from the daily rollup."""
         with get_db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT COUNT(*) as count
-                FROM tweets
-                WHERE DATE(collected_at) = DATE('now')
+                SELECT COALESCE(SUM(posts), 0) as count
+                FROM post_daily_stats
+                WHERE day = DATE('now')
             """)
             return cursor.fetchone()['count']
 
@@ -120,8 +296,43 @@ class PainAnalysis:
                 (tweet_id, frustration_score, budget_signal_score, products_mentioned, pain_keywords)
                 VALUES (?, ?, ?, ?, ?)
             """, (tweet_id, frustration_score, budget_signal_score, products_json, keywords_json))
+            analysis_id = cursor.lastrowid
+
+            write_mentions(cursor, [(tweet_id, {
+                'products_mentioned': products_mentioned,
+                'pain_keywords': pain_keywords,
+            })])
             conn.commit()
-            return cursor.lastrowid
+            return analysis_id
+
+    @staticmethod
+    def create_many(analyses: List[Dict]) -> List[int]:
+        """
+        Create pain analysis records in one transaction.
+
+        Args:
+            analyses: Dicts of PainAnalysis.create keyword arguments
+
+        Returns:
+            New ids, in the same order as analyses
+        """
+        rows = [
+            (analysis['tweet_id'], analysis['frustration_score'], analysis['budget_signal_score'],
+             json.dumps(analysis.get('products_mentioned') or []),
+             json.dumps(analysis.get('pain_keywords') or []))
+            for analysis in analyses
+        ]
+
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            ids = _insert_many(cursor, """
+                INSERT INTO pain_analysis
+                (tweet_id, frustration_score, budget_signal_score, products_mentioned, pain_keywords)
+                VALUES (?, ?, ?, ?, ?)
+            """, rows)
+            write_mentions(cursor, [(analysis['tweet_id'], analysis) for analysis in analyses])
+            conn.commit()
+            return ids
 
     @staticmethod
     def get_by_tweet(tweet_id: int) -> Optional[Dict]:
@@ -143,8 +354,9 @@ class Opportunity:
 
     @staticmethod
     def create(title: str, description: str, score: int,
-               first_seen: str = None, last_seen: str = None) -> int:
-        """Create a new opportunity."""
+               first_seen: str = None, last_seen: str = None,
+               source: str = None, external_id: str = None) -> int:
+        """Create a new opportunity (source is a backend.sources.SOURCES key)."""
 
         first_seen = first_seen or datetime.now().isoformat()
         last_seen = last_seen or datetime.now().isoformat()
@@ -153,12 +365,40 @@ class Opportunity:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO opportunities
-                (title, description, score, tweet_count, first_seen, last_seen)
-                VALUES (?, ?, ?, 0, ?, ?)
-            """, (title, description, score, first_seen, last_seen))
+                (title, description, score, tweet_count, first_seen, last_seen, source, external_id)
+                VALUES (?, ?, ?, 0, ?, ?, ?, ?)
+            """, (title, description, score, first_seen, last_seen, source, external_id))
             conn.commit()
             return cursor.lastrowid
 
+    @staticmethod
+    def create_many(opportunities: List[Dict]) -> List[int]:
+        """
+        Create opportunities in one transaction.
+
+        Args:
+            opportunities: Dicts of Opportunity.create keyword arguments
+
+        Returns:
+            New ids, in the same order as opportunities
+        """
+        now = datetime.now().isoformat()
+        rows = [
+            (opportunity['title'], opportunity['description'], opportunity['score'],
+             opportunity.get('first_seen') or now, opportunity.get('last_seen') or now,
+             opportunity.get('source'), opportunity.get('external_id'))
+            for opportunity in opportunities
+        ]
+
+        with get_db_connection() as conn:
+            ids = _insert_many(conn.cursor(), """
+                INSERT INTO opportunities
+                (title, description, score, tweet_count, first_seen, last_seen, source, external_id)
+                VALUES (?, ?, ?, 0, ?, ?, ?, ?)
+            """, rows)
+            conn.commit()
+            return ids
+
     @staticmethod
     def get_by_id(opportunity_id: int) -> Optional[Dict]:
         """Get opportunity by ID."""
@@ -170,50 +410,259 @@ class Opportunity:
 
     @staticmethod
     def get_top_opportunities(limit: int = 10, min_score: int = 40,
-                               days: int = 1) -> List[Dict]:
-        """Get top opportunities from recent days."""
+                               days: int = 1, source: str = None) -> List[Dict]:
+        """Get top opportunities from recent days, optionally from one source only."""
+        return list(Opportunity.iter_top_opportunities(
+            min_score=min_score, days=days, source=source, limit=limit
+        ))
+
+    @staticmethod
+    def iter_top_opportunities(min_score: int = 40, days: int = 1, source: str = None,
+                               after: Tuple = None, limit: int = None) -> Iterator[Dict]:
+        """
+        Yield top opportunities from recent days straight from the cursor.
+
+        Ordered by score, tweet_count and id (all descending), so the order
+        is total and a listing can resume after any row without OFFSET.
+
+        Args:
+            min_score: Minimum score
+            days: Created within this many days
+            source: Only this source (SOURCES key), or None for all
+            after: (score, tweet_count, id) of the last row already returned;
+                only rows after it are yielded
+            limit: Maximum number of rows, or None for all
+        """
+        filters = ""
+        params = [min_score, days]
+
+        if source:
+            filters += " AND source = ?"
+            params.append(source)
+
+        if after:
+            filters += " AND (score, tweet_count, id) < (?, ?, ?)"
+            params.extend(after)
+
+        # A negative LIMIT means no limit
+        params.append(-1 if limit is None else limit)
+
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
+            cursor.execute(f"""
                 SELECT * FROM opportunities
                 WHERE score >= ?
-                AND DATE(created_at) >= DATE('now', '-' || ? || ' days')
-                ORDER BY score DESC, tweet_count DESC
+                AND created_at >= DATE('now', '-' || ? || ' days')
+                {filters}
+                ORDER BY score DESC, tweet_count DESC, id DESC
                 LIMIT ?
-            """, (min_score, days, limit))
-            return [dict(row) for row in cursor.fetchall()]
+            """, params)
+
+            for row in cursor:
+                yield dict(row)
 
     @staticmethod
-    def add_tweet(opportunity_id: int, tweet_id: int):
-        """Link a tweet to an opportunity."""
+    def count_by_source(min_score: int = 40, days: int = 1) -> Dict[str, int]:
+        """Count opportunities from recent days per source."""
+        return Opportunity.get_stats(min_score=min_score, days=days)['sources']
+
+    @staticmethod
+    def get_stats(min_score: int = 40, days: int = 1, source: str = None) -> Dict:
+        """
+        Summarize opportunities from recent days, from the daily rollups.
+
+        Whole score bands come from opportunity_daily_stats. If min_score
+        falls inside a band, that band's qualifying rows are counted from
+        opportunities (an index range search).
+
+        Returns:
+            Dict with total, avg_score, sources ({source: count}) and bands
+            ({band lower bound: count})
+        """
+        band = score_band(min_score)
+        partial = band != min_score
+        source_filter = "AND source = ?" if source else ""
+        source_params = [source] if source else []
+
         with get_db_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT source, score_band,
+                       SUM(opportunities) AS opportunities, SUM(score_sum) AS score_sum
+                FROM opportunity_daily_stats
+                WHERE day >= DATE('now', '-' || ? || ' days')
+                AND score_band >= ?
+                {source_filter}
+                GROUP BY source, score_band
+            """, [days, band + SCORE_BAND_WIDTH if partial else band] + source_params)
+            rows = [dict(row) for row in cursor.fetchall()]
+
+            if partial:
+                cursor.execute(f"""
+                    SELECT source, ? AS score_band,
+                           COUNT(*) AS opportunities, SUM(score) AS score_sum
+                    FROM opportunities
+                    WHERE score >= ? AND score < ?
+                    AND created_at >= DATE('now', '-' || ? || ' days')
+                    {source_filter}
+                    GROUP BY +source
+                """, [band, min_score, band + SCORE_BAND_WIDTH, days] + source_params)
+                rows += [dict(row) for row in cursor.fetchall()]
+
+        stats = {'total': 0, 'avg_score': 0, 'sources': {}, 'bands': {}}
+        score_sum = 0
+
+        for row in rows:
+            count = row['opportunities']
+            stats['total'] += count
+            stats['sources'][row['source']] = stats['sources'].get(row['source'], 0) + count
+            stats['bands'][row['score_band']] = stats['bands'].get(row['score_band'], 0) + count
+            score_sum += row['score_sum'] or 0
+
+        if stats['total']:
+            stats['avg_score'] = score_sum / stats['total']
+
+        return stats
 
-            # Add to junction table
+    @staticmethod
+    def add_tweet(opportunity_id: int, tweet_id: int):
+        """
+        Link a tweet to an opportunity.
+
+        tweet_count, max_engagement and last_seen are updated by triggers
+        (see backend/counters.py).
+        """
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
             cursor.execute("""
                 INSERT OR IGNORE INTO opportunity_tweets (opportunity_id, tweet_id)
                 VALUES (?, ?)
             """, (opportunity_id, tweet_id))
+            conn.commit()
+
+    @staticmethod
+    def add_tweets_many(links: List[Tuple[int, int]]) -> int:
+        """
+        Link tweets to opportunities in one transaction.
+
+        Args:
+            links: (opportunity_id, tweet_id) pairs; existing links are skipped
 
-            # Update tweet count
+        Returns:
+            Number of new links
+        """
+        if not links:
+            return 0
+
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT OR IGNORE INTO opportunity_tweets (opportunity_id, tweet_id)
+                VALUES (?, ?)
+            """, links)
+            added = cursor.rowcount
+            conn.commit()
+            return added
+
+    @staticmethod
+    def get_ids_for_tweet(tweet_id: int) -> List[int]:
+        """Get ids of all opportunities a tweet is linked to."""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT opportunity_id FROM opportunity_tweets
+                WHERE tweet_id = ?
+            """, (tweet_id,))
+            return [row['opportunity_id'] for row in cursor.fetchall()]
+
+    @staticmethod
+    def touch(opportunity_id: int, last_seen: str = None):
+        """Update an opportunity's last_seen timestamp."""
+        last_seen = last_seen or datetime.now().isoformat()
+
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
             cursor.execute("""
                 UPDATE opportunities
-                SET tweet_count = (
-                    SELECT COUNT(*) FROM opportunity_tweets
-                    WHERE opportunity_id = ?
-                )
+                SET last_seen = ?
                 WHERE id = ?
-            """, (opportunity_id, opportunity_id))
+            """, (last_seen, opportunity_id))
+            conn.commit()
 
+    @staticmethod
+    def raise_score(opportunity_id: int, score: int):
+        """Raise an opportunity's score to score if it is currently lower."""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                UPDATE opportunities
+                SET score = MAX(score, ?)
+                WHERE id = ?
+            """, (score, opportunity_id))
             conn.commit()
 
+    @staticmethod
+    def get_tweets_with_analysis(opportunity_id: int, limit: int = 20,
+                                 offset: int = 0) -> List[Dict]:
+        """
+        Get a page of an opportunity's tweets with their pain analyses, in one query.
+
+        Each tweet has a 'pain_analysis' dict (None if not analyzed) whose
+        products_mentioned and pain_keywords are left as JSON strings, so
+        they are only decoded if they are actually used.
+        """
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT t.*,
+                       pa.id AS pain_analysis_id,
+                       pa.frustration_score, pa.budget_signal_score,
+                       pa.products_mentioned, pa.pain_keywords, pa.analyzed_at
+                FROM opportunity_tweets ot
+                JOIN posts t ON t.id = ot.tweet_id
+                LEFT JOIN pain_analysis pa ON pa.id = (
+                    SELECT MAX(id) FROM pain_analysis WHERE tweet_id = t.id
+                )
+                WHERE ot.opportunity_id = ?
+                ORDER BY t.engagement_score DESC, t.id
+                LIMIT ? OFFSET ?
+            """, (opportunity_id, limit, offset))
+
+            tweets = []
+            for row in cursor.fetchall():
+                tweet = dict(row)
+                analysis = {key: tweet.pop(key) for key in PAIN_ANALYSIS_FIELDS}
+
+                if analysis['pain_analysis_id'] is None:
+                    tweet['pain_analysis'] = None
+                else:
+                    analysis['id'] = analysis.pop('pain_analysis_id')
+                    analysis['tweet_id'] = tweet['id']
+                    tweet['pain_analysis'] = analysis
+
+                tweets.append(tweet)
+
+            return tweets
+
+    @staticmethod
+    def reconcile_counters() -> int:
+        """Recompute tweet_count and max_engagement from the links. Returns opportunities corrected."""
+        with get_db_connection(read_only=False) as conn:
+            return reconcile_counters(conn)
+
+    @staticmethod
+    def rebuild_rollups() -> Dict[str, int]:
+        """Recompute the daily rollup tables from scratch. Returns rollup rows written."""
+        with get_db_connection(read_only=False) as conn:
+            return rebuild_rollups(conn)
+
     @staticmethod
     def get_tweets(opportunity_id: int) -> List[Dict]:
         """Get all tweets for an opportunity."""
         with get_db_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT t.* FROM tweets t
+                SELECT t.* FROM posts t
                 JOIN opportunity_tweets ot ON t.id = ot.tweet_id
                 WHERE ot.opportunity_id = ?
                 ORDER BY t.engagement_score DESC
@@ -0,0 +1,47 @@
+"""
+Keyset Pagination Cursors
+
+API listings continue from an opaque `next` token instead of an OFFSET.
+The token encodes the sort key of the last row returned and the next
+page starts strictly after it, so a deep page costs the same as the
+first one and rows added in between don't shift or repeat results.
+
+Tokens are URL-safe base64 of the JSON key; clients should treat them
+as opaque and only pass them back.
+"""
+
+import base64
+import binascii
+import json
+from typing import Dict, Sequence, Tuple
+
+# Sort key of the opportunity listings (all descending)
+OPPORTUNITY_KEY = ('score', 'tweet_count', 'id')
+
+
+def encode_cursor(row: Dict, key: Sequence[str] = OPPORTUNITY_KEY) -> str:
+    """Make the token for resuming a listing after row."""
+    values = [row[column] for column in key]
+    data = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def decode_cursor(token: str, key: Sequence[str] = OPPORTUNITY_KEY) -> Tuple:
+    """
+    Turn a token back into the sort key values it was made from.
+
+    Raises:
+        ValueError: if the token wasn't made by encode_cursor for this key
+    """
+    try:
+        data = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(data)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Invalid cursor: {token}")
+
+    if (not isinstance(values, list) or len(values) != len(key)
+            or not all(isinstance(value, (int, float)) and not isinstance(value, bool)
+                       for value in values)):
+        raise ValueError(f"Invalid cursor: {token}")
+
+    return tuple(values)
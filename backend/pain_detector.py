@@ -8,8 +8,15 @@ This module analyzes text to detect pain signals:
 - Pain keywords
 """
 
+import hashlib
+import json
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    from backend.phrase_matcher import PhraseMatcher
+except ImportError:  # Run directly: python backend/pain_detector.py
+    from phrase_matcher import PhraseMatcher
 
 
 # Pain Expression Patterns (from CRAWL plan)
@@ -49,17 +56,79 @@ TIME_INVESTMENT_PHRASES = [
     'always spending', 'every day', 'daily struggle', 'constantly'
 ]
 
+# Pattern: $10, $99/mo, $1,000, etc.
+DOLLAR_AMOUNT_PATTERN = re.compile(r'\$\d+(?:,\d{3})*(?:\.\d{2})?(?:/mo|/month|/yr|/year)?')
 
-def count_frustration_keywords(text: str) -> int:
-    """Count frustration keywords in text."""
-    text_lower = text.lower()
-    count = 0
+# @ mentions (often products/companies)
+MENTION_PATTERN = re.compile(r'@(\w+)')
+
+# Capitalized words that might be products (naive approach)
+CAPS_WORD_PATTERN = re.compile(r'\b([A-Z][a-z]+(?:[A-Z][a-z]+)*)\b')
+PRODUCT_SKIP_WORDS = {'I', 'Why', 'How', 'What', 'When', 'There', 'This', 'That'}
+
+# Window size for analyze_pain_stream (characters)
+STREAM_WINDOW_SIZE = 64 * 1024
+
+# All lexicons by category, compiled once into a single automaton so that
+# analyze_pain scans the text once instead of once per keyword list
+LEXICONS = {
+    'frustration': FRUSTRATION_KEYWORDS,
+    'solution_seeking': SOLUTION_SEEKING_PHRASES,
+    'budget': BUDGET_KEYWORDS,
+    'paid_tool': KNOWN_PAID_TOOLS,
+    'time_investment': TIME_INVESTMENT_PHRASES,
+}
+
+# Bump when the analysis logic changes; lexicon edits are picked up by the
+# fingerprint automatically
+ANALYZER_VERSION = 2
+
+# Identifies the analyzer + lexicons that produced a result (used as the
+# cache version, so stale cached analyses are never served)
+LEXICON_FINGERPRINT = hashlib.sha256(
+    json.dumps({'version': ANALYZER_VERSION, 'lexicons': LEXICONS},
+               sort_keys=True).encode('utf-8')
+).hexdigest()[:16]
+
+_LEXICON_MATCHER = PhraseMatcher(
+    (phrase, category)
+    for category, phrases in LEXICONS.items()
+    for phrase in phrases
+)
+
+
+def scan_lexicons(text: str) -> Dict[str, List[str]]:
+    """
+    Find every lexicon hit in one pass over the text.
+
+    Returns a dict of category -> matched phrases, in lexicon order.
+    """
+    matched, _ = _LEXICON_MATCHER.scan(text.lower())
+    return group_lexicon_hits(matched)
+
+
+def group_lexicon_hits(matched) -> Dict[str, List[str]]:
+    """Group matched pattern ids by category, in lexicon order."""
+    hits = {category: [] for category in LEXICONS}
+
+    for pattern_id in sorted(matched):
+        phrase, category = _LEXICON_MATCHER.phrases[pattern_id]
+        hits[category].append(phrase)
+
+    return hits
+
+
+def count_lexicon_hits(hits: Dict[str, List[str]]) -> Dict[str, int]:
+    """Number of distinct phrases matched per lexicon category."""
+    return {category: len(phrases) for category, phrases in hits.items()}
 
-    for keyword in FRUSTRATION_KEYWORDS:
-        if keyword in text_lower:
-            count += 1
 
-    return count
+def count_frustration_keywords(text: str, hits: Dict = None) -> int:
+    """Count frustration keywords in text."""
+    if hits is None:
+        hits = scan_lexicons(text)
+
+    return len(hits['frustration'])
 
 
 def count_exclamation_marks(text: str) -> int:
@@ -77,92 +146,82 @@ def calculate_caps_ratio(text: str) -> float:
     return len(caps) / len(letters)
 
 
-def detect_solution_seeking(text: str) -> bool:
+def detect_solution_seeking(text: str, hits: Dict = None) -> bool:
     """Check if text contains solution-seeking language."""
-    text_lower = text.lower()
-
-    for phrase in SOLUTION_SEEKING_PHRASES:
-        if phrase in text_lower:
-            return True
+    if hits is None:
+        hits = scan_lexicons(text)
 
-    return False
+    return bool(hits['solution_seeking'])
 
 
 def extract_dollar_amounts(text: str) -> List[str]:
     """Extract dollar amounts from text."""
-    # Pattern: $10, $99/mo, $1,000, etc.
-    pattern = r'\$\d+(?:,\d{3})*(?:\.\d{2})?(?:/mo|/month|/yr|/year)?'
-    return re.findall(pattern, text)
+    return DOLLAR_AMOUNT_PATTERN.findall(text)
 
 
-def count_budget_keywords(text: str) -> int:
+def count_budget_keywords(text: str, hits: Dict = None) -> int:
     """Count budget-related keywords."""
-    text_lower = text.lower()
-    count = 0
+    if hits is None:
+        hits = scan_lexicons(text)
 
-    for keyword in BUDGET_KEYWORDS:
-        if keyword in text_lower:
-            count += 1
+    return len(hits['budget'])
 
-    return count
 
-
-def detect_paid_tools(text: str) -> List[str]:
+def detect_paid_tools(text: str, hits: Dict = None) -> List[str]:
     """Detect mentions of known paid tools."""
-    text_lower = text.lower()
-    mentioned = []
-
-    for tool in KNOWN_PAID_TOOLS:
-        if tool in text_lower:
-            mentioned.append(tool)
+    if hits is None:
+        hits = scan_lexicons(text)
 
-    return mentioned
+    return list(hits['paid_tool'])
 
 
-def extract_products_mentioned(text: str) -> List[str]:
+def extract_products_mentioned(text: str, hits: Dict = None) -> List[str]:
     """Extract product/company names from text."""
-    products = []
 
     # Detect @ mentions (often products/companies)
-    mentions = re.findall(r'@(\w+)', text)
-    products.extend(mentions)
+    mentions = MENTION_PATTERN.findall(text)
 
     # Detect known paid tools
-    tools = detect_paid_tools(text)
-    products.extend(tools)
+    tools = detect_paid_tools(text, hits)
 
     # Detect capitalized words that might be products (naive approach)
-    # Skip common words
-    skip_words = {'I', 'Why', 'How', 'What', 'When', 'There', 'This', 'That'}
-    caps_words = re.findall(r'\b([A-Z][a-z]+(?:[A-Z][a-z]+)*)\b', text)
-    for word in caps_words:
-        if word not in skip_words and len(word) > 2:
-            products.append(word)
-
-    # Remove duplicates while preserving order
+    caps_words = extract_caps_words(text)
+
+    return merge_products(mentions, tools, caps_words)
+
+
+def extract_caps_words(text: str) -> List[str]:
+    """Extract capitalized words that might be products, skipping common words."""
+    return [
+        word for word in CAPS_WORD_PATTERN.findall(text)
+        if word not in PRODUCT_SKIP_WORDS and len(word) > 2
+    ]
+
+
+def merge_products(*groups: List[str]) -> List[str]:
+    """Concatenate product lists, removing duplicates (case-insensitive) while preserving order."""
     seen = set()
     unique_products = []
-    for p in products:
-        p_lower = p.lower()
-        if p_lower not in seen:
-            seen.add(p_lower)
-            unique_products.append(p)
+
+    for group in groups:
+        for p in group:
+            p_lower = p.lower()
+            if p_lower not in seen:
+                seen.add(p_lower)
+                unique_products.append(p)
 
     return unique_products
 
 
-def detect_time_investment(text: str) -> bool:
+def detect_time_investment(text: str, hits: Dict = None) -> bool:
     """Check if text mentions time investment."""
-    text_lower = text.lower()
-
-    for phrase in TIME_INVESTMENT_PHRASES:
-        if phrase in text_lower:
-            return True
+    if hits is None:
+        hits = scan_lexicons(text)
 
-    return False
+    return bool(hits['time_investment'])
 
 
-def calculate_frustration_score(text: str) -> int:
+def calculate_frustration_score(text: str, hits: Dict = None) -> int:
     """
     Calculate frustration score (0-10).
 
@@ -172,18 +231,25 @@ def calculate_frustration_score(text: str) -> int:
     - Caps ratio
     - Solution seeking language
     """
+    return frustration_score_from_counts(
+        count_frustration_keywords(text, hits),
+        count_exclamation_marks(text),
+        calculate_caps_ratio(text)
+    )
+
+
+def frustration_score_from_counts(keyword_count: int, exclamations: int,
+                                  caps_ratio: float) -> int:
+    """Calculate frustration score (0-10) from already-counted signals."""
     score = 0
 
     # Frustration keywords (max 6 points)
-    keyword_count = count_frustration_keywords(text)
     score += min(6, keyword_count * 2)
 
     # Exclamation marks (max 2 points)
-    exclamations = count_exclamation_marks(text)
     score += min(2, exclamations)
 
     # Caps ratio (max 2 points)
-    caps_ratio = calculate_caps_ratio(text)
     if caps_ratio > 0.3:  # More than 30% caps
         score += 2
     elif caps_ratio > 0.15:  # More than 15% caps
@@ -192,7 +258,8 @@ def calculate_frustration_score(text: str) -> int:
     return min(10, score)
 
 
-def calculate_budget_signal_score(text: str) -> int:
+def calculate_budget_signal_score(text: str, hits: Dict = None,
+                                  dollar_amounts: List[str] = None) -> int:
     """
     Calculate budget signal score (0-50).
 
@@ -201,46 +268,42 @@ def calculate_budget_signal_score(text: str) -> int:
     - Mentions paid tools (20 points)
     - Budget-related keywords (10 points)
     """
+    if dollar_amounts is None:
+        dollar_amounts = extract_dollar_amounts(text)
+
+    return budget_signal_score_from_counts(
+        bool(dollar_amounts),
+        bool(detect_paid_tools(text, hits)),
+        count_budget_keywords(text, hits)
+    )
+
+
+def budget_signal_score_from_counts(has_dollar_amount: bool, has_paid_tool: bool,
+                                    budget_keyword_count: int) -> int:
+    """Calculate budget signal score (0-50) from already-counted signals."""
     score = 0
 
     # Dollar amounts (strong signal)
-    dollar_amounts = extract_dollar_amounts(text)
-    if dollar_amounts:
+    if has_dollar_amount:
         score += 20
 
     # Mentions paid tools (strong signal)
-    paid_tools = detect_paid_tools(text)
-    if paid_tools:
+    if has_paid_tool:
         score += 20
 
     # Budget keywords
-    budget_keyword_count = count_budget_keywords(text)
     score += min(10, budget_keyword_count * 5)
 
     return min(50, score)
 
 
-def extract_pain_keywords(text: str) -> List[str]:
+def extract_pain_keywords(text: str, hits: Dict = None) -> List[str]:
     """Extract matched pain keywords from text."""
-    keywords = []
-    text_lower = text.lower()
-
-    # Frustration keywords
-    for keyword in FRUSTRATION_KEYWORDS:
-        if keyword in text_lower:
-            keywords.append(keyword)
-
-    # Solution seeking phrases
-    for phrase in SOLUTION_SEEKING_PHRASES:
-        if phrase in text_lower:
-            keywords.append(phrase)
+    if hits is None:
+        hits = scan_lexicons(text)
 
-    # Time investment
-    for phrase in TIME_INVESTMENT_PHRASES:
-        if phrase in text_lower:
-            keywords.append(phrase)
-
-    return keywords
+    # Frustration keywords, then solution seeking, then time investment
+    return hits['frustration'] + hits['solution_seeking'] + hits['time_investment']
 
 
 def analyze_pain(text: str) -> Dict:
@@ -254,19 +317,196 @@ def analyze_pain(text: str) -> Dict:
     - pain_keywords: list of matched keywords
     - has_solution_seeking: boolean
     - has_time_investment: boolean
+    - dollar_amounts: list of dollar amounts as written
+    - exclamation_count, caps_ratio: raw frustration signals
+    - hit_counts: number of distinct phrases matched per lexicon category
+    """
+
+    # One pass over the text for every lexicon; all scorers share the result
+    hits = scan_lexicons(text)
+    dollar_amounts = extract_dollar_amounts(text)
+    exclamations = count_exclamation_marks(text)
+    caps_ratio = calculate_caps_ratio(text)
+
+    return {
+        'frustration_score': frustration_score_from_counts(
+            count_frustration_keywords(text, hits), exclamations, caps_ratio),
+        'budget_signal_score': calculate_budget_signal_score(text, hits, dollar_amounts),
+        'products_mentioned': extract_products_mentioned(text, hits),
+        'pain_keywords': extract_pain_keywords(text, hits),
+        'has_solution_seeking': detect_solution_seeking(text, hits),
+        'has_time_investment': detect_time_investment(text, hits),
+        'dollar_amounts': dollar_amounts,
+        'exclamation_count': exclamations,
+        'caps_ratio': caps_ratio,
+        'hit_counts': count_lexicon_hits(hits)
+    }
+
+
+def analyze_pain_stream(source, window_size: int = STREAM_WINDOW_SIZE) -> Dict:
+    """
+    Analyze a very long document in fixed-size windows.
+
+    `source` is either a string or an iterable of string chunks (e.g. reads
+    from a file or HTTP response). Returns the same dictionary as
+    analyze_pain, in one pass over the input and with memory bounded by
+    window_size (plus the distinct products found).
+
+    Lexicon matching carries automaton state across windows, and regex
+    extraction only ever cuts windows at whitespace, so phrases and tokens
+    spanning a window boundary are still found. A run of non-whitespace
+    characters longer than window_size is the only thing that gets split.
     """
+    if isinstance(source, str):
+        text = source
+        source = (text[start:start + window_size]
+                  for start in range(0, len(text), window_size))
+
+    matcher_state = 0
+    matched = set()
+    exclamations = 0
+    letters = 0
+    caps = 0
+    dollar_amounts = []
+    mentions = []
+    caps_words = []
+    seen_mentions = set()
+    seen_caps_words = set()
+    carry = ''
+
+    def add_unique(products, seen, found):
+        for p in found:
+            p_lower = p.lower()
+            if p_lower not in seen:
+                seen.add(p_lower)
+                products.append(p)
+
+    def extract_tokens(segment):
+        dollar_amounts.extend(DOLLAR_AMOUNT_PATTERN.findall(segment))
+        add_unique(mentions, seen_mentions, MENTION_PATTERN.findall(segment))
+        add_unique(caps_words, seen_caps_words, extract_caps_words(segment))
+
+    for chunk in source:
+        # Lexicon hits, carrying automaton state across windows
+        chunk_matched, matcher_state = _LEXICON_MATCHER.scan(chunk.lower(), matcher_state)
+        matched.update(chunk_matched)
+
+        # Character counts for frustration signals
+        exclamations += chunk.count('!')
+        chunk_letters = list(filter(str.isalpha, chunk))
+        letters += len(chunk_letters)
+        caps += sum(map(str.isupper, chunk_letters))
+
+        # Regex tokens never contain whitespace: cut at the last whitespace
+        # and carry the unfinished tail into the next window
+        buffer = carry + chunk
+        cut = max(buffer.rfind(' '), buffer.rfind('\n'), buffer.rfind('\t'), buffer.rfind('\r'))
+
+        if cut == -1 and len(buffer) <= window_size:
+            carry = buffer
+            continue
+
+        if cut == -1:
+            cut = len(buffer) - 1
+
+        extract_tokens(buffer[:cut + 1])
+        carry = buffer[cut + 1:]
+
+    if carry:
+        extract_tokens(carry)
+
+    hits = group_lexicon_hits(matched)
+    caps_ratio = caps / letters if letters else 0.0
 
     return {
-        'frustration_score': calculate_frustration_score(text),
-        'budget_signal_score': calculate_budget_signal_score(text),
-        'products_mentioned': extract_products_mentioned(text),
-        'pain_keywords': extract_pain_keywords(text),
-        'has_solution_seeking': detect_solution_seeking(text),
-        'has_time_investment': detect_time_investment(text),
-        'dollar_amounts': extract_dollar_amounts(text)
+        'frustration_score': frustration_score_from_counts(
+            len(hits['frustration']), exclamations, caps_ratio),
+        'budget_signal_score': budget_signal_score_from_counts(
+            bool(dollar_amounts), bool(hits['paid_tool']), len(hits['budget'])),
+        'products_mentioned': merge_products(mentions, hits['paid_tool'], caps_words),
+        'pain_keywords': hits['frustration'] + hits['solution_seeking'] + hits['time_investment'],
+        'has_solution_seeking': bool(hits['solution_seeking']),
+        'has_time_investment': bool(hits['time_investment']),
+        'dollar_amounts': dollar_amounts,
+        'exclamation_count': exclamations,
+        'caps_ratio': caps_ratio,
+        'hit_counts': count_lexicon_hits(hits)
     }
 
 
+def pain_columns(analyses: Sequence[Dict]) -> Dict:
+    """
+    Turn analyze_pain results into the columns returned by analyze_pain_batch.
+    """
+    import numpy as np
+
+    count = len(analyses)
+
+    frustration = np.zeros(count, dtype=np.int16)
+    budget = np.zeros(count, dtype=np.int16)
+    solution_seeking = np.zeros(count, dtype=bool)
+    time_investment = np.zeros(count, dtype=bool)
+    dollar_counts = np.zeros(count, dtype=np.int32)
+    products_offsets = np.zeros(count + 1, dtype=np.int64)
+    keywords_offsets = np.zeros(count + 1, dtype=np.int64)
+
+    products = []
+    keywords = []
+
+    for i, analysis in enumerate(analyses):
+        frustration[i] = analysis['frustration_score']
+        budget[i] = analysis['budget_signal_score']
+        solution_seeking[i] = analysis['has_solution_seeking']
+        time_investment[i] = analysis['has_time_investment']
+        dollar_counts[i] = len(analysis['dollar_amounts'])
+
+        products.extend(analysis['products_mentioned'])
+        keywords.extend(analysis['pain_keywords'])
+        products_offsets[i + 1] = len(products)
+        keywords_offsets[i + 1] = len(keywords)
+
+    products_flat = np.empty(len(products), dtype=object)
+    products_flat[:] = products
+    keywords_flat = np.empty(len(keywords), dtype=object)
+    keywords_flat[:] = keywords
+
+    return {
+        'frustration_score': frustration,
+        'budget_signal_score': budget,
+        'has_solution_seeking': solution_seeking,
+        'has_time_investment': time_investment,
+        'dollar_amount_count': dollar_counts,
+        'products': products_flat,
+        'products_offsets': products_offsets,
+        'pain_keywords': keywords_flat,
+        'pain_keywords_offsets': keywords_offsets,
+        'analyses': list(analyses),
+    }
+
+
+def analyze_pain_batch(texts: Sequence[str]) -> Dict:
+    """
+    Analyze many texts at once, returning columns instead of one dict per post.
+
+    The columns feed scoring.calculate_opportunity_scores directly, so a
+    whole page or chunk of posts is scored in one vectorized call.
+
+    Returns dictionary of NumPy arrays (one entry per text unless noted):
+    - frustration_score: int16
+    - budget_signal_score: int16
+    - has_solution_seeking: bool
+    - has_time_investment: bool
+    - dollar_amount_count: int32
+    - products / products_offsets: flat object array of product names, and
+      int64 offsets of length len(texts) + 1 (products of text i are
+      products[products_offsets[i]:products_offsets[i + 1]])
+    - pain_keywords / pain_keywords_offsets: same layout for pain keywords
+    - analyses: the full analyze_pain dict of each text (a list), for
+      storing
+    """
+    return pain_columns([analyze_pain(text) for text in texts])
+
+
 # Testing
 if __name__ == "__main__":
     # Test with sample tweet
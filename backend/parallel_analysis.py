@@ -0,0 +1,116 @@
+"""
+Parallel Analysis Engine
+
+Runs pain analysis and opportunity scoring over large corpora using a
+process pool. Analysis is pure Python and CPU-bound, so threads don't
+help; each worker process handles whole chunks of records to keep
+pickling overhead low.
+
+Records are dicts with at least 'text' (plus 'likes', 'retweets' and
+'replies' for scoring). Results always come back in input order.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from backend.pain_detector import analyze_pain, analyze_pain_batch
+from backend.scoring import calculate_opportunity_score, calculate_opportunity_scores
+
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def get_worker_count(workers: int = None) -> int:
+    """Get worker count from argument, environment or CPU count."""
+    if workers is None:
+        workers = int(os.getenv('ANALYSIS_WORKERS', 0)) or os.cpu_count() or 1
+
+    return max(1, workers)
+
+
+def analyze_record(record: Dict) -> Tuple[Dict, int]:
+    """Analyze and score a single record. Returns (pain_analysis, score)."""
+    pain_analysis = analyze_pain(record['text'])
+    score = calculate_opportunity_score(record, pain_analysis)
+
+    return pain_analysis, score
+
+
+def analyze_records(records: List[Dict],
+                    analyze_batch: Callable[[List[str]], Dict] = analyze_pain_batch) -> List[Tuple[Dict, int]]:
+    """
+    Analyze and score records together. Returns (pain_analysis, score) per record.
+
+    The texts are analyzed with one analyze_batch call (analyze_pain_batch,
+    or analysis_cache.cached_analyze_pain_batch) and its columns scored
+    in one calculate_opportunity_scores call.
+    """
+    if not records:
+        return []
+
+    columns = analyze_batch([record['text'] for record in records])
+    scores = calculate_opportunity_scores(
+        [record.get('likes', 0) for record in records],
+        [record.get('retweets', 0) for record in records],
+        columns['frustration_score'],
+        columns['budget_signal_score'],
+        columns['has_solution_seeking'],
+        columns['has_time_investment'],
+    )['total']
+
+    return list(zip(columns['analyses'], scores.tolist()))
+
+
+def _analyze_chunk(records: List[Dict]) -> List[Tuple[Dict, int]]:
+    """Worker entry point: analyze one chunk of records."""
+    return analyze_records(records)
+
+
+def _chunked(records: Iterable[Dict], chunk_size: int) -> Iterator[List[Dict]]:
+    """Split an iterable of records into lists of chunk_size."""
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_analyze_corpus(records: Iterable[Dict], workers: int = None,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[Dict, int]]:
+    """
+    Analyze records in parallel, yielding (pain_analysis, score) in input order.
+
+    Records are consumed lazily and only a few chunks per worker are in
+    flight at once, so arbitrarily large corpora run in bounded memory.
+    """
+    workers = get_worker_count(workers)
+    chunks = _chunked(records, chunk_size)
+
+    if workers == 1:
+        for chunk in chunks:
+            yield from _analyze_chunk(chunk)
+        return
+
+    max_in_flight = workers * 2
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+
+        for chunk in chunks:
+            pending.append(executor.submit(_analyze_chunk, chunk))
+
+            if len(pending) >= max_in_flight:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
+
+def analyze_corpus(records: Iterable[Dict], workers: int = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Tuple[Dict, int]]:
+    """Analyze records in parallel. Returns list of (pain_analysis, score) in input order."""
+    return list(iter_analyze_corpus(records, workers=workers, chunk_size=chunk_size))
@@ -0,0 +1,102 @@
+"""
+Multi-Pattern Phrase Matcher
+
+Aho-Corasick automaton that finds every occurrence of a fixed set of
+phrases in a single pass over the text. Matching is plain substring
+matching (same semantics as `phrase in text`), so callers are expected
+to lowercase the text themselves when the phrases are lowercase.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+class PhraseMatcher:
+    """
+    Aho-Corasick automaton over a fixed list of (phrase, tag) pairs.
+
+    Each pair gets a pattern id (its position in the input), so callers can
+    recover the original order of their lexicons by sorting matched ids.
+    The same phrase may be registered under several tags.
+    """
+
+    def __init__(self, phrases: Iterable[Tuple[str, str]]):
+        self.phrases: List[Tuple[str, str]] = list(phrases)
+
+        # Build the trie
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+
+        for pattern_id, (phrase, _tag) in enumerate(self.phrases):
+            if not phrase:
+                raise ValueError("PhraseMatcher does not accept empty phrases")
+
+            state = 0
+            for ch in phrase:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][ch] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(pattern_id)
+
+        # Breadth-first pass: failure links, merged outputs and a full
+        # transition table (so scanning never has to walk failure links)
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state].extend(outputs[fail[state]])
+
+            transitions = dict(delta[fail[state]])
+            for ch, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(ch, 0)
+                transitions[ch] = child
+                queue.append(child)
+            delta[state] = transitions
+
+        self._delta = delta
+        self._outputs = [tuple(out) for out in outputs]
+
+    def scan(self, text: str, state: int = 0) -> Tuple[Set[int], int]:
+        """
+        Find all pattern ids occurring in text.
+
+        Returns (matched_ids, end_state). Passing end_state back in as
+        `state` for the next chunk continues the scan, so phrases spanning
+        chunk boundaries are still found.
+        """
+        delta = self._delta
+        outputs = self._outputs
+        matched = set()
+
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                matched.update(outputs[state])
+
+        return matched, state
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (end_index, pattern_id) for every occurrence in text."""
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+
+        for index, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            for pattern_id in outputs[state]:
+                yield index + 1, pattern_id
+
+    def phrase(self, pattern_id: int) -> str:
+        """Get the phrase for a pattern id."""
+        return self.phrases[pattern_id][0]
+
+    def tag(self, pattern_id: int) -> str:
+        """Get the tag for a pattern id."""
+        return self.phrases[pattern_id][1]
@@ -0,0 +1,186 @@
+"""
+Posts Table
+
+Every collected post (tweet, HN story, Stack Overflow question, GitHub
+issue, Reddit post, crawled page) is a row in `posts`, identified by
+(source, external_id) under a unique index: deduping a post is one
+lookup in that narrow index instead of building a prefixed string id
+(GH_..., SO_...) and probing tweets.tweet_id.
+
+Source-native metrics have their own columns instead of being squeezed
+into Twitter's:
+
+- points: HN points, Reddit upvotes, Stack Overflow score, GitHub reactions
+- comment_count: comments, or answers on Stack Overflow
+- view_count: page views (Stack Overflow)
+- author_reputation: author's site reputation (Stack Overflow)
+
+likes / retweets / replies stay the cross-source engagement proxies that
+engagement_score (and opportunity ranking) is computed from.
+
+`tweets` is a view over posts with the original columns; INSTEAD OF
+triggers make it writable, so older code and ad-hoc SQL keep working.
+
+New and upgraded databases have the same column definitions. SQLite
+can't change a column's constraints without rebuilding the table, so
+the new schema keeps the old ones instead: tweet_id stays UNIQUE NOT
+NULL (it's still the legacy post key, and every collector's tweet_id
+is already unique), and source / external_id are nullable columns.
+post_row() and the view's insert trigger fill in external_id from
+tweet_id when it's missing.
+
+Databases from before this table existed are upgraded in place by
+ensure_posts_table(): tweets is renamed to posts, which carries its
+rows, indexes, triggers and foreign keys along without copying data.
+"""
+
+# Source-native metric columns (NULL where a source doesn't have one)
+POST_METRIC_COLUMNS = ['points', 'comment_count', 'view_count', 'author_reputation']
+
+# Columns of the tweets compatibility view
+TWEET_COLUMNS = [
+    'id', 'tweet_id', 'text', 'created_at', 'author_username', 'author_followers',
+    'likes', 'retweets', 'replies', 'engagement_score', 'collected_at',
+    'source', 'external_id',
+]
+
+# Same columns, in the same order, as a tweets table upgraded by
+# migrate_tweets_to_posts (see the module docstring)
+POSTS_TABLE = """
+    CREATE TABLE IF NOT EXISTS posts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tweet_id TEXT UNIQUE NOT NULL,
+        text TEXT NOT NULL,
+        created_at TIMESTAMP NOT NULL,
+        author_username TEXT,
+        author_followers INTEGER,
+        likes INTEGER DEFAULT 0,
+        retweets INTEGER DEFAULT 0,
+        replies INTEGER DEFAULT 0,
+        engagement_score INTEGER,
+        collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        source TEXT,
+        external_id TEXT,
+        points INTEGER,
+        comment_count INTEGER,
+        view_count INTEGER,
+        author_reputation INTEGER
+    )
+"""
+
+POST_INDEXES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_posts_source_external_id ON posts(source, external_id)",
+]
+
+# Indexes replaced by idx_posts_source_external_id
+SUPERSEDED_POST_INDEXES = ['idx_tweets_external_id']
+
+TWEETS_VIEW = [
+    f"""
+    CREATE VIEW IF NOT EXISTS tweets AS
+    SELECT {', '.join(TWEET_COLUMNS)} FROM posts
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tweets_view_insert INSTEAD OF INSERT ON tweets BEGIN
+        INSERT INTO posts
+        (tweet_id, text, created_at, author_username, author_followers,
+         likes, retweets, replies, engagement_score, collected_at, source, external_id)
+        VALUES (new.tweet_id, new.text, new.created_at, new.author_username,
+                COALESCE(new.author_followers, 0), COALESCE(new.likes, 0),
+                COALESCE(new.retweets, 0), COALESCE(new.replies, 0), new.engagement_score,
+                COALESCE(new.collected_at, CURRENT_TIMESTAMP), new.source,
+                COALESCE(new.external_id, new.tweet_id));
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tweets_view_update INSTEAD OF UPDATE ON tweets BEGIN
+        UPDATE posts
+        SET {', '.join(f'{column} = new.{column}' for column in TWEET_COLUMNS[1:])}
+        WHERE id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tweets_view_delete INSTEAD OF DELETE ON tweets BEGIN
+        DELETE FROM posts WHERE id = old.id;
+    END
+    """,
+]
+
+
+def _object_type(conn, name: str):
+    """'table', 'view' or None for a schema object name."""
+    row = conn.execute("SELECT type FROM sqlite_master WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+
+def posts_table(conn) -> str:
+    """
+    Name of the table holding posts.
+
+    'tweets' on a database that hasn't been upgraded by
+    ensure_posts_table() yet, otherwise 'posts'.
+    """
+    return 'tweets' if _object_type(conn, 'tweets') == 'table' else 'posts'
+
+
+def create_posts_table(conn):
+    """Create the posts table, its indexes and the tweets compatibility view if missing."""
+    cursor = conn.cursor()
+
+    cursor.execute(POSTS_TABLE)
+
+    for statement in POST_INDEXES + TWEETS_VIEW:
+        cursor.execute(statement)
+
+    conn.commit()
+
+
+def ensure_posts_table(conn):
+    """Upgrade a database whose posts are still in a tweets table."""
+    if _object_type(conn, 'tweets') == 'table':
+        migrate_tweets_to_posts(conn)
+
+
+def migrate_tweets_to_posts(conn):
+    """
+    Rename tweets to posts and put the compatibility view in its place.
+
+    Runs in one transaction. The source columns must already exist (see
+    backend.sources.ensure_source_columns). Posts without an external_id
+    take their tweet_id; if two posts share (source, external_id) (e.g.
+    the same Reddit post stored by two collectors), all but the first
+    take their tweet_id too, so the unique index can be built.
+    """
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+
+    try:
+        cursor.execute("ALTER TABLE tweets RENAME TO posts")
+
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(posts)")]
+        for column in POST_METRIC_COLUMNS:
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE posts ADD COLUMN {column} INTEGER")
+
+        cursor.execute("UPDATE posts SET external_id = tweet_id WHERE external_id IS NULL")
+        cursor.execute("""
+            UPDATE posts SET external_id = tweet_id
+            WHERE id IN (
+                SELECT later.id FROM posts later
+                JOIN posts earlier ON earlier.source = later.source
+                    AND earlier.external_id = later.external_id
+                    AND earlier.id < later.id
+            )
+        """)
+
+        for statement in POST_INDEXES + TWEETS_VIEW:
+            cursor.execute(statement)
+
+        for name in SUPERSEDED_POST_INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+
+        conn.commit()
+
+    except Exception:
+        conn.rollback()
+        raise
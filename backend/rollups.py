@@ -0,0 +1,251 @@
+"""
+Daily Rollups
+
+Triggers keep two small summary tables current as rows are written, so
+dashboard statistics are read from a few rollup rows instead of loading
+and counting opportunities:
+
+- opportunity_daily_stats: opportunities and their score sum per
+  creation day x source x score band (SCORE_BAND_WIDTH points wide)
+- post_daily_stats: posts per collection day x source
+
+Days are UTC dates, as stored by CURRENT_TIMESTAMP, so a window of
+"created within N days" is exactly day >= DATE('now', '-N days').
+
+rebuild_rollups() recomputes both tables, a few days per transaction;
+collect_all.py runs it at the end of every run to repair any drift.
+"""
+
+import time
+from datetime import date, timedelta
+from typing import Dict
+
+from backend.migrations import BATCH_PAUSE_SECONDS
+
+# Scores are grouped in bands [0-9], [10-19], ... [100]
+SCORE_BAND_WIDTH = 10
+
+# Days of rows recomputed per rebuild transaction
+REBUILD_BATCH_DAYS = 7
+
+# Rollup key columns of an opportunities / posts row ({row} is its alias)
+OPPORTUNITY_KEY = (
+    "COALESCE(DATE({row}.created_at), DATE('now')), COALESCE({row}.source, ''), "
+    f"CAST({{row}}.score AS INTEGER) / {SCORE_BAND_WIDTH} * {SCORE_BAND_WIDTH}"
+)
+
+POST_KEY = "COALESCE(DATE({row}.collected_at), DATE('now')), COALESCE({row}.source, '')"
+
+
+def _add_opportunity(row: str) -> str:
+    return f"""
+        INSERT INTO opportunity_daily_stats (day, source, score_band, opportunities, score_sum)
+        VALUES ({OPPORTUNITY_KEY.format(row=row)}, 1, {row}.score)
+        ON CONFLICT (day, source, score_band) DO UPDATE
+        SET opportunities = opportunities + 1,
+            score_sum = score_sum + excluded.score_sum;
+    """
+
+
+def _remove_opportunity(row: str) -> str:
+    return f"""
+        UPDATE opportunity_daily_stats
+        SET opportunities = opportunities - 1,
+            score_sum = score_sum - {row}.score
+        WHERE (day, source, score_band) = ({OPPORTUNITY_KEY.format(row=row)});
+    """
+
+
+def _add_post(row: str) -> str:
+    return f"""
+        INSERT INTO post_daily_stats (day, source, posts)
+        VALUES ({POST_KEY.format(row=row)}, 1)
+        ON CONFLICT (day, source) DO UPDATE SET posts = posts + 1;
+    """
+
+
+def _remove_post(row: str) -> str:
+    return f"""
+        UPDATE post_daily_stats SET posts = posts - 1
+        WHERE (day, source) = ({POST_KEY.format(row=row)});
+    """
+
+
+ROLLUP_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS opportunity_daily_stats (
+        day TEXT NOT NULL,
+        source TEXT NOT NULL DEFAULT '',
+        score_band INTEGER NOT NULL,
+        opportunities INTEGER NOT NULL DEFAULT 0,
+        score_sum INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, source, score_band)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS post_daily_stats (
+        day TEXT NOT NULL,
+        source TEXT NOT NULL DEFAULT '',
+        posts INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, source)
+    ) WITHOUT ROWID
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS opportunities_rollup_insert
+    AFTER INSERT ON opportunities BEGIN
+        {_add_opportunity('new')}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS opportunities_rollup_delete
+    AFTER DELETE ON opportunities BEGIN
+        {_remove_opportunity('old')}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS opportunities_rollup_update
+    AFTER UPDATE OF score, source, created_at ON opportunities BEGIN
+        {_remove_opportunity('old')}
+        {_add_opportunity('new')}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tweets_rollup_insert
+    AFTER INSERT ON posts BEGIN
+        {_add_post('new')}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tweets_rollup_delete
+    AFTER DELETE ON posts BEGIN
+        {_remove_post('old')}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tweets_rollup_update
+    AFTER UPDATE OF source, collected_at ON posts BEGIN
+        {_remove_post('old')}
+        {_add_post('new')}
+    END
+    """,
+]
+
+
+def create_rollup_tables(conn) -> bool:
+    """
+    Create the rollup tables and their triggers if missing.
+
+    The rollups are built from existing rows, in batches, after the
+    tables and triggers are first created.
+
+    Returns:
+        True if the tables were created now
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT 1 FROM sqlite_master
+        WHERE type = 'table' AND name = 'opportunity_daily_stats'
+    """)
+    created = cursor.fetchone() is None
+
+    for statement in ROLLUP_SCHEMA:
+        cursor.execute(statement)
+    conn.commit()
+
+    if created:
+        rebuild_rollups(conn)
+
+    return created
+
+
+def ensure_rollup_tables(conn):
+    """Create the rollups on a database that has opportunities but no rollup tables yet."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type = 'table' AND name IN ('opportunities', 'posts', 'opportunity_daily_stats')
+    """)
+    names = {row[0] for row in cursor.fetchall()}
+
+    if names == {'opportunities', 'posts'}:
+        create_rollup_tables(conn)
+
+
+def _rebuild_days(conn, stats: str, table: str, column: str, select: str,
+                  batch_days: int, pause: float) -> int:
+    """
+    Recompute one rollup table, batch_days days of rows per transaction.
+
+    Each transaction replaces the rollup rows of its days with the
+    aggregates of the `table` rows whose `column` falls on those days
+    (a range search on the raw timestamp). Rows without a timestamp
+    count as today, as they do in the triggers.
+
+    Returns:
+        Number of rollup rows written
+    """
+    first, last, today = conn.execute(
+        f"SELECT DATE(MIN({column})), DATE(MAX({column})), DATE('now') FROM {table}"
+    ).fetchone()
+    today = date.fromisoformat(today)
+    start = min(date.fromisoformat(first), today) if first else today
+    end = max(date.fromisoformat(last), today) if last else today
+
+    written = 0
+    low = start
+
+    while low <= end:
+        high = low + timedelta(days=batch_days)
+        where = f"{column} >= :low AND {column} < :high"
+        if low <= today < high:
+            where = f"({where} OR {column} IS NULL)"
+        params = {'low': low.isoformat(), 'high': high.isoformat()}
+
+        conn.execute(f"DELETE FROM {stats} WHERE day >= :low AND day < :high", params)
+        written += conn.execute(select.format(where=where), params).rowcount
+        conn.commit()
+
+        low = high
+        if pause and low <= end:
+            time.sleep(pause)
+
+    # Days no row falls on any more
+    conn.execute(f"DELETE FROM {stats} WHERE day < ? OR day >= ?", (start.isoformat(), low.isoformat()))
+    conn.commit()
+
+    return written
+
+
+def rebuild_rollups(conn, batch_days: int = REBUILD_BATCH_DAYS,
+                    pause: float = BATCH_PAUSE_SECONDS) -> Dict[str, int]:
+    """
+    Recompute both rollup tables from opportunities and posts.
+
+    Runs one short transaction per batch_days days, so collectors can
+    write in between; the triggers keep the rollups current meanwhile.
+
+    Returns:
+        Dict with the number of opportunity and post rollup rows
+    """
+    opportunities = _rebuild_days(conn, 'opportunity_daily_stats', 'opportunities', 'created_at', f"""
+        INSERT INTO opportunity_daily_stats (day, source, score_band, opportunities, score_sum)
+        SELECT {OPPORTUNITY_KEY.format(row='o')}, COUNT(*), SUM(o.score)
+        FROM opportunities o
+        WHERE {{where}}
+        GROUP BY 1, 2, 3
+    """, batch_days, pause)
+
+    posts = _rebuild_days(conn, 'post_daily_stats', 'posts', 'collected_at', f"""
+        INSERT INTO post_daily_stats (day, source, posts)
+        SELECT {POST_KEY.format(row='t')}, COUNT(*)
+        FROM posts t
+        WHERE {{where}}
+        GROUP BY 1, 2
+    """, batch_days, pause)
+
+    return {'opportunities': opportunities, 'posts': posts}
+
+
+def score_band(score: int) -> int:
+    """Lower bound of the band a score falls in."""
+    return int(score) // SCORE_BAND_WIDTH * SCORE_BAND_WIDTH
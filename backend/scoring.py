@@ -165,6 +165,47 @@ def calculate_score_breakdown(tweet_data: Dict, pain_analysis: Dict) -> Dict:
     }
 
 
+def calculate_opportunity_scores(likes, retweets, frustration_score, budget_signal_score,
+                                 has_solution_seeking, has_time_investment) -> Dict:
+    """
+    Vectorized calculate_opportunity_score over whole columns.
+
+    Takes equal-length array-likes (e.g. the columns returned by
+    pain_detector.analyze_pain_batch) and scores every row in one call,
+    with the same results as the per-row functions.
+
+    Returns dictionary of int32 NumPy arrays:
+    - total: 0-100
+    - engagement: 0-20
+    - frustration: 0-30
+    - budget: budget signal score as given
+    """
+    import numpy as np
+
+    likes = np.asarray(likes, dtype=np.float64)
+    retweets = np.asarray(retweets, dtype=np.float64)
+    frustration_score = np.asarray(frustration_score, dtype=np.float64)
+    budget = np.asarray(budget_signal_score, dtype=np.int32)
+    has_solution_seeking = np.asarray(has_solution_seeking, dtype=bool)
+    has_time_investment = np.asarray(has_time_investment, dtype=bool)
+
+    # Engagement score (0-20)
+    engagement = np.minimum(20, np.trunc((likes + retweets * 2) / 10)).astype(np.int32)
+
+    # Frustration score (0-30)
+    frustration = frustration_score * 2.5 + has_solution_seeking * 5 + has_time_investment * 5
+    frustration = np.minimum(30, np.trunc(frustration)).astype(np.int32)
+
+    total = np.minimum(100, engagement + frustration + budget).astype(np.int32)
+
+    return {
+        'total': total,
+        'engagement': engagement,
+        'frustration': frustration,
+        'budget': budget,
+    }
+
+
 # Testing
 if __name__ == "__main__":
     # Test with sample data
@@ -0,0 +1,295 @@
+"""
+Full-Text Search
+
+SQLite FTS5 indexes over stored posts (posts.text) and opportunities
+(title, description), kept in sync with their tables by triggers.
+
+Both indexes are external-content tables: they store only the inverted
+index and read the text itself from posts / opportunities, so the
+database doesn't hold a second copy of every post.
+
+On an existing database the index is built in id ranges, one short
+transaction each (migration 0007), and the sync triggers are created
+in the same transaction that indexes the last rows. The app never edits
+post or opportunity text after inserting it, so rows indexed in an
+earlier batch can't go stale before the triggers exist;
+rebuild_search_index() repairs any drift from rows edited by hand.
+"""
+
+import html
+import re
+from typing import Dict, List
+
+from backend.migrations import BATCH_PAUSE_SECONDS, BATCH_SIZE, id_batches
+from backend.models import get_db_connection
+
+
+# Opportunity titles weigh more than descriptions when ranking
+TITLE_WEIGHT = 5.0
+DESCRIPTION_WEIGHT = 1.0
+
+SNIPPET_TOKENS = 16
+SNIPPET_ELLIPSIS = '…'
+
+# FTS5 marks matches with these control characters; the snippet is then
+# HTML-escaped and they are swapped for <mark> tags (highlight_snippet)
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
+
+MAX_PER_PAGE = 100
+
+TOKEN_PATTERN = re.compile(r'\w+\*?')
+
+SEARCH_TABLES = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tweets_fts USING fts5(
+        text,
+        content='posts',
+        content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS opportunities_fts USING fts5(
+        title,
+        description,
+        content='opportunities',
+        content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+]
+
+SEARCH_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tweets_fts_insert AFTER INSERT ON posts BEGIN
+        INSERT INTO tweets_fts (rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tweets_fts_delete AFTER DELETE ON posts BEGIN
+        INSERT INTO tweets_fts (tweets_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tweets_fts_update AFTER UPDATE OF text ON posts BEGIN
+        INSERT INTO tweets_fts (tweets_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        INSERT INTO tweets_fts (rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS opportunities_fts_insert AFTER INSERT ON opportunities BEGIN
+        INSERT INTO opportunities_fts (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS opportunities_fts_delete AFTER DELETE ON opportunities BEGIN
+        INSERT INTO opportunities_fts (opportunities_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS opportunities_fts_update
+    AFTER UPDATE OF title, description ON opportunities BEGIN
+        INSERT INTO opportunities_fts (opportunities_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO opportunities_fts (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+# (FTS table, content table, indexed columns)
+SEARCH_INDEXES = [
+    ('tweets_fts', 'posts', 'text'),
+    ('opportunities_fts', 'opportunities', 'title, description'),
+]
+
+
+def _index_rows(conn, fts: str, table: str, columns: str, low: int, high: int = None):
+    """Index the content rows with low < id <= high (no upper bound if high is None), without committing."""
+    statement = f"""
+        INSERT INTO {fts} (rowid, {columns})
+        SELECT id, {columns} FROM {table}
+        WHERE id > ?
+    """
+    params = [low]
+
+    if high is not None:
+        statement += " AND id <= ?"
+        params.append(high)
+
+    conn.execute(statement, params)
+
+
+def create_search_index(conn, batch_size: int = BATCH_SIZE,
+                        pause: float = BATCH_PAUSE_SECONDS) -> bool:
+    """
+    Create the FTS tables and sync triggers if missing.
+
+    Existing rows are indexed in id ranges, one transaction each, before
+    the triggers are created. An interrupted build resumes after the
+    last indexed row (the highest id in the FTS table's docsize shadow
+    table).
+
+    Returns:
+        True if the index was completed now
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'tweets_fts_insert'
+    """)
+    created = cursor.fetchone() is None
+
+    for statement in SEARCH_TABLES:
+        cursor.execute(statement)
+    conn.commit()
+
+    if not created:
+        return False
+
+    indexed = {}
+
+    for fts, table, columns in SEARCH_INDEXES:
+        last = conn.execute(f"SELECT MAX(id) FROM {fts}_docsize").fetchone()[0] or 0
+
+        for low, high in id_batches(conn, table, start=last, batch_size=batch_size, pause=pause):
+            _index_rows(conn, fts, table, columns, low, high)
+            conn.commit()
+            last = high
+
+        indexed[fts] = last
+
+    # Rows inserted during the batches are indexed in the same
+    # transaction that creates the triggers, so none is missed or
+    # indexed twice
+    cursor.execute("BEGIN IMMEDIATE")
+    for fts, table, columns in SEARCH_INDEXES:
+        _index_rows(conn, fts, table, columns, indexed[fts])
+    for statement in SEARCH_TRIGGERS:
+        cursor.execute(statement)
+    conn.commit()
+
+    return True
+
+
+def build_match_query(query: str) -> str:
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+
+    Every word must match (implicit AND). Words are quoted so FTS5
+    operators and punctuation in user input can't cause syntax errors;
+    a trailing * is kept as a prefix search.
+
+    Returns empty string if the query has no searchable words.
+    """
+    terms = []
+
+    for token in TOKEN_PATTERN.findall(query):
+        if token.endswith('*'):
+            terms.append(f'"{token[:-1]}"*')
+        else:
+            terms.append(f'"{token}"')
+
+    return ' '.join(terms)
+
+
+def highlight_snippet(snippet: str) -> str:
+    """HTML-escape an FTS5 snippet and wrap its matches in <mark>."""
+    if snippet is None:
+        return None
+
+    return (html.escape(snippet)
+            .replace(SNIPPET_START, '<mark>')
+            .replace(SNIPPET_END, '</mark>'))
+
+
+def _page_bounds(page: int, per_page: int):
+    """Clamp pagination parameters and return (page, per_page, offset)."""
+    page = max(1, page)
+    per_page = min(max(1, per_page), MAX_PER_PAGE)
+    return page, per_page, (page - 1) * per_page
+
+
+def search_posts(query: str, page: int = 1, per_page: int = 20) -> Dict:
+    """
+    Search stored posts, best BM25 match first.
+
+    Returns:
+        Dict with total, page, per_page and results (post rows plus
+        'snippet', HTML-escaped with matches wrapped in <mark>, and 'rank')
+    """
+    match = build_match_query(query)
+    page, per_page, offset = _page_bounds(page, per_page)
+
+    if not match:
+        return {'total': 0, 'page': page, 'per_page': per_page, 'results': []}
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT COUNT(*) FROM tweets_fts WHERE tweets_fts MATCH ?", (match,))
+        total = cursor.fetchone()[0]
+
+        cursor.execute("""
+            SELECT t.id, t.tweet_id, t.created_at, t.author_username,
+                   t.likes, t.retweets, t.replies, t.engagement_score,
+                   snippet(tweets_fts, 0, ?, ?, ?, ?) AS snippet,
+                   bm25(tweets_fts) AS rank
+            FROM tweets_fts
+            JOIN posts t ON t.id = tweets_fts.rowid
+            WHERE tweets_fts MATCH ?
+            ORDER BY rank
+            LIMIT ? OFFSET ?
+        """, (SNIPPET_START, SNIPPET_END, SNIPPET_ELLIPSIS, SNIPPET_TOKENS,
+              match, per_page, offset))
+        results = [dict(row, snippet=highlight_snippet(row['snippet'])) for row in cursor.fetchall()]
+
+    return {'total': total, 'page': page, 'per_page': per_page, 'results': results}
+
+
+def search_opportunities(query: str, page: int = 1, per_page: int = 20) -> Dict:
+    """
+    Search opportunities by title and description, best BM25 match first.
+
+    Title matches rank above description matches (TITLE_WEIGHT).
+
+    Returns:
+        Dict with total, page, per_page and results (opportunity rows
+        plus 'snippet' from the description, as in search_posts, and 'rank')
+    """
+    match = build_match_query(query)
+    page, per_page, offset = _page_bounds(page, per_page)
+
+    if not match:
+        return {'total': 0, 'page': page, 'per_page': per_page, 'results': []}
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT COUNT(*) FROM opportunities_fts WHERE opportunities_fts MATCH ?", (match,))
+        total = cursor.fetchone()[0]
+
+        cursor.execute("""
+            SELECT o.*,
+                   snippet(opportunities_fts, 1, ?, ?, ?, ?) AS snippet,
+                   bm25(opportunities_fts, ?, ?) AS rank
+            FROM opportunities_fts
+            JOIN opportunities o ON o.id = opportunities_fts.rowid
+            WHERE opportunities_fts MATCH ?
+            ORDER BY rank
+            LIMIT ? OFFSET ?
+        """, (SNIPPET_START, SNIPPET_END, SNIPPET_ELLIPSIS, SNIPPET_TOKENS,
+              TITLE_WEIGHT, DESCRIPTION_WEIGHT, match, per_page, offset))
+        results = [dict(row, snippet=highlight_snippet(row['snippet'])) for row in cursor.fetchall()]
+
+    return {'total': total, 'page': page, 'per_page': per_page, 'results': results}
+
+
+def rebuild_search_index():
+    """Rebuild both FTS indexes from their content tables."""
+    with get_db_connection(read_only=False) as conn:
+        conn.execute("INSERT INTO tweets_fts (tweets_fts) VALUES ('rebuild')")
+        conn.execute("INSERT INTO opportunities_fts (opportunities_fts) VALUES ('rebuild')")
+        conn.commit()
@@ -0,0 +1,150 @@
+"""
+Post Sources
+
+Every stored post (tweets row) and opportunity records where it came
+from in `source` (a SOURCES key) and its id on that site in
+`external_id`. Per-source queries then filter on an indexed column
+instead of parsing title prefixes in Python.
+
+Rows stored before these columns existed are backfilled from the
+conventions the collectors have always used: tweet_id prefixes (GH_,
+SO_, REDDIT_), subreddit authors ('r/...') and opportunity title
+prefixes ('[HN]', '[SO/...]', '[GH/...]', ...). A purely numeric
+tweet_id is a HackerNews story if an '[HN]' opportunity links it, and a
+tweet otherwise (id length can't tell them apart).
+"""
+
+from typing import Dict
+
+from backend.posts import posts_table
+
+
+# Source key -> display name
+SOURCES = {
+    'hackernews': 'HackerNews',
+    'stackoverflow': 'Stack Overflow',
+    'github': 'GitHub',
+    'reddit': 'Reddit',
+    'twitter': 'Twitter',
+    'indiehackers': 'Indie Hackers',
+    'producthunt': 'Product Hunt',
+    'research': 'Research',
+}
+
+# {posts} is the posts table (see posts_table); (source, external_id) is
+# covered by the posts table's unique index
+SOURCE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_opportunities_source ON opportunities(source, created_at, score)",
+    "CREATE INDEX IF NOT EXISTS idx_tweets_source ON {posts}(source, created_at)",
+]
+
+BACKFILL_TWEETS = """
+    UPDATE {posts}
+    SET source = CASE
+            WHEN tweet_id LIKE 'GH\\_%' ESCAPE '\\' THEN 'github'
+            WHEN tweet_id LIKE 'SO\\_%' ESCAPE '\\' THEN 'stackoverflow'
+            WHEN tweet_id LIKE 'REDDIT\\_%' ESCAPE '\\' THEN 'reddit'
+            WHEN tweet_id LIKE 'CARGO\\_%' ESCAPE '\\' THEN 'research'
+            WHEN author_username LIKE 'r/%' THEN 'reddit'
+            WHEN author_username IN ('hackernews', 'indiehackers', 'producthunt') THEN author_username
+            WHEN tweet_id NOT GLOB '*[^0-9]*' AND {posts}.id IN (
+                SELECT ot.tweet_id FROM opportunities o
+                JOIN opportunity_tweets ot ON ot.opportunity_id = o.id
+                WHERE o.title LIKE '[HN]%' OR o.title LIKE '[HACKERNEWS]%'
+            ) THEN 'hackernews'
+            WHEN tweet_id NOT GLOB '*[^0-9]*' THEN 'twitter'
+        END,
+        external_id = CASE
+            WHEN tweet_id LIKE 'GH\\_%' ESCAPE '\\' THEN substr(tweet_id, 4)
+            WHEN tweet_id LIKE 'SO\\_%' ESCAPE '\\' THEN substr(tweet_id, 4)
+            WHEN tweet_id LIKE 'REDDIT\\_%' ESCAPE '\\' THEN substr(tweet_id, 8)
+            ELSE tweet_id
+        END
+    WHERE source IS NULL
+"""
+
+# Title prefix first; opportunities without one (e.g. clustered tweets)
+# take the source of their first post
+BACKFILL_OPPORTUNITIES = """
+    UPDATE opportunities
+    SET source = CASE
+            WHEN title LIKE '[HN]%' OR title LIKE '[HACKERNEWS]%' THEN 'hackernews'
+            WHEN title LIKE '[SO/%' THEN 'stackoverflow'
+            WHEN title LIKE '[GH/%' THEN 'github'
+            WHEN title LIKE '[Reddit]%' OR title LIKE '[CARGO THEFT - r/%' THEN 'reddit'
+            WHEN title LIKE '[CARGO THEFT]%' OR title LIKE '[CARGO VARIATION]%' THEN 'research'
+            WHEN title LIKE '[INDIEHACKERS]%' THEN 'indiehackers'
+            WHEN title LIKE '[PRODUCTHUNT]%' THEN 'producthunt'
+            ELSE (
+                SELECT t.source FROM opportunity_tweets ot
+                JOIN tweets t ON t.id = ot.tweet_id
+                WHERE ot.opportunity_id = opportunities.id
+                ORDER BY t.id LIMIT 1
+            )
+        END,
+        external_id = (
+            SELECT t.external_id FROM opportunity_tweets ot
+            JOIN tweets t ON t.id = ot.tweet_id
+            WHERE ot.opportunity_id = opportunities.id
+            ORDER BY t.id LIMIT 1
+        )
+    WHERE source IS NULL
+"""
+
+
+def create_source_columns(conn, backfill: bool = True) -> bool:
+    """
+    Add the source / external_id columns and their indexes if missing.
+
+    Existing rows are backfilled when the columns are first added, unless
+    backfill is False (the migration backfills in batches instead).
+
+    Returns:
+        True if the columns were added now
+    """
+    cursor = conn.cursor()
+    posts = posts_table(conn)
+    added = False
+
+    for table in (posts, 'opportunities'):
+        columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({table})")]
+        if 'source' not in columns:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN source TEXT")
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN external_id TEXT")
+            added = True
+
+    for statement in SOURCE_INDEXES:
+        cursor.execute(statement.format(posts=posts))
+
+    if added and backfill:
+        backfill_sources(conn)
+
+    conn.commit()
+    return added
+
+
+def ensure_source_columns(conn):
+    """Add the source columns to a database whose posts table doesn't have them yet."""
+    columns = [row[1] for row in conn.execute(f"PRAGMA table_info({posts_table(conn)})")]
+
+    if columns and 'source' not in columns:
+        create_source_columns(conn)
+
+
+def backfill_sources(conn) -> Dict[str, int]:
+    """
+    Fill in source / external_id for rows that don't have a source yet.
+
+    Returns:
+        Dict with the number of tweets and opportunities updated
+    """
+    cursor = conn.cursor()
+
+    cursor.execute(BACKFILL_TWEETS.format(posts=posts_table(conn)))
+    tweets = cursor.rowcount
+
+    cursor.execute(BACKFILL_OPPORTUNITIES)
+    opportunities = cursor.rowcount
+
+    conn.commit()
+    return {'tweets': tweets, 'opportunities': opportunities}
@@ -0,0 +1,121 @@
+"""
+SQLite Storage Configuration
+
+Connection settings for the SQLite store, applied once per connection
+by backend.models:
+
+- WAL journaling, so readers (the Flask app) never block on writers
+  (collectors) and writers don't wait for readers
+- busy_timeout, so overlapping writers wait for the lock instead of
+  failing with "database is locked"
+- synchronous=NORMAL (safe with WAL; only the last commits can be lost
+  on power failure, the database can't be corrupted)
+- mmap_size and cache_size for read performance
+- periodic checkpoints, so the WAL file doesn't grow without bound while
+  long collection runs keep writing
+
+Every setting can be overridden with an SQLITE_* environment variable.
+"""
+
+import os
+import time
+from typing import Dict, Tuple
+
+
+DEFAULT_SETTINGS = {
+    'busy_timeout_ms': 5000,
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,       # 256 MB
+    'cache_size_kib': 64 * 1024,          # 64 MB page cache per connection
+    'wal_autocheckpoint_pages': 1000,
+    'checkpoint_interval_seconds': 300,
+}
+
+SYNCHRONOUS_MODES = {'OFF', 'NORMAL', 'FULL', 'EXTRA'}
+CHECKPOINT_MODES = {'PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'}
+
+# When this process last checkpointed each database
+_last_checkpoint = {}
+
+
+def get_storage_settings() -> Dict:
+    """Storage settings: defaults overridden by SQLITE_* environment variables."""
+    settings = {}
+
+    for name, default in DEFAULT_SETTINGS.items():
+        value = os.getenv(f'SQLITE_{name.upper()}')
+        settings[name] = default if value is None else type(default)(value)
+
+    settings['synchronous'] = settings['synchronous'].upper()
+    if settings['synchronous'] not in SYNCHRONOUS_MODES:
+        raise ValueError(f"Invalid SQLITE_SYNCHRONOUS: {settings['synchronous']}")
+
+    return settings
+
+
+def enable_wal(conn) -> str:
+    """
+    Switch the database to WAL journaling (persistent, stored in the file).
+
+    Returns the resulting journal mode ('wal', or 'memory' for in-memory
+    databases).
+    """
+    return conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+
+
+def configure_connection(conn, read_only: bool = False):
+    """Apply storage settings to a new connection."""
+    settings = get_storage_settings()
+
+    conn.execute(f"PRAGMA busy_timeout = {int(settings['busy_timeout_ms'])}")
+    conn.execute(f"PRAGMA mmap_size = {int(settings['mmap_size'])}")
+    conn.execute(f"PRAGMA cache_size = -{int(settings['cache_size_kib'])}")
+
+    if read_only:
+        conn.execute("PRAGMA query_only = ON")
+        return
+
+    conn.execute(f"PRAGMA synchronous = {settings['synchronous']}")
+    conn.execute(f"PRAGMA wal_autocheckpoint = {int(settings['wal_autocheckpoint_pages'])}")
+    enable_wal(conn)
+
+
+def checkpoint(conn, mode: str = 'PASSIVE') -> Tuple[int, int, int]:
+    """
+    Checkpoint the WAL into the main database file.
+
+    PASSIVE never waits for readers; TRUNCATE waits for them and then
+    resets the WAL file to zero bytes (use at the end of a run).
+
+    Returns (busy, wal_pages, checkpointed_pages) as reported by SQLite.
+    """
+    mode = mode.upper()
+    if mode not in CHECKPOINT_MODES:
+        raise ValueError(f"Invalid checkpoint mode: {mode}")
+
+    return tuple(conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone())
+
+
+def maybe_checkpoint(conn, db_path: str) -> bool:
+    """
+    Run a PASSIVE checkpoint if this process hasn't done one recently.
+
+    Auto-checkpoints only happen when a commit pushes the WAL past
+    wal_autocheckpoint pages; this adds a time-based checkpoint so the WAL
+    is folded back regularly during long, slow collection runs too
+    (readers search the WAL before the database file, so a long WAL makes
+    every dashboard query slower).
+
+    Returns True if a checkpoint was run.
+    """
+    interval = int(os.getenv('SQLITE_CHECKPOINT_INTERVAL_SECONDS',
+                             DEFAULT_SETTINGS['checkpoint_interval_seconds']))
+    now = time.monotonic()
+    last = _last_checkpoint.setdefault(db_path, now)
+
+    if now - last < interval:
+        return False
+
+    _last_checkpoint[db_path] = now
+    checkpoint(conn, 'PASSIVE')
+    return True
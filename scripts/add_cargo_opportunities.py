@@ -141,7 +141,9 @@ Gap: Network effects - more data = better for everyone. Creates moat.''',
             author_followers=10000,  # High credibility
             likes=likes,
             retweets=retweets,
-            replies=opp_data['engagement']['replies']
+            replies=opp_data['engagement']['replies'],
+            source='research',
+            external_id=f"CARGO_RESEARCH_{i}"
         )
 
         # Create Pain Analysis
@@ -159,7 +161,9 @@ Gap: Network effects - more data = better for everyone. Creates moat.''',
             description=opp_data['description'],
             score=total_score,
             first_seen=datetime.now().isoformat(),
-            last_seen=datetime.now().isoformat()
+            last_seen=datetime.now().isoformat(),
+            source='research',
+            external_id=f"CARGO_RESEARCH_{i}"
         )
 
         Opportunity.add_tweet(opportunity_id, tweet_id)
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Backfill product mentions and keyword hits
+
+Writes product_mentions / keyword_hits rows (see backend/mentions.py)
+for posts analyzed before those tables existed, from each post's latest
+pain analysis. Commits in batches; safe to interrupt and re-run.
+"""
+
+import os
+import sys
+from datetime import datetime
+from dotenv import load_dotenv
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.mentions import backfill_mentions
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    print("=" * 60)
+    print("BACKFILL PRODUCT MENTIONS AND KEYWORD HITS")
+    print("=" * 60)
+    print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    try:
+        processed = backfill_mentions()
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+    print(f"✓ Processed {processed} posts")
+    print("=" * 60)
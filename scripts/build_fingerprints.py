@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Build the near-duplicate index for already-stored posts
+
+Fingerprints every post in the tweets table that isn't indexed yet, so
+collectors can detect cross-posts of content collected before the index
+existed. Safe to re-run.
+"""
+
+import os
+import sys
+from datetime import datetime
+from dotenv import load_dotenv
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.dedupe import rebuild_index
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    print("=" * 60)
+    print("BUILD NEAR-DUPLICATE INDEX")
+    print("=" * 60)
+    print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    try:
+        indexed = rebuild_index()
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+    print(f"✓ Indexed {indexed} posts")
+    print("=" * 60)
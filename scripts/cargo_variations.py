@@ -18,7 +18,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from backend.models import Tweet, PainAnalysis, Opportunity
-from backend.microsaas_scoring import calculate_microsaas_score, get_microsaas_breakdown
+from backend.microsaas_scoring import get_microsaas_breakdown
 
 
 # 20 Variations on the core idea
@@ -367,9 +367,9 @@ def score_variations():
             'pain_keywords': var['keywords']
         }
 
-        # Calculate MicroSaaS score
-        score = calculate_microsaas_score(var, pain_analysis)
+        # Calculate MicroSaaS score (total and breakdown in one pass)
         breakdown = get_microsaas_breakdown(var, pain_analysis)
+        score = breakdown['total']
 
         results.append({
             'rank': i,
@@ -478,7 +478,9 @@ def score_variations():
             author_followers=5000,
             likes=100,
             retweets=30,
-            replies=50
+            replies=50,
+            source='research',
+            external_id=f"CARGO_VAR_{i}"
         )
 
         # Create Pain Analysis
@@ -496,7 +498,9 @@ def score_variations():
             description=result['description'],
             score=result['score'],
             first_seen=datetime.now().isoformat(),
-            last_seen=datetime.now().isoformat()
+            last_seen=datetime.now().isoformat(),
+            source='research',
+            external_id=f"CARGO_VAR_{i}"
         )
 
         Opportunity.add_tweet(opportunity_id, tweet_id)
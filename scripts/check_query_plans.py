@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Check dashboard query plans
+
+Runs the dashboard queries (top opportunities, per-source counts, posts
+collected today) and checks with EXPLAIN QUERY PLAN that each still
+searches its index (see backend/indexes.py) instead of scanning the
+table. Exits non-zero if any doesn't, so a query or schema change that
+loses an index is caught before it reaches a full database.
+"""
+
+import os
+import sys
+from dotenv import load_dotenv
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.indexes import check_query_plans
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    print("=" * 60)
+    print("DASHBOARD QUERY PLANS")
+    print("=" * 60)
+
+    try:
+        results = check_query_plans()
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+    for result in results:
+        mark = "✓" if result['ok'] else "✗"
+        print(f"\n{mark} {result['name']} (expects {result['index']})")
+        for step in result['plan']:
+            print(f"    {step}")
+
+    failed = [result['name'] for result in results if not result['ok']]
+
+    print()
+    print("=" * 60)
+    if failed:
+        print(f"✗ {len(failed)} of {len(results)} queries don't use their index")
+        sys.exit(1)
+
+    print(f"✓ All {len(results)} queries use their index")
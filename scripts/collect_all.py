@@ -122,8 +122,36 @@ def main():
             print(f"   - {collector}: {error[:60]}")
         print()
 
+    from backend.models import Opportunity, checkpoint_database
+
+    # Repair any drift in the trigger-maintained opportunity counters
+    try:
+        corrected = Opportunity.reconcile_counters()
+        print(f"✓ Opportunity counters reconciled ({corrected} corrected)")
+        print()
+    except Exception as e:
+        print(f"⚠ Counter reconciliation failed: {e}")
+        print()
+
+    # Rebuild the trigger-maintained daily rollups behind the dashboard stats
+    try:
+        rows = Opportunity.rebuild_rollups()
+        print(f"✓ Daily rollups rebuilt ({rows['opportunities']} opportunity rows, {rows['posts']} post rows)")
+        print()
+    except Exception as e:
+        print(f"⚠ Rollup rebuild failed: {e}")
+        print()
+
+    # Fold the write-ahead log back into the database file
+    try:
+        checkpoint_database('TRUNCATE')
+        print("✓ Database checkpointed")
+        print()
+    except Exception as e:
+        print(f"⚠ Checkpoint failed: {e}")
+        print()
+
     # Show top opportunities from today
-    from backend.models import Opportunity
     top_opps = Opportunity.get_top_opportunities(limit=10, min_score=40, days=1)
 
     if top_opps:
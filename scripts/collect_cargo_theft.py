@@ -21,9 +21,11 @@ from dotenv import load_dotenv
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from backend.models import Tweet, PainAnalysis, Opportunity
-from backend.pain_detector import analyze_pain
-from backend.scoring import calculate_opportunity_score
+from backend.models import Tweet, Opportunity
+from backend.analysis_cache import cached_analyze_pain_batch
+from backend.parallel_analysis import analyze_records
+from backend.dedupe import fingerprint, find_near_duplicate, attach_near_duplicate
+from backend.ingest import ingest_post
 
 
 def search_web_cargo_theft(keyword):
@@ -103,8 +105,13 @@ def search_reddit_cargo_theft(keyword, subreddit, limit=25):
         return []
 
 
-def process_cargo_theft_post(post, source_type='reddit'):
-    """Process a cargo theft related post for pain signals."""
+def prepare_cargo_theft_post(post, source_type='reddit'):
+    """
+    Build the post record for a cargo theft post that still needs analysis.
+
+    Returns None for posts that are too short, already stored, or
+    near-duplicates of a stored post (attached to its opportunity).
+    """
 
     # Combine title and text
     title = post.get('title', '')
@@ -112,17 +119,66 @@ def process_cargo_theft_post(post, source_type='reddit'):
     full_text = f"{title}\n\n{text}"
 
     if not full_text or len(full_text) < 20:
-        return False, 0
+        return None
 
     # Create unique ID
     post_id = f"{source_type.upper()}_{post.get('id', '')}"
 
     # Check if already exists
-    if Tweet.exists(post_id):
-        return False, 0
+    if Tweet.exists_in_source(source_type, post.get('id', '')):
+        return None
+
+    post_record = {
+        'tweet_id': post_id,
+        'text': full_text[:1000],
+        'created_at': datetime.fromtimestamp(post.get('created_utc', time.time())).isoformat(),
+        'author_username': post.get('author', 'unknown'),
+        'author_followers': 0,
+        'likes': post.get('score', 0),
+        'retweets': post.get('num_comments', 0) // 2,
+        'replies': post.get('num_comments', 0),
+        'source': source_type,
+        'external_id': str(post.get('id', '')),
+        'points': post.get('score', 0),
+        'comment_count': post.get('num_comments', 0)
+    }
 
-    # Analyze pain - cargo theft should score high on frustration + budget signals
-    pain_analysis = analyze_pain(full_text)
+    # Near-duplicate of a stored post (e.g. cross-posted to another trucking subreddit)?
+    # Attach it to the existing opportunity instead of analyzing it again
+    post_fingerprint = fingerprint(full_text)
+    duplicate_of = find_near_duplicate(post_fingerprint)
+    if duplicate_of:
+        attach_near_duplicate(duplicate_of, post_record)
+        return None
+
+    return {
+        'text': full_text,
+        'likes': post.get('score', 0),
+        'retweets': post.get('num_comments', 0) // 2,
+        'replies': post.get('num_comments', 0),
+        'post': post_record,
+        'fingerprint': post_fingerprint,
+        'source_post': post,
+    }
+
+
+def store_cargo_theft_post(candidate, pain_analysis, score):
+    """
+    Store an analyzed cargo theft post if it scores high enough.
+
+    pain_analysis and score come from the base analysis; cargo theft
+    should score high on frustration + budget signals. Returns
+    (stored, score).
+    """
+    post = candidate['source_post']
+    title = post.get('title', '')
+    full_text = candidate['text']
+
+    # Near-duplicate of a post stored earlier on the same page?
+    duplicate_of = find_near_duplicate(candidate['fingerprint'])
+    if duplicate_of:
+        attach_near_duplicate(duplicate_of, candidate['post'])
+        return False, 0
 
     # Boost score for cargo theft specific keywords
     from backend.pain_keywords import CARGO_THEFT_KEYWORDS, CARGO_THEFT_PAIN_PHRASES
@@ -140,16 +196,6 @@ def process_cargo_theft_post(post, source_type='reddit'):
         if phrase in text_lower:
             cargo_boost += 10
 
-    # Create engagement data
-    tweet_data = {
-        'likes': post.get('score', 0),
-        'retweets': post.get('num_comments', 0) // 2,
-        'replies': post.get('num_comments', 0)
-    }
-
-    # Calculate base score
-    score = calculate_opportunity_score(tweet_data, pain_analysis)
-
     # Add cargo theft domain boost (max +30)
     score = min(100, score + min(30, cargo_boost))
 
@@ -160,39 +206,22 @@ def process_cargo_theft_post(post, source_type='reddit'):
 
     # Store
     try:
-        created_at = datetime.fromtimestamp(post.get('created_utc', time.time())).isoformat()
-
-        tweet_id = Tweet.create(
-            tweet_id=post_id,
-            text=full_text[:1000],
-            created_at=created_at,
-            author_username=post.get('author', 'unknown'),
-            author_followers=0,
-            likes=post.get('score', 0),
-            retweets=post.get('num_comments', 0) // 2,
-            replies=post.get('num_comments', 0)
-        )
-
-        # Pain analysis
-        PainAnalysis.create(
-            tweet_id=tweet_id,
-            frustration_score=pain_analysis['frustration_score'],
-            budget_signal_score=pain_analysis['budget_signal_score'],
-            products_mentioned=pain_analysis['products_mentioned'],
-            pain_keywords=pain_analysis['pain_keywords']
-        )
-
-        # Create opportunity
         subreddit = post.get('subreddit', 'WEB')
-        opportunity_id = Opportunity.create(
-            title=f"[CARGO THEFT - r/{subreddit}] {title[:100]}",
-            description=f"{full_text[:400]}\n\nSource: {post.get('url', 'N/A')}",
-            score=score,
-            first_seen=datetime.now().isoformat(),
-            last_seen=datetime.now().isoformat()
+
+        # Post, analysis and opportunity in one transaction; similar posts join the same clustered opportunity
+        stored = ingest_post(
+            candidate['post'],
+            pain_analysis,
+            cluster={
+                'title': f"[CARGO THEFT - r/{subreddit}] {title[:100]}",
+                'description': f"{full_text[:400]}\n\nSource: {post.get('url', 'N/A')}",
+                'score': score,
+            },
+            post_fingerprint=candidate['fingerprint']
         )
 
-        Opportunity.add_tweet(opportunity_id, tweet_id)
+        if stored is None:
+            return False, 0
 
         return True, score
 
@@ -245,8 +274,14 @@ def collect_cargo_theft():
             stored_this_search = 0
             high_value_this_search = 0
 
-            for post in posts:
-                stored, score = process_cargo_theft_post(post, source_type='reddit')
+            # Analyze and score the page's new posts together
+            candidates = [c for c in (prepare_cargo_theft_post(post, source_type='reddit')
+                                      for post in posts) if c]
+            analyzed = analyze_records(candidates, cached_analyze_pain_batch)
+
+            for candidate, (pain_analysis, score) in zip(candidates, analyzed):
+                stored, score = store_cargo_theft_post(candidate, pain_analysis, score)
+                post = candidate['source_post']
 
                 if stored:
                     stored_this_search += 1
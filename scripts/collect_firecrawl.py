@@ -22,9 +22,12 @@ from dotenv import load_dotenv
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from backend.models import Tweet, PainAnalysis, Opportunity
-from backend.pain_detector import analyze_pain
+from backend.models import Tweet, Opportunity
+from backend.analysis_cache import cached_analyze_pain
+from backend.pain_detector import analyze_pain_stream
 from backend.scoring import calculate_opportunity_score
+from backend.dedupe import fingerprint, find_near_duplicate, attach_near_duplicate
+from backend.ingest import ingest_post
 
 
 class FirecrawlCollector:
@@ -158,8 +161,37 @@ class FirecrawlCollector:
         # For now, treat the whole page as one opportunity
         # In production, we'd parse out individual posts/comments
 
-        # Analyze pain signals
-        pain_analysis = analyze_pain(content)
+        # Generate unique ID from URL
+        url_hash = str(hash(url))[:10]
+
+        # Check if already exists
+        if Tweet.exists_in_source(source, url_hash):
+            return 0
+
+        post_record = {
+            'tweet_id': url_hash,
+            'text': content[:1000],  # First 1000 chars
+            'created_at': datetime.now().isoformat(),
+            'author_username': source,
+            'author_followers': 0,
+            'likes': len(content) // 100,  # Rough proxy
+            'retweets': 0,
+            'replies': 0,
+            'source': source,
+            'external_id': url_hash
+        }
+
+        # Near-duplicate of a stored page (e.g. an HN story mirrored on Indie Hackers)?
+        # Attach it to the existing opportunity instead of analyzing it again.
+        # Fingerprint the stored excerpt, not the whole page.
+        post_fingerprint = fingerprint(post_record['text'])
+        duplicate_of = find_near_duplicate(post_fingerprint)
+        if duplicate_of:
+            attach_near_duplicate(duplicate_of, post_record)
+            return 0
+
+        # Key and analyze pain signals window by window, so multi-megabyte pages stay in bounded memory
+        pain_analysis = cached_analyze_pain(content, analyzer=analyze_pain_stream)
 
         # Create pseudo-tweet data (no likes/retweets from Firecrawl)
         # Use content length and pain signals as proxy
@@ -175,46 +207,24 @@ class FirecrawlCollector:
         if score < self.min_score:
             return 0
 
-        # Generate unique ID from URL
-        url_hash = str(hash(url))[:10]
-
         # Store in database (reusing Tweet model)
         try:
-            # Check if already exists
-            if Tweet.exists(url_hash):
-                return 0
-
-            tweet_id = Tweet.create(
-                tweet_id=url_hash,
-                text=content[:1000],  # First 1000 chars
-                created_at=datetime.now().isoformat(),
-                author_username=source,
-                author_followers=0,
-                likes=pseudo_engagement['likes'],
-                retweets=0,
-                replies=0
-            )
-
-            # Store pain analysis
-            PainAnalysis.create(
-                tweet_id=tweet_id,
-                frustration_score=pain_analysis['frustration_score'],
-                budget_signal_score=pain_analysis['budget_signal_score'],
-                products_mentioned=pain_analysis['products_mentioned'],
-                pain_keywords=pain_analysis['pain_keywords']
-            )
-
-            # Create opportunity
             title = f"[{source.upper()}] {content[:100].strip()}"
-            opportunity_id = Opportunity.create(
-                title=title,
-                description=content[:500],
-                score=score,
-                first_seen=datetime.now().isoformat(),
-                last_seen=datetime.now().isoformat()
+
+            # Post, analysis and opportunity in one transaction; similar posts join the same clustered opportunity
+            stored = ingest_post(
+                post_record,
+                pain_analysis,
+                cluster={
+                    'title': title,
+                    'description': content[:500],
+                    'score': score,
+                },
+                post_fingerprint=post_fingerprint
             )
 
-            Opportunity.add_tweet(opportunity_id, tweet_id)
+            if stored is None:
+                return 0
 
             return score
 
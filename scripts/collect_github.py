@@ -20,9 +20,11 @@ from dotenv import load_dotenv
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from backend.models import Tweet, PainAnalysis, Opportunity
-from backend.pain_detector import analyze_pain
-from backend.scoring import calculate_opportunity_score
+from backend.models import Tweet, Opportunity
+from backend.analysis_cache import cached_analyze_pain_batch
+from backend.parallel_analysis import analyze_records
+from backend.dedupe import fingerprint, find_near_duplicate, attach_near_duplicate
+from backend.ingest import ingest_post
 
 
 def search_github_issues(repo, label=None, keyword=None, state='open'):
@@ -89,8 +91,13 @@ def search_github_issues(repo, label=None, keyword=None, state='open'):
         return []
 
 
-def process_github_issue(issue, repo):
-    """Process a GitHub issue for pain signals."""
+def prepare_github_issue(issue):
+    """
+    Build the post record for a GitHub issue that still needs analysis.
+
+    Returns None for issues that are too short, already stored, or
+    near-duplicates of a stored post (attached to its opportunity).
+    """
 
     # Get issue details
     title = issue.get('title', '')
@@ -98,15 +105,12 @@ def process_github_issue(issue, repo):
     full_text = f"{title}\n\n{body[:800]}"  # Limit body
 
     if not full_text or len(full_text) < 20:
-        return False, 0
+        return None
 
     # Check if already exists (use GitHub issue ID)
     issue_id = str(issue.get('id', ''))
-    if Tweet.exists(f"GH_{issue_id}"):
-        return False, 0
-
-    # Analyze pain
-    pain_analysis = analyze_pain(full_text)
+    if Tweet.exists_in_source('github', issue_id):
+        return None
 
     # Create engagement data from GitHub metrics
     reactions = issue.get('reactions', {})
@@ -120,15 +124,52 @@ def process_github_issue(issue, repo):
 
     comments = issue.get('comments', 0)
 
+    post_record = {
+        'tweet_id': f"GH_{issue_id}",
+        'text': full_text[:1000],
+        'created_at': issue.get('created_at', datetime.now().isoformat()),
+        'author_username': issue.get('user', {}).get('login', 'unknown'),
+        'author_followers': 0,  # GitHub doesn't provide follower count in issue API
+        'likes': total_reactions * 3,
+        'retweets': comments // 2,
+        'replies': comments,
+        'source': 'github',
+        'external_id': str(issue_id),
+        'points': total_reactions,
+        'comment_count': comments
+    }
+
+    # Near-duplicate of a stored post (e.g. the same request filed in another repo)?
+    # Attach it to the existing opportunity instead of analyzing it again
+    post_fingerprint = fingerprint(full_text)
+    duplicate_of = find_near_duplicate(post_fingerprint)
+    if duplicate_of:
+        attach_near_duplicate(duplicate_of, post_record)
+        return None
+
     # High reactions = widespread pain, many comments = active discussion
-    tweet_data = {
+    return {
+        'text': full_text,
         'likes': total_reactions * 3,  # Reactions indicate strong agreement
         'retweets': comments // 2,
-        'replies': comments
+        'replies': comments,
+        'post': post_record,
+        'fingerprint': post_fingerprint,
+        'issue': issue,
     }
 
-    # Calculate opportunity score
-    opp_score = calculate_opportunity_score(tweet_data, pain_analysis)
+
+def store_github_issue(candidate, pain_analysis, opp_score, repo):
+    """Store an analyzed GitHub issue if it scores high enough. Returns (stored, score)."""
+    issue = candidate['issue']
+    title = issue.get('title', '')
+    full_text = candidate['text']
+
+    # Near-duplicate of an issue stored earlier on the same page?
+    duplicate_of = find_near_duplicate(candidate['fingerprint'])
+    if duplicate_of:
+        attach_near_duplicate(duplicate_of, candidate['post'])
+        return False, 0
 
     # Boost for feature requests
     labels = [label.get('name', '') for label in issue.get('labels', [])]
@@ -148,37 +189,22 @@ def process_github_issue(issue, repo):
 
     # Store
     try:
-        tweet_id = Tweet.create(
-            tweet_id=f"GH_{issue_id}",
-            text=full_text[:1000],
-            created_at=issue.get('created_at', datetime.now().isoformat()),
-            author_username=issue.get('user', {}).get('login', 'unknown'),
-            author_followers=0,  # GitHub doesn't provide follower count in issue API
-            likes=total_reactions * 3,
-            retweets=comments // 2,
-            replies=comments
-        )
-
-        # Pain analysis
-        PainAnalysis.create(
-            tweet_id=tweet_id,
-            frustration_score=pain_analysis['frustration_score'],
-            budget_signal_score=pain_analysis['budget_signal_score'],
-            products_mentioned=pain_analysis['products_mentioned'],
-            pain_keywords=pain_analysis['pain_keywords']
-        )
-
-        # Create opportunity
         repo_short = repo.split('/')[-1]  # e.g., "kubernetes" from "kubernetes/kubernetes"
-        opportunity_id = Opportunity.create(
-            title=f"[GH/{repo_short}] {title[:100]}",
-            description=f"{full_text[:400]}\n\nLink: {issue.get('html_url', '')}",
-            score=opp_score,
-            first_seen=datetime.now().isoformat(),
-            last_seen=datetime.now().isoformat()
+
+        # Post, analysis and opportunity in one transaction; similar posts join the same clustered opportunity
+        stored = ingest_post(
+            candidate['post'],
+            pain_analysis,
+            cluster={
+                'title': f"[GH/{repo_short}] {title[:100]}",
+                'description': f"{full_text[:400]}\n\nLink: {issue.get('html_url', '')}",
+                'score': opp_score,
+            },
+            post_fingerprint=candidate['fingerprint']
         )
 
-        Opportunity.add_tweet(opportunity_id, tweet_id)
+        if stored is None:
+            return False, 0
 
         return True, opp_score
 
@@ -227,8 +253,13 @@ def collect_from_github():
         stored_this_repo = 0
         high_value_this_repo = 0
 
-        for issue in issues:
-            stored, score = process_github_issue(issue, repo)
+        # Analyze and score the page's new issues together
+        candidates = [c for c in map(prepare_github_issue, issues) if c]
+        analyzed = analyze_records(candidates, cached_analyze_pain_batch)
+
+        for candidate, (pain_analysis, score) in zip(candidates, analyzed):
+            stored, score = store_github_issue(candidate, pain_analysis, score, repo)
+            issue = candidate['issue']
 
             if stored:
                 stored_this_repo += 1
@@ -20,9 +20,11 @@ from dotenv import load_dotenv
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from backend.models import Tweet, PainAnalysis, Opportunity
-from backend.pain_detector import analyze_pain
-from backend.scoring import calculate_opportunity_score
+from backend.models import Tweet, Opportunity
+from backend.analysis_cache import cached_analyze_pain_batch
+from backend.parallel_analysis import analyze_records
+from backend.dedupe import fingerprint, find_near_duplicate, attach_near_duplicate
+from backend.ingest import ingest_post
 
 
 def search_hackernews(query, num_results=50):
@@ -55,8 +57,13 @@ def search_hackernews(query, num_results=50):
         return []
 
 
-def process_hn_post(post):
-    """Process a HackerNews post for pain signals."""
+def prepare_hn_post(post):
+    """
+    Build the post record for a HackerNews post that still needs analysis.
+
+    Returns None for posts that are too short, already stored, or
+    near-duplicates of a stored post (attached to its opportunity).
+    """
 
     # Combine title and text (if available)
     title = post.get('title', '')
@@ -64,28 +71,61 @@ def process_hn_post(post):
     full_text = f"{title}\n\n{text}" if text else title
 
     if not full_text or len(full_text) < 20:
-        return False, 0
+        return None
 
     # Check if already exists (use HN post ID)
     hn_id = str(post.get('objectID', ''))
-    if Tweet.exists(hn_id):
-        return False, 0
-
-    # Analyze pain
-    pain_analysis = analyze_pain(full_text)
+    if Tweet.exists_in_source('hackernews', hn_id):
+        return None
 
     # Create engagement data from HN metrics
     points = post.get('points', 0)
     num_comments = post.get('num_comments', 0)
 
-    tweet_data = {
+    post_record = {
+        'tweet_id': hn_id,
+        'text': full_text[:1000],
+        'created_at': post.get('created_at', datetime.now().isoformat()),
+        'author_username': post.get('author', 'unknown'),
+        'author_followers': 0,
+        'likes': points,
+        'retweets': num_comments // 2,
+        'replies': num_comments,
+        'source': 'hackernews',
+        'external_id': hn_id,
+        'points': points,
+        'comment_count': num_comments
+    }
+
+    # Near-duplicate of a stored post (e.g. same story found by another query)?
+    # Attach it to the existing opportunity instead of analyzing it again
+    post_fingerprint = fingerprint(full_text)
+    duplicate_of = find_near_duplicate(post_fingerprint)
+    if duplicate_of:
+        attach_near_duplicate(duplicate_of, post_record)
+        return None
+
+    return {
+        'text': full_text,
         'likes': points,
         'retweets': num_comments // 2,  # Approximate
-        'replies': num_comments
+        'replies': num_comments,
+        'post': post_record,
+        'fingerprint': post_fingerprint,
+        'title': title,
     }
 
-    # Score
-    score = calculate_opportunity_score(tweet_data, pain_analysis)
+
+def store_hn_post(candidate, pain_analysis, score):
+    """Store an analyzed HackerNews post if it scores high enough. Returns (stored, score)."""
+    title = candidate['title']
+    full_text = candidate['text']
+
+    # Near-duplicate of a post stored earlier on the same page?
+    duplicate_of = find_near_duplicate(candidate['fingerprint'])
+    if duplicate_of:
+        attach_near_duplicate(duplicate_of, candidate['post'])
+        return False, 0
 
     # Only store if meets threshold
     min_score = int(os.getenv('MIN_OPPORTUNITY_SCORE', 40))
@@ -94,36 +134,20 @@ def process_hn_post(post):
 
     # Store
     try:
-        tweet_id = Tweet.create(
-            tweet_id=hn_id,
-            text=full_text[:1000],
-            created_at=post.get('created_at', datetime.now().isoformat()),
-            author_username=post.get('author', 'unknown'),
-            author_followers=points,  # Use points as proxy
-            likes=points,
-            retweets=num_comments // 2,
-            replies=num_comments
+        # Post, analysis and opportunity in one transaction; similar posts join the same clustered opportunity
+        stored = ingest_post(
+            candidate['post'],
+            pain_analysis,
+            cluster={
+                'title': f"[HN] {title[:150]}",
+                'description': full_text[:500],
+                'score': score,
+            },
+            post_fingerprint=candidate['fingerprint']
         )
 
-        # Pain analysis
-        PainAnalysis.create(
-            tweet_id=tweet_id,
-            frustration_score=pain_analysis['frustration_score'],
-            budget_signal_score=pain_analysis['budget_signal_score'],
-            products_mentioned=pain_analysis['products_mentioned'],
-            pain_keywords=pain_analysis['pain_keywords']
-        )
-
-        # Create opportunity
-        opportunity_id = Opportunity.create(
-            title=f"[HN] {title[:150]}",
-            description=full_text[:500],
-            score=score,
-            first_seen=datetime.now().isoformat(),
-            last_seen=datetime.now().isoformat()
-        )
-
-        Opportunity.add_tweet(opportunity_id, tweet_id)
+        if stored is None:
+            return False, 0
 
         return True, score
 
@@ -165,8 +189,12 @@ def collect_from_hackernews():
         stored_this_query = 0
         high_value_this_query = 0
 
-        for post in posts:
-            stored, score = process_hn_post(post)
+        # Analyze and score the page's new posts together
+        candidates = [c for c in map(prepare_hn_post, posts) if c]
+        analyzed = analyze_records(candidates, cached_analyze_pain_batch)
+
+        for candidate, (pain_analysis, score) in zip(candidates, analyzed):
+            stored, score = store_hn_post(candidate, pain_analysis, score)
 
             if stored:
                 stored_this_query += 1
@@ -176,7 +204,7 @@ def collect_from_hackernews():
                     high_value_this_query += 1
                     total_high_value += 1
 
-                    title = post.get('title', '')[:60]
+                    title = candidate['title'][:60]
                     print(f"    ⭐ High-value: \"{title}...\" (Score: {score})")
 
         print(f"  Stored: {stored_this_query} posts")
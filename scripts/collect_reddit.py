@@ -15,9 +15,11 @@ from dotenv import load_dotenv
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from backend.models import Tweet, PainAnalysis, Opportunity
-from backend.pain_detector import analyze_pain
-from backend.scoring import calculate_opportunity_score
+from backend.models import Tweet
+from backend.analysis_cache import cached_analyze_pain_batch
+from backend.parallel_analysis import analyze_records
+from backend.dedupe import fingerprint, find_near_duplicate, attach_near_duplicate
+from backend.ingest import ingest_post
 from backend.pain_keywords import REDDIT_SUBREDDITS, REDDIT_SEARCH_QUERIES
 
 
@@ -128,34 +130,70 @@ def get_hot_posts(reddit, subreddit_name, limit=25):
         return []
 
 
-def process_reddit_post(post_data):
+def prepare_reddit_post(post_data):
     """
-    Process a Reddit post: analyze, score, and store if valuable.
+    Build the post record for a Reddit post that still needs analysis.
 
     We use the Tweet model to store Reddit posts (with reddit_id as tweet_id).
     This is fine for MVP - we'll separate in WALK phase if needed.
 
-    Returns:
-        Tuple of (stored: bool, score: int)
+    Returns None for posts that are already stored, or near-duplicates
+    of a stored post (attached to its opportunity).
     """
 
     # Check if we already have this post
-    if Tweet.exists(post_data['reddit_id']):
-        return False, 0
+    if Tweet.exists_in_source('reddit', post_data['reddit_id']):
+        return None
+
+    post_record = {
+        'tweet_id': post_data['reddit_id'],
+        'text': post_data['text'],
+        'created_at': post_data['created_at'],
+        'author_username': f"r/{post_data['subreddit']}",  # Store subreddit
+        'author_followers': 0,
+        'likes': post_data['upvotes'],
+        'retweets': post_data['comments'] // 2,
+        'replies': post_data['comments'],
+        'source': 'reddit',
+        'external_id': post_data['reddit_id'],
+        'points': post_data['upvotes'],
+        'comment_count': post_data['comments']
+    }
 
-    # Analyze pain signals
-    pain_analysis = analyze_pain(post_data['text'])
+    # Near-duplicate of a stored post (e.g. cross-posted to another subreddit)?
+    # Attach it to the existing opportunity instead of analyzing it again
+    post_fingerprint = fingerprint(post_data['text'])
+    duplicate_of = find_near_duplicate(post_fingerprint)
+    if duplicate_of:
+        attach_near_duplicate(duplicate_of, post_record)
+        return None
 
-    # Create tweet-like data structure for scoring
     # Reddit upvotes = likes, comments = engagement
-    tweet_data = {
+    return {
+        'text': post_data['text'],
         'likes': post_data['upvotes'],
         'retweets': post_data['comments'] // 2,  # Approximate retweets from comments
-        'replies': post_data['comments']
+        'replies': post_data['comments'],
+        'post': post_record,
+        'fingerprint': post_fingerprint,
+        'post_data': post_data,
     }
 
-    # Calculate opportunity score
-    score = calculate_opportunity_score(tweet_data, pain_analysis)
+
+def store_reddit_post(candidate, pain_analysis, score):
+    """
+    Store an analyzed Reddit post if it scores high enough.
+
+    Returns:
+        Tuple of (stored: bool, score: int)
+    """
+    post_data = candidate['post_data']
+
+    # Near-duplicate of a post stored earlier on the same page?
+    duplicate_of = find_near_duplicate(candidate['fingerprint'])
+    if duplicate_of:
+        attach_near_duplicate(duplicate_of, candidate['post'])
+        return False, 0
 
     # Only store if score meets minimum threshold
     min_score = int(os.getenv('MIN_OPPORTUNITY_SCORE', 40))
@@ -163,27 +201,17 @@ def process_reddit_post(post_data):
     if score < min_score:
         return False, score
 
-    # Store post (using Tweet model)
+    # Store post (using Tweet model) with its analysis and (clustered) opportunity in one transaction
     try:
-        post_id = Tweet.create(
-            tweet_id=post_data['reddit_id'],
-            text=post_data['text'],
-            created_at=post_data['created_at'],
-            author_username=f"r/{post_data['subreddit']}",  # Store subreddit
-            author_followers=post_data['upvotes'],  # Use upvotes as proxy
-            likes=post_data['upvotes'],
-            retweets=post_data['comments'] // 2,
-            replies=post_data['comments']
+        stored = ingest_post(
+            candidate['post'],
+            pain_analysis,
+            cluster=reddit_opportunity(post_data, score),
+            post_fingerprint=candidate['fingerprint']
         )
 
-        # Store pain analysis
-        PainAnalysis.create(
-            tweet_id=post_id,
-            frustration_score=pain_analysis['frustration_score'],
-            budget_signal_score=pain_analysis['budget_signal_score'],
-            products_mentioned=pain_analysis['products_mentioned'],
-            pain_keywords=pain_analysis['pain_keywords']
-        )
+        if stored is None:
+            return False, score
 
         return True, score
 
@@ -192,25 +220,17 @@ def process_reddit_post(post_data):
         return False, score
 
 
-def create_opportunity_from_reddit(post_id, post_data, score):
-    """Create opportunity from Reddit post."""
+def reddit_opportunity(post_data, score):
+    """Opportunity fields (OpportunityClusterer.assign keyword arguments) for a Reddit post."""
 
     # Use title as opportunity title
     title = post_data['title'][:200].strip()
 
-    # Create opportunity
-    opportunity_id = Opportunity.create(
-        title=f"[Reddit] {title}",
-        description=post_data['text'][:500],  # First 500 chars
-        score=score,
-        first_seen=datetime.now().isoformat(),
-        last_seen=datetime.now().isoformat()
-    )
-
-    # Link post to opportunity
-    Opportunity.add_tweet(opportunity_id, post_id)
-
-    return opportunity_id
+    return {
+        'title': f"[Reddit] {title}",
+        'description': post_data['text'][:500],  # First 500 chars
+        'score': score,
+    }
 
 
 def collect_from_reddit():
@@ -275,17 +295,18 @@ def collect_from_reddit():
         stored_this_sub = 0
         high_value_this_sub = 0
 
-        for post_data in posts:
-            stored, score = process_reddit_post(post_data)
+        # Analyze and score the page's new posts together
+        candidates = [c for c in map(prepare_reddit_post, posts) if c]
+        analyzed = analyze_records(candidates, cached_analyze_pain_batch)
+
+        for candidate, (pain_analysis, score) in zip(candidates, analyzed):
+            stored, score = store_reddit_post(candidate, pain_analysis, score)
+            post_data = candidate['post_data']
 
             if stored:
                 stored_this_sub += 1
                 total_stored += 1
 
-                # Create opportunity
-                post_id = Tweet.get_by_tweet_id(post_data['reddit_id'])['id']
-                create_opportunity_from_reddit(post_id, post_data, score)
-
                 if score >= 70:
                     high_value_this_sub += 1
                     total_high_value += 1
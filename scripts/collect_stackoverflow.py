@@ -21,9 +21,11 @@ from dotenv import load_dotenv
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from backend.models import Tweet, PainAnalysis, Opportunity
-from backend.pain_detector import analyze_pain
-from backend.scoring import calculate_opportunity_score
+from backend.models import Tweet, Opportunity
+from backend.analysis_cache import cached_analyze_pain_batch
+from backend.parallel_analysis import analyze_records
+from backend.dedupe import fingerprint, find_near_duplicate, attach_near_duplicate
+from backend.ingest import ingest_post
 
 
 def search_stackoverflow(tag, keyword=None, min_votes=5):
@@ -72,8 +74,13 @@ def search_stackoverflow(tag, keyword=None, min_votes=5):
         return []
 
 
-def process_stackoverflow_question(question):
-    """Process a Stack Overflow question for pain signals."""
+def prepare_stackoverflow_question(question):
+    """
+    Build the post record for a question that still needs analysis.
+
+    Returns None for questions that are too short, already stored, or
+    near-duplicates of a stored post (attached to its opportunity).
+    """
 
     # Combine title and body (if available)
     title = question.get('title', '')
@@ -86,30 +93,67 @@ def process_stackoverflow_question(question):
     full_text = f"{title}\n\n{body_clean[:500]}"  # Limit body to 500 chars
 
     if not full_text or len(full_text) < 20:
-        return False, 0
+        return None
 
     # Check if already exists (use SO question ID)
     so_id = str(question.get('question_id', ''))
-    if Tweet.exists(f"SO_{so_id}"):
-        return False, 0
-
-    # Analyze pain
-    pain_analysis = analyze_pain(full_text)
+    if Tweet.exists_in_source('stackoverflow', so_id):
+        return None
 
     # Create engagement data from SO metrics
     score = question.get('score', 0)
     view_count = question.get('view_count', 0)
     answer_count = question.get('answer_count', 0)
 
+    post_record = {
+        'tweet_id': f"SO_{so_id}",
+        'text': full_text[:1000],
+        'created_at': datetime.fromtimestamp(question.get('creation_date', time.time())).isoformat(),
+        'author_username': question.get('owner', {}).get('display_name', 'unknown'),
+        'author_followers': 0,
+        'likes': score * 2,
+        'retweets': view_count // 100,
+        'replies': answer_count,
+        'source': 'stackoverflow',
+        'external_id': str(so_id),
+        'points': score,
+        'comment_count': answer_count,
+        'view_count': view_count,
+        'author_reputation': question.get('owner', {}).get('reputation')
+    }
+
+    # Near-duplicate of a stored post (e.g. the same question under another tag)?
+    # Attach it to the existing opportunity instead of analyzing it again
+    post_fingerprint = fingerprint(full_text)
+    duplicate_of = find_near_duplicate(post_fingerprint)
+    if duplicate_of:
+        attach_near_duplicate(duplicate_of, post_record)
+        return None
+
     # High votes + high views + few answers = painful unsolved problem
-    tweet_data = {
+    return {
+        'text': full_text,
         'likes': score * 2,  # Upvotes indicate shared pain
         'retweets': view_count // 100,  # Many views = widespread issue
-        'replies': answer_count
+        'replies': answer_count,
+        'post': post_record,
+        'fingerprint': post_fingerprint,
+        'question': question,
     }
 
-    # Calculate opportunity score
-    opp_score = calculate_opportunity_score(tweet_data, pain_analysis)
+
+def store_stackoverflow_question(candidate, pain_analysis, opp_score):
+    """Store an analyzed question if it scores high enough. Returns (stored, score)."""
+    question = candidate['question']
+    title = question.get('title', '')
+    full_text = candidate['text']
+    answer_count = question.get('answer_count', 0)
+
+    # Near-duplicate of a question stored earlier on the same page?
+    duplicate_of = find_near_duplicate(candidate['fingerprint'])
+    if duplicate_of:
+        attach_near_duplicate(duplicate_of, candidate['post'])
+        return False, 0
 
     # Boost score if question is unanswered or poorly answered
     if answer_count == 0:
@@ -126,37 +170,22 @@ def process_stackoverflow_question(question):
 
     # Store
     try:
-        tweet_id = Tweet.create(
-            tweet_id=f"SO_{so_id}",
-            text=full_text[:1000],
-            created_at=datetime.fromtimestamp(question.get('creation_date', time.time())).isoformat(),
-            author_username=question.get('owner', {}).get('display_name', 'unknown'),
-            author_followers=question.get('owner', {}).get('reputation', 0) // 100,
-            likes=score * 2,
-            retweets=view_count // 100,
-            replies=answer_count
-        )
-
-        # Pain analysis
-        PainAnalysis.create(
-            tweet_id=tweet_id,
-            frustration_score=pain_analysis['frustration_score'],
-            budget_signal_score=pain_analysis['budget_signal_score'],
-            products_mentioned=pain_analysis['products_mentioned'],
-            pain_keywords=pain_analysis['pain_keywords']
-        )
-
-        # Create opportunity
         tags = ', '.join(question.get('tags', [])[:3])
-        opportunity_id = Opportunity.create(
-            title=f"[SO/{tags}] {title[:120]}",
-            description=f"{full_text[:400]}\n\nLink: {question.get('link', '')}",
-            score=opp_score,
-            first_seen=datetime.now().isoformat(),
-            last_seen=datetime.now().isoformat()
+
+        # Post, analysis and opportunity in one transaction; similar posts join the same clustered opportunity
+        stored = ingest_post(
+            candidate['post'],
+            pain_analysis,
+            cluster={
+                'title': f"[SO/{tags}] {title[:120]}",
+                'description': f"{full_text[:400]}\n\nLink: {question.get('link', '')}",
+                'score': opp_score,
+            },
+            post_fingerprint=candidate['fingerprint']
         )
 
-        Opportunity.add_tweet(opportunity_id, tweet_id)
+        if stored is None:
+            return False, 0
 
         return True, opp_score
 
@@ -206,8 +235,13 @@ def collect_from_stackoverflow():
             stored_this_search = 0
             high_value_this_search = 0
 
-            for question in questions:
-                stored, score = process_stackoverflow_question(question)
+            # Analyze and score the page's new questions together
+            candidates = [c for c in map(prepare_stackoverflow_question, questions) if c]
+            analyzed = analyze_records(candidates, cached_analyze_pain_batch)
+
+            for candidate, (pain_analysis, score) in zip(candidates, analyzed):
+                stored, score = store_stackoverflow_question(candidate, pain_analysis, score)
+                question = candidate['question']
 
                 if stored:
                     stored_this_search += 1
@@ -15,9 +15,11 @@ from dotenv import load_dotenv
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from backend.models import Tweet, PainAnalysis, Opportunity
-from backend.pain_detector import analyze_pain
-from backend.scoring import calculate_opportunity_score
+from backend.models import Tweet
+from backend.analysis_cache import cached_analyze_pain_batch
+from backend.parallel_analysis import analyze_records
+from backend.dedupe import fingerprint, find_near_duplicate, attach_near_duplicate
+from backend.ingest import ingest_post
 from backend.pain_keywords import (
     TWITTER_SEARCH_QUERIES,
     build_twitter_query,
@@ -93,23 +95,63 @@ def search_tweets(client, query, max_results=100):
         return []
 
 
-def process_tweet(tweet_data):
+def prepare_tweet(tweet_data):
     """
-    Process a single tweet: analyze, score, and store if valuable.
+    Build the post record for a tweet that still needs analysis.
 
-    Returns:
-        Tuple of (stored: bool, score: int)
+    Returns None for tweets that are already stored, or near-duplicates
+    of a stored post (attached to its opportunity).
     """
 
     # Check if we already have this tweet
-    if Tweet.exists(tweet_data['tweet_id']):
-        return False, 0
+    if Tweet.exists_in_source('twitter', tweet_data['tweet_id']):
+        return None
+
+    post_record = {
+        'tweet_id': tweet_data['tweet_id'],
+        'text': tweet_data['text'],
+        'created_at': tweet_data['created_at'],
+        'author_username': tweet_data['author_username'],
+        'author_followers': tweet_data['author_followers'],
+        'likes': tweet_data['likes'],
+        'retweets': tweet_data['retweets'],
+        'replies': tweet_data['replies'],
+        'source': 'twitter',
+        'external_id': tweet_data['tweet_id']
+    }
+
+    # Near-duplicate of a stored post (e.g. a copy-pasted complaint)?
+    # Attach it to the existing opportunity instead of analyzing it again
+    post_fingerprint = fingerprint(tweet_data['text'])
+    duplicate_of = find_near_duplicate(post_fingerprint)
+    if duplicate_of:
+        attach_near_duplicate(duplicate_of, post_record)
+        return None
+
+    return {
+        'text': tweet_data['text'],
+        'likes': tweet_data['likes'],
+        'retweets': tweet_data['retweets'],
+        'replies': tweet_data['replies'],
+        'post': post_record,
+        'fingerprint': post_fingerprint,
+    }
+
+
+def store_tweet(candidate, pain_analysis, score):
+    """
+    Store an analyzed tweet if it scores high enough.
 
-    # Analyze pain signals
-    pain_analysis = analyze_pain(tweet_data['text'])
+    Returns:
+        Tuple of (stored: bool, score: int)
+    """
+    text = candidate['text']
 
-    # Calculate opportunity score
-    score = calculate_opportunity_score(tweet_data, pain_analysis)
+    # Near-duplicate of a tweet stored earlier on the same page?
+    duplicate_of = find_near_duplicate(candidate['fingerprint'])
+    if duplicate_of:
+        attach_near_duplicate(duplicate_of, candidate['post'])
+        return False, 0
 
     # Only store if score meets minimum threshold
     min_score = int(os.getenv('MIN_OPPORTUNITY_SCORE', 40))
@@ -117,27 +159,29 @@ def process_tweet(tweet_data):
     if score < min_score:
         return False, score
 
-    # Store tweet
+    # Extract title from first 100 chars
+    title = text[:100].strip()
+    if len(text) > 100:
+        title += "..."
+
+    # Store tweet, analysis and its opportunity in one transaction. Similar
+    # tweets are clustered into the same opportunity (see
+    # backend/clustering.py); a new opportunity is only created when no
+    # existing one is close enough.
     try:
-        tweet_id = Tweet.create(
-            tweet_id=tweet_data['tweet_id'],
-            text=tweet_data['text'],
-            created_at=tweet_data['created_at'],
-            author_username=tweet_data['author_username'],
-            author_followers=tweet_data['author_followers'],
-            likes=tweet_data['likes'],
-            retweets=tweet_data['retweets'],
-            replies=tweet_data['replies']
+        stored = ingest_post(
+            candidate['post'],
+            pain_analysis,
+            cluster={
+                'title': title,
+                'description': text,
+                'score': score,
+            },
+            post_fingerprint=candidate['fingerprint']
         )
 
-        # Store pain analysis
-        PainAnalysis.create(
-            tweet_id=tweet_id,
-            frustration_score=pain_analysis['frustration_score'],
-            budget_signal_score=pain_analysis['budget_signal_score'],
-            products_mentioned=pain_analysis['products_mentioned'],
-            pain_keywords=pain_analysis['pain_keywords']
-        )
+        if stored is None:
+            return False, 0
 
         return True, score
 
@@ -146,33 +190,6 @@ def process_tweet(tweet_data):
         return False, score
 
 
-def create_or_update_opportunity(tweet_id, tweet_text, score):
-    """
-    Create a new opportunity or update existing one.
-
-    For MVP, we create one opportunity per tweet.
-    In WALK phase, we'll cluster similar tweets.
-    """
-    # Extract title from first 100 chars
-    title = tweet_text[:100].strip()
-    if len(tweet_text) > 100:
-        title += "..."
-
-    # Create opportunity
-    opportunity_id = Opportunity.create(
-        title=title,
-        description=tweet_text,
-        score=score,
-        first_seen=datetime.now().isoformat(),
-        last_seen=datetime.now().isoformat()
-    )
-
-    # Link tweet to opportunity
-    Opportunity.add_tweet(opportunity_id, tweet_id)
-
-    return opportunity_id
-
-
 def collect_from_twitter():
     """Main collection function."""
 
@@ -231,20 +248,17 @@ def collect_from_twitter():
         stored_this_query = 0
         high_value_this_query = 0
 
-        for tweet_data in tweets:
-            stored, score = process_tweet(tweet_data)
+        # Analyze and score the page's new tweets together
+        candidates = [c for c in map(prepare_tweet, tweets) if c]
+        analyzed = analyze_records(candidates, cached_analyze_pain_batch)
+
+        for candidate, (pain_analysis, score) in zip(candidates, analyzed):
+            stored, score = store_tweet(candidate, pain_analysis, score)
 
             if stored:
                 stored_this_query += 1
                 total_stored += 1
 
-                # Create opportunity
-                create_or_update_opportunity(
-                    tweet_id=Tweet.get_by_tweet_id(tweet_data['tweet_id'])['id'],
-                    tweet_text=tweet_data['text'],
-                    score=score
-                )
-
                 if score >= 70:
                     high_value_this_query += 1
                     total_high_value += 1
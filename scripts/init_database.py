@@ -8,8 +8,25 @@ for the CRAWL phase.
 
 import sqlite3
 import os
+import sys
 from datetime import datetime
 
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.search import create_search_index
+from backend.posts import create_posts_table
+from backend.counters import create_counter_triggers
+from backend.sources import create_source_columns
+from backend.indexes import create_dashboard_indexes
+from backend.rollups import create_rollup_tables
+from backend.mentions import create_mention_tables
+from backend.analysis_cache import create_cache_table
+from backend.features import create_feature_tables
+from backend.dedupe import create_fingerprint_tables
+from backend.clustering import create_cluster_tables
+from backend.migrations import migrate
+
 
 def get_db_path():
     """Get database path from environment or use default."""
@@ -33,29 +50,26 @@ def init_database():
     # Enable foreign keys
     cursor.execute("PRAGMA foreign_keys = ON;")
 
-    # Table 1: Tweets - Raw collected data
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS tweets (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            tweet_id TEXT UNIQUE NOT NULL,
-            text TEXT NOT NULL,
-            created_at TIMESTAMP NOT NULL,
-            author_username TEXT,
-            author_followers INTEGER,
-            likes INTEGER DEFAULT 0,
-            retweets INTEGER DEFAULT 0,
-            replies INTEGER DEFAULT 0,
-            engagement_score INTEGER,
-            collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-    """)
+    # WAL journaling: the web app can read while collectors write (persists in the file)
+    cursor.execute("PRAGMA journal_mode = WAL;")
+
+    # An existing database is upgraded first, so the CREATE ... IF NOT
+    # EXISTS statements below don't create tables next to older ones
+    # (e.g. a posts table beside a tweets table)
+    for migration in migrate(conn):
+        print(f"✓ Applied migration {migration['version']:04d}: {migration['description']}")
+
+    # Table 1: Posts - Raw collected data from every source, plus the
+    # tweets compatibility view (see backend/posts.py)
+    create_posts_table(conn)
 
-    # Indexes for tweets
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tweets_created_at ON tweets(created_at);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tweets_engagement ON tweets(engagement_score);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tweets_collected_at ON tweets(collected_at);")
+    # Indexes for posts (named as on the original tweets table, so new and
+    # upgraded databases have the same index names)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tweets_created_at ON posts(created_at);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tweets_engagement ON posts(engagement_score);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tweets_collected_at ON posts(collected_at);")
 
-    print("✓ Created tweets table")
+    print("✓ Created posts table and tweets view")
 
     # Table 2: Pain Analysis - Extracted features
     cursor.execute("""
@@ -67,7 +81,7 @@ def init_database():
             products_mentioned TEXT,
             pain_keywords TEXT,
             analyzed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (tweet_id) REFERENCES tweets(id) ON DELETE CASCADE
+            FOREIGN KEY (tweet_id) REFERENCES posts(id) ON DELETE CASCADE
         );
     """)
 
@@ -75,7 +89,25 @@ def init_database():
 
     print("✓ Created pain_analysis table")
 
-    # Table 3: Opportunities - Aggregated pain points
+    # product_mentions / keyword_hits: indexed rows per post (see backend/mentions.py)
+    create_mention_tables(conn)
+
+    print("✓ Created product_mentions and keyword_hits tables")
+
+    # Pain analysis cache - memoized analyze_pain results (see backend/analysis_cache.py)
+    create_cache_table(conn)
+
+    print("✓ Created pain_analysis_cache table")
+
+    # Feature store - typed per-post and per-opportunity features for
+    # rescoring (see backend/features.py)
+    create_feature_tables(conn)
+
+    print("✓ Created post_features and opportunity_features tables")
+
+    # Table 3: Opportunities - Aggregated pain points. Columns added by
+    # migrations come last, in the order the migrations add them, so new
+    # and upgraded databases have the same column order
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS opportunities (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -85,12 +117,15 @@ def init_database():
             tweet_count INTEGER DEFAULT 0,
             first_seen TIMESTAMP,
             last_seen TIMESTAMP,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            source TEXT,
+            external_id TEXT,
+            max_engagement INTEGER DEFAULT 0
         );
     """)
 
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_opportunities_score ON opportunities(score);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_opportunities_created ON opportunities(created_at);")
+    # (created_at, score, tweet_count) for the dashboard (see backend/indexes.py)
+    create_dashboard_indexes(conn)
 
     print("✓ Created opportunities table")
 
@@ -101,12 +136,37 @@ def init_database():
             tweet_id INTEGER NOT NULL,
             PRIMARY KEY (opportunity_id, tweet_id),
             FOREIGN KEY (opportunity_id) REFERENCES opportunities(id) ON DELETE CASCADE,
-            FOREIGN KEY (tweet_id) REFERENCES tweets(id) ON DELETE CASCADE
+            FOREIGN KEY (tweet_id) REFERENCES posts(id) ON DELETE CASCADE
         );
     """)
 
     print("✓ Created opportunity_tweets table")
 
+    # tweet_count / max_engagement / last_seen maintained by triggers (see backend/counters.py)
+    create_counter_triggers(conn)
+
+    print("✓ Created opportunity counter triggers")
+
+    # Per-source indexes: (source, created_at, score) etc. (see backend/sources.py)
+    create_source_columns(conn)
+
+    print("✓ Created source indexes")
+
+    # Daily stats per day x source x score band, kept current by triggers (see backend/rollups.py)
+    create_rollup_tables(conn)
+
+    print("✓ Created daily rollup tables")
+
+    # Near-duplicate index - SimHash fingerprints with LSH bands (see backend/dedupe.py)
+    create_fingerprint_tables(conn)
+
+    print("✓ Created post_fingerprints tables")
+
+    # Online opportunity clustering (hashed TF-IDF + MinHash LSH)
+    create_cluster_tables(conn)
+
+    print("✓ Created opportunity clustering tables")
+
     # Table 5: Users
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS users (
@@ -152,6 +212,14 @@ def init_database():
 
     print("✓ Created watchlist table")
 
+    # Full-text search - FTS5 indexes kept in sync by triggers (see backend/search.py)
+    create_search_index(conn)
+
+    print("✓ Created full-text search indexes")
+
+    # Record the migrations as applied: the schema above is current
+    migrate(conn)
+
     # Commit changes
     conn.commit()
 
@@ -177,9 +245,10 @@ def add_sample_data():
 
     # Sample tweet
     cursor.execute("""
-        INSERT OR IGNORE INTO tweets
-        (tweet_id, text, created_at, author_username, author_followers, likes, retweets, replies, engagement_score)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        INSERT OR IGNORE INTO posts
+        (tweet_id, text, created_at, author_username, author_followers, likes, retweets, replies, engagement_score,
+         source, external_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """, (
         '1234567890',
         'I\'m paying $99/mo for Airtable and it STILL doesn\'t do what I need! Why is there no simple database for small teams???',
@@ -189,7 +258,9 @@ def add_sample_data():
         45,
         12,
         8,
-        69  # 45 + (12 * 2)
+        69,  # 45 + (12 * 2)
+        'twitter',
+        '1234567890'
     ))
 
     tweet_rowid = cursor.lastrowid
@@ -210,15 +281,17 @@ def add_sample_data():
     # Sample opportunity
     cursor.execute("""
         INSERT INTO opportunities
-        (title, description, score, tweet_count, first_seen, last_seen)
-        VALUES (?, ?, ?, ?, ?, ?)
+        (title, description, score, tweet_count, first_seen, last_seen, source, external_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
     """, (
         'Simple database for small teams',
         'Users frustrated with complex/expensive database tools like Airtable for basic team needs',
         73,  # High score
-        1,
+        0,  # Counted by trigger when the tweet is linked
+        datetime.now().isoformat(),
         datetime.now().isoformat(),
-        datetime.now().isoformat()
+        'twitter',
+        '1234567890'
     ))
 
     opportunity_id = cursor.lastrowid
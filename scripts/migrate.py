@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Apply schema migrations
+
+Brings an existing database up to date with the numbered migrations in
+backend/migrations, recording each in schema_version. Long backfills
+commit in small batches, so collectors can keep writing while this
+runs. Safe to interrupt and re-run.
+
+Run this when deploying a new version: until it has run, collectors
+and the web app refuse to open the database (SchemaVersionError) rather
+than upgrade it themselves.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from dotenv import load_dotenv
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.migrations import applied_versions, get_migrations, has_schema, migrate
+from backend.models import get_db_path
+from backend.storage import configure_connection
+
+
+def show_status(conn):
+    """Print every migration and whether it has been applied."""
+    applied = applied_versions(conn)
+
+    for migration in get_migrations():
+        mark = "✓" if migration['version'] in applied else " "
+        print(f"  [{mark}] {migration['version']:04d} {migration['name']}: {migration['description']}")
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations")
+    parser.add_argument('--status', action='store_true',
+                        help="Show applied and pending migrations without applying any")
+    parser.add_argument('--target', type=int, default=None,
+                        help="Apply migrations up to this version only")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("SCHEMA MIGRATIONS")
+    print("=" * 60)
+    print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    db_path = get_db_path()
+    if not os.path.exists(db_path):
+        print(f"✗ No database at {db_path} (run scripts/init_database.py first)")
+        sys.exit(1)
+
+    # Plain connection: a pooled one (backend.models) refuses to open
+    # while migrations are pending
+    conn = sqlite3.connect(db_path)
+    configure_connection(conn)
+
+    if not has_schema(conn):
+        print(f"✗ Database at {db_path} has no schema (run scripts/init_database.py first)")
+        sys.exit(1)
+
+    if args.status:
+        show_status(conn)
+        sys.exit(0)
+
+    try:
+        applied = migrate(conn, target=args.target)
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+    for migration in applied:
+        print(f"✓ Applied {migration['version']:04d} {migration['name']}")
+
+    print()
+    show_status(conn)
+    conn.close()
+
+    print()
+    print("=" * 60)
+    print(f"✓ Applied {len(applied)} migrations")
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Re-analyze all stored posts in parallel
+
+Re-runs pain analysis over the whole tweets table (all sources) after a
+lexicon change and rewrites the pain_analysis rows. Work is spread over
+a process pool; results are written back in order, one transaction per
+chunk.
+
+Usage:
+  python scripts/reanalyze_tweets.py                 # Use all CPU cores
+  python scripts/reanalyze_tweets.py --workers 4     # Limit worker processes
+  python scripts/reanalyze_tweets.py --dry-run       # Analyze without writing
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from dotenv import load_dotenv
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.models import get_db_connection
+from backend.parallel_analysis import DEFAULT_CHUNK_SIZE, get_worker_count, iter_analyze_corpus
+from backend.features import write_post_features
+from backend.mentions import write_mentions
+
+
+def iter_stored_posts(page_size=5000):
+    """
+    Yield stored posts in id order.
+
+    Reads page by page (keyset on id) so no read transaction stays open
+    while results are being written back.
+    """
+    last_id = 0
+
+    while True:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, text, likes, retweets, replies
+                FROM tweets
+                WHERE id > ?
+                ORDER BY id
+                LIMIT ?
+            """, (last_id, page_size))
+            rows = [dict(row) for row in cursor.fetchall()]
+
+        if not rows:
+            return
+
+        yield from rows
+        last_id = rows[-1]['id']
+
+
+def write_analyses(batch):
+    """Replace pain_analysis, mention and post_features rows for a batch of (tweet_id, pain_analysis)."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+
+        cursor.executemany("DELETE FROM pain_analysis WHERE tweet_id = ?",
+                           [(tweet_id,) for tweet_id, _ in batch])
+
+        cursor.executemany("""
+            INSERT INTO pain_analysis
+            (tweet_id, frustration_score, budget_signal_score, products_mentioned, pain_keywords)
+            VALUES (?, ?, ?, ?, ?)
+        """, [
+            (tweet_id, pain['frustration_score'], pain['budget_signal_score'],
+             json.dumps(pain['products_mentioned']), json.dumps(pain['pain_keywords']))
+            for tweet_id, pain in batch
+        ])
+        write_mentions(cursor, batch)
+        write_post_features(cursor, batch)
+
+        conn.commit()
+
+
+def reanalyze_all(workers=None, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False):
+    """Re-analyze every stored post and rewrite its pain analysis."""
+
+    workers = get_worker_count(workers)
+    min_score = int(os.getenv('MIN_OPPORTUNITY_SCORE', 40))
+
+    print("=" * 60)
+    print("PARALLEL RE-ANALYSIS")
+    print("=" * 60)
+    print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"  - Workers: {workers}")
+    print(f"  - Chunk size: {chunk_size}")
+    if dry_run:
+        print("  - Dry run: nothing will be written")
+    print()
+
+    start_time = time.time()
+
+    # Ids of posts handed to the pool; results come back in the same order
+    post_ids = deque()
+
+    def records():
+        for post in iter_stored_posts():
+            post_ids.append(post['id'])
+            yield post
+
+    total = 0
+    above_threshold = 0
+    high_value = 0
+    batch = []
+
+    for pain_analysis, score in iter_analyze_corpus(records(), workers=workers,
+                                                    chunk_size=chunk_size):
+        tweet_id = post_ids.popleft()
+        total += 1
+
+        if score >= min_score:
+            above_threshold += 1
+        if score >= 70:
+            high_value += 1
+
+        if not dry_run:
+            batch.append((tweet_id, pain_analysis))
+            if len(batch) >= chunk_size:
+                write_analyses(batch)
+                batch = []
+
+        if total % 10000 == 0:
+            rate = total / (time.time() - start_time)
+            print(f"  Analyzed {total} posts ({rate:.0f}/s)")
+
+    if batch:
+        write_analyses(batch)
+
+    duration = time.time() - start_time
+
+    print()
+    print("=" * 60)
+    print("RE-ANALYSIS COMPLETE")
+    print("=" * 60)
+    print(f"Posts analyzed: {total}")
+    print(f"Score >= {min_score}: {above_threshold}")
+    print(f"High-value: {high_value} (score >= 70)")
+    print(f"Total time: {duration:.1f} seconds"
+          f" ({total / duration if duration > 0 else 0:.0f} posts/s)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Re-analyze all stored posts in parallel")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (default: ANALYSIS_WORKERS or CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Posts per worker task and per write transaction")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Analyze without writing results")
+    args = parser.parse_args()
+
+    try:
+        reanalyze_all(workers=args.workers, chunk_size=args.chunk_size, dry_run=args.dry_run)
+    except KeyboardInterrupt:
+        print("\n\n⚠ Re-analysis interrupted by user")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
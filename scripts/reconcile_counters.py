@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Reconcile opportunity counters
+
+tweet_count and max_engagement are maintained incrementally by triggers
+(see backend/counters.py). This recomputes them from opportunity_tweets
+and fixes any opportunity that has drifted. Safe to re-run; collect_all.py
+runs it after every collection.
+"""
+
+import os
+import sys
+from datetime import datetime
+from dotenv import load_dotenv
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.models import Opportunity
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    print("=" * 60)
+    print("RECONCILE OPPORTUNITY COUNTERS")
+    print("=" * 60)
+    print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print()
+
+    try:
+        corrected = Opportunity.reconcile_counters()
+    except Exception as e:
+        print(f"\n✗ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+    print(f"✓ Corrected {corrected} opportunities")
+    print("=" * 60)
@@ -11,16 +11,118 @@ Filters for:
 
 import os
 import sys
+import heapq
+import json
 from datetime import datetime
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from backend.models import Opportunity, Tweet, PainAnalysis
-from backend.microsaas_scoring import calculate_microsaas_score, get_microsaas_breakdown
+import numpy as np
 
+from backend.models import get_db_connection
+from backend.features import score_opportunities_microsaas
+from backend.microsaas_scoring import get_scorer, calculate_microsaas_scores
 
-def rescore_all_opportunities():
+# Opportunities read, scored and written per transaction
+CHUNK_SIZE = 1000
+
+# Rows kept for each section of the report
+REPORT_SIZE = 10
+
+
+def iter_opportunity_chunks(chunk_size=CHUNK_SIZE):
+    """
+    Yield every opportunity with its primary post's pain analysis, in chunks.
+
+    The primary post is the linked post with the highest engagement.
+    Opportunities without one, or whose primary post has no analysis, are
+    skipped. Chunks are read by id (keyset pagination), so memory stays
+    bounded however large the table is.
+    """
+    last_id = 0
+
+    while True:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT o.id, o.title, o.description, o.score,
+                       pa.frustration_score, pa.budget_signal_score, pa.pain_keywords
+                FROM opportunities o
+                JOIN pain_analysis pa ON pa.id = (
+                    SELECT MAX(id) FROM pain_analysis
+                    WHERE tweet_id = (
+                        SELECT ot.tweet_id FROM opportunity_tweets ot
+                        JOIN posts t ON t.id = ot.tweet_id
+                        WHERE ot.opportunity_id = o.id
+                        ORDER BY t.engagement_score DESC, t.id
+                        LIMIT 1
+                    )
+                )
+                WHERE o.id > ?
+                ORDER BY o.id
+                LIMIT ?
+            """, (last_id, chunk_size))
+            rows = [dict(row) for row in cursor.fetchall()]
+
+        if not rows:
+            return
+
+        yield rows
+        last_id = rows[-1]['id']
+
+
+def score_text(rows):
+    """MicroSaaS breakdowns for rows, re-scanning their title, description and keywords."""
+    scorer = get_scorer()
+    features = []
+
+    for row in rows:
+        pain = {
+            'frustration_score': row['frustration_score'] or 0,
+            'budget_signal_score': row['budget_signal_score'] or 0,
+            'pain_keywords': json.loads(row['pain_keywords'] or '[]'),
+        }
+        features.append(scorer.features(row, pain))
+
+    return calculate_microsaas_scores(**{
+        name: [f[name] for f in features] for name in features[0]
+    })
+
+
+def score_chunk(rows):
+    """
+    MicroSaaS breakdowns for a chunk of rows (calculate_microsaas_scores
+    output, in row order).
+
+    Scored from the stored post_features / opportunity_features columns;
+    only rows whose primary post has no feature row are scored from text.
+    """
+    stored = score_opportunities_microsaas(rows[0]['id'] - 1, rows[-1]['id'])
+    positions = {opportunity_id: i for i, opportunity_id in enumerate(stored['opportunity_id'].tolist())}
+    del stored['opportunity_id']
+
+    missing = [i for i, row in enumerate(rows) if row['id'] not in positions]
+    fallback = score_text([rows[i] for i in missing]) if missing else {}
+
+    breakdowns = {name: np.empty(len(rows), dtype=values.dtype) for name, values in stored.items()}
+    found = [i for i, row in enumerate(rows) if row['id'] in positions]
+    for name, values in breakdowns.items():
+        values[found] = stored[name][[positions[rows[i]['id']] for i in found]]
+        if missing:
+            values[missing] = fallback[name]
+
+    return breakdowns
+
+
+def write_scores(scores):
+    """Write (score, opportunity_id) pairs in one transaction."""
+    with get_db_connection() as conn:
+        conn.executemany("UPDATE opportunities SET score = ? WHERE id = ?", scores)
+        conn.commit()
+
+
+def rescore_all_opportunities(chunk_size=CHUNK_SIZE):
     """Re-score all opportunities with MicroSaaS criteria."""
 
     print("=" * 70)
@@ -34,57 +136,45 @@ def rescore_all_opportunities():
     print("  ✓ Recurring revenue potential")
     print()
 
-    # Get all opportunities
-    all_opps = Opportunity.get_top_opportunities(limit=1000, min_score=0, days=365)
+    rescored = 0
 
-    print(f"Found {len(all_opps)} opportunities to re-score...")
-    print()
+    # Only the rows the report shows are kept, not every opportunity
+    top, gainers, losers = [], [], []
 
-    rescored = []
+    for rows in iter_opportunity_chunks(chunk_size):
+        breakdowns = score_chunk(rows)
+        scores = []
 
-    for opp in all_opps:
-        # Get associated tweets/posts
-        tweets = Opportunity.get_tweets(opp['id'])
+        for i, row in enumerate(rows):
+            microsaas_score = float(breakdowns['total'][i])
+            scores.append((microsaas_score, row['id']))
 
-        if not tweets:
-            continue
-
-        # Get pain analysis for first tweet (primary source)
-        tweet = tweets[0]
-        pain = PainAnalysis.get_by_tweet(tweet['id'])
-
-        if not pain:
-            continue
+            opp = {
+                'id': row['id'],
+                'title': row['title'],
+                'old_score': row['score'],
+                'new_score': microsaas_score,
+                'breakdown': {name: values[i].item() for name, values in breakdowns.items()}
+            }
+            change = microsaas_score - row['score']
 
-        # Calculate MicroSaaS score
-        microsaas_score = calculate_microsaas_score(opp, pain)
-        breakdown = get_microsaas_breakdown(opp, pain)
+            for heap, key in ((top, microsaas_score), (gainers, change), (losers, -change)):
+                entry = (key, -row['id'], opp)
+                if len(heap) < REPORT_SIZE:
+                    heapq.heappush(heap, entry)
+                else:
+                    heapq.heappushpop(heap, entry)
 
-        # Update opportunity score in database
-        from backend.models import get_db_path, get_db_connection
+        write_scores(scores)
+        rescored += len(rows)
+        print(f"  Re-scored {rescored} opportunities...")
 
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE opportunities
-                SET score = ?
-                WHERE id = ?
-            ''', (microsaas_score, opp['id']))
-            conn.commit()
-
-        rescored.append({
-            'id': opp['id'],
-            'title': opp['title'],
-            'old_score': opp['score'],
-            'new_score': microsaas_score,
-            'breakdown': breakdown
-        })
-
-    print(f"✅ Re-scored {len(rescored)} opportunities")
+    print()
+    print(f"✅ Re-scored {rescored} opportunities")
     print()
 
     # Show biggest changes
-    rescored_sorted = sorted(rescored, key=lambda x: x['new_score'], reverse=True)
+    rescored_sorted = [opp for _, _, opp in sorted(top, reverse=True)]
 
     print("=" * 70)
     print("TOP 10 MICROSAAS OPPORTUNITIES (NEW SCORES)")
@@ -112,7 +202,7 @@ def rescore_all_opportunities():
     print("=" * 70)
     print()
 
-    gainers = sorted(rescored, key=lambda x: x['new_score'] - x['old_score'], reverse=True)
+    gainers = [opp for _, _, opp in sorted(gainers, reverse=True)]
 
     for i, opp in enumerate(gainers[:5], 1):
         change = opp['new_score'] - opp['old_score']
@@ -130,7 +220,7 @@ def rescore_all_opportunities():
     print("=" * 70)
     print()
 
-    losers = sorted(rescored, key=lambda x: x['new_score'] - x['old_score'])
+    losers = [opp for _, _, opp in sorted(losers, reverse=True)]
 
     for i, opp in enumerate(losers[:5], 1):
         change = opp['new_score'] - opp['old_score']
@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """A new database with the current schema at a temporary path."""
+    from init_database import init_database
+
+    path = tmp_path / 'test.db'
+    monkeypatch.setenv('DATABASE_PATH', str(path))
+    init_database()
+    return path
@@ -0,0 +1,47 @@
+"""AnalysisCache limits: 0 turns off expiry and the size bound."""
+
+from backend.analysis_cache import AnalysisCache, normalize_text, normalized_windows
+from backend.models import get_db_connection
+
+
+def age_entries(days):
+    with get_db_connection() as conn:
+        conn.execute(f"UPDATE pain_analysis_cache SET created_at = DATETIME('now', '-{days} days')")
+        conn.commit()
+
+
+def test_ttl_zero_never_expires(database):
+    cache = AnalysisCache(max_entries=10, ttl_days=0)
+    cache.put('so frustrating', {'frustration_score': 3})
+    age_entries(1000)
+
+    assert cache.get('so frustrating') == {'frustration_score': 3}
+    assert cache.evict() == 0
+
+
+def test_max_entries_zero_is_unbounded(database):
+    cache = AnalysisCache(max_entries=0, ttl_days=30)
+    for i in range(5):
+        cache.put(f'text {i}', {'i': i})
+
+    assert cache.evict() == 0
+    assert all(cache.get(f'text {i}') == {'i': i} for i in range(5))
+
+
+def test_limits_still_apply(database):
+    cache = AnalysisCache(max_entries=2, ttl_days=30)
+    for i in range(3):
+        cache.put(f'text {i}', {'i': i})
+
+    assert cache.evict() == 1
+
+    age_entries(31)
+    assert cache.get('text 2') is None
+    assert cache.evict() == 2
+
+
+def test_normalized_windows_match_normalize_text():
+    texts = ['  so\r\nfrustrating \r\n', '\r\r\n\t$500/month\r', '   ', 'a \r\n b', '']
+    for text in texts:
+        for window_size in (1, 2, 3, 64):
+            assert ''.join(normalized_windows(text, window_size)) == normalize_text(text)
@@ -0,0 +1,78 @@
+"""/api/opportunities: bare list body, cursor pagination via X-Next-Cursor."""
+
+import pytest
+
+from backend import models
+from backend.ingest import ingest_post
+
+
+@pytest.fixture
+def client(database, monkeypatch):
+    """Flask test client; restores the connection default app.py switches to read-only."""
+    monkeypatch.setattr(models, '_read_only_default', False)
+    from app import app
+    models.set_read_only_connections(False)
+    return app.test_client()
+
+
+def add_opportunities(count):
+    """Store count opportunities with many tied scores; return their ids."""
+    ids = set()
+
+    for i in range(count):
+        stored = ingest_post(
+            {'tweet_id': str(i), 'text': f'post {i}', 'created_at': '2026-01-01T00:00:00',
+             'source': 'twitter', 'external_id': str(i)},
+            {'frustration_score': 5, 'budget_signal_score': 5, 'pain_keywords': []},
+            opportunity={'title': f'Opportunity {i}', 'description': f'post {i}',
+                         'score': 50 + i % 3},
+        )
+        ids.add(stored['opportunity_id'])
+
+    return ids
+
+
+def test_single_page_is_a_list_without_cursor(client):
+    ids = add_opportunities(3)
+
+    response = client.get('/api/opportunities?limit=10')
+
+    assert response.status_code == 200
+    assert {opp['id'] for opp in response.get_json()} == ids
+    assert 'X-Next-Cursor' not in response.headers
+
+
+def test_cursor_pages_cover_everything_once(client):
+    ids = add_opportunities(23)
+
+    seen = []
+    cursor = None
+    pages = 0
+
+    while True:
+        url = '/api/opportunities?limit=5'
+        if cursor:
+            url += f'&cursor={cursor}'
+        response = client.get(url)
+        assert response.status_code == 200
+
+        page = response.get_json()
+        assert isinstance(page, list)
+        seen.extend(opp['id'] for opp in page)
+        pages += 1
+
+        scores = [(opp['score'], opp['tweet_count'], opp['id']) for opp in page]
+        assert scores == sorted(scores, reverse=True)
+
+        cursor = response.headers.get('X-Next-Cursor')
+        if cursor is None:
+            break
+
+    assert pages == 5
+    assert len(seen) == len(set(seen))
+    assert set(seen) == ids
+
+
+def test_bad_cursor_is_rejected(client):
+    response = client.get('/api/opportunities?cursor=not-a-cursor')
+    assert response.status_code == 400
@@ -0,0 +1,73 @@
+"""Trigger-maintained opportunity counters agree with direct COUNT / MAX."""
+
+from backend.ingest import ingest_post
+from backend.models import Opportunity, get_db_connection
+
+ANALYSIS = {'frustration_score': 5, 'budget_signal_score': 5, 'pain_keywords': []}
+
+
+def post(external_id, likes):
+    return {
+        'tweet_id': external_id, 'text': f'post {external_id}', 'created_at': '2026-01-01T00:00:00',
+        'likes': likes, 'retweets': 0, 'replies': 0,
+        'source': 'twitter', 'external_id': external_id,
+    }
+
+
+def opportunity(title):
+    return {'title': title, 'description': title, 'score': 50}
+
+
+def assert_counters_match():
+    with get_db_connection() as conn:
+        rows = conn.execute("""
+            SELECT o.id, o.tweet_count, o.max_engagement,
+                   (SELECT COUNT(*) FROM opportunity_tweets ot WHERE ot.opportunity_id = o.id),
+                   (SELECT COALESCE(MAX(t.engagement_score), 0) FROM opportunity_tweets ot
+                    JOIN posts t ON t.id = ot.tweet_id WHERE ot.opportunity_id = o.id)
+            FROM opportunities o
+        """).fetchall()
+
+    assert rows
+    for opportunity_id, tweet_count, max_engagement, count, max_score in rows:
+        assert (tweet_count, max_engagement) == (count, max_score), opportunity_id
+
+
+def test_counters_follow_inserts_attaches_and_deletes(database):
+    first = ingest_post(post('1', 10), ANALYSIS, opportunity=opportunity('first'))
+    second = ingest_post(post('2', 3), ANALYSIS, opportunity=opportunity('second'))
+    assert_counters_match()
+
+    # Near-duplicates attached through ingest_post
+    attached = ingest_post(post('3', 25), attach_to=first['tweet_id'])
+    ingest_post(post('4', 1), attach_to=second['tweet_id'])
+    assert_counters_match()
+
+    # Linking through the model, including a link that already exists
+    Opportunity.add_tweet(second['opportunity_id'], attached['tweet_id'])
+    Opportunity.add_tweets_many([(second['opportunity_id'], attached['tweet_id']),
+                                 (first['opportunity_id'], second['tweet_id'])])
+    assert_counters_match()
+
+    # Unlinking the post with the highest engagement lowers max_engagement
+    with get_db_connection() as conn:
+        conn.execute("DELETE FROM opportunity_tweets WHERE tweet_id = ?", (attached['tweet_id'],))
+        conn.commit()
+    assert_counters_match()
+
+    with get_db_connection() as conn:
+        conn.execute("DELETE FROM opportunity_tweets WHERE opportunity_id = ?", (second['opportunity_id'],))
+        conn.commit()
+        assert conn.execute("SELECT tweet_count, max_engagement FROM opportunities WHERE id = ?",
+                            (second['opportunity_id'],)).fetchone()[:] == (0, 0)
+    assert_counters_match()
+
+
+def test_engagement_update_raises_max_engagement(database):
+    stored = ingest_post(post('1', 10), ANALYSIS, opportunity=opportunity('first'))
+
+    with get_db_connection() as conn:
+        conn.execute("UPDATE posts SET engagement_score = 40 WHERE id = ?", (stored['tweet_id'],))
+        conn.commit()
+
+    assert_counters_match()
@@ -0,0 +1,82 @@
+"""ingest_post writes a post and everything derived from it atomically."""
+
+import pytest
+
+from backend.ingest import ingest_post
+from backend.models import get_db_connection
+from backend.pain_detector import analyze_pain
+
+TABLES = ['posts', 'pain_analysis', 'post_features', 'opportunities', 'opportunity_tweets']
+
+
+def post(external_id, text='So frustrating, I would pay $50/month for a fix'):
+    return {
+        'tweet_id': external_id, 'text': text, 'created_at': '2026-01-01T00:00:00',
+        'author_username': 'someone', 'author_followers': 0,
+        'likes': 0, 'retweets': 0, 'replies': 0,
+        'source': 'twitter', 'external_id': external_id,
+    }
+
+
+def opportunity(score=50):
+    return {'title': 'Invoicing', 'description': 'Invoicing is painful', 'score': score}
+
+
+def counts():
+    with get_db_connection() as conn:
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in TABLES}
+
+
+def test_stores_everything(database):
+    stored = ingest_post(post('1'), analyze_pain(post('1')['text']), opportunity=opportunity())
+
+    assert stored['opportunity_id'] is not None
+    assert counts() == dict.fromkeys(TABLES, 1)
+
+
+def test_rolls_back_when_a_later_step_fails(database):
+    # The opportunity insert fails after the post and its analysis are written
+    with pytest.raises(KeyError):
+        ingest_post(post('1'), analyze_pain(post('1')['text']),
+                    opportunity={'title': 'No score', 'description': ''})
+
+    assert counts() == dict.fromkeys(TABLES, 0)
+
+    # The connection is usable again afterwards
+    assert ingest_post(post('1'), analyze_pain(post('1')['text']), opportunity=opportunity())
+
+
+def test_duplicate_returns_none(database):
+    analysis = analyze_pain(post('1')['text'])
+    assert ingest_post(post('1'), analysis, opportunity=opportunity()) is not None
+
+    # Same (source, external_id): ON CONFLICT DO NOTHING RETURNING yields no row
+    assert ingest_post(post('1', 'Different text'), analysis, opportunity=opportunity()) is None
+    assert counts() == dict.fromkeys(TABLES, 1)
+
+
+def test_attach_to_links_the_original_opportunities(database):
+    original = ingest_post(post('1'), analyze_pain(post('1')['text']), opportunity=opportunity())
+
+    attached = ingest_post(post('2'), attach_to=original['tweet_id'])
+
+    assert attached['opportunity_id'] is None
+    with get_db_connection() as conn:
+        linked = conn.execute(
+            "SELECT opportunity_id FROM opportunity_tweets WHERE tweet_id = ?",
+            (attached['tweet_id'],)
+        ).fetchall()
+        assert [row[0] for row in linked] == [original['opportunity_id']]
+
+        # Near-duplicates aren't analyzed
+        assert conn.execute(
+            "SELECT COUNT(*) FROM pain_analysis WHERE tweet_id = ?", (attached['tweet_id'],)
+        ).fetchone()[0] == 0
+
+
+def test_attach_to_unlinked_post_stores_nothing(database):
+    original = ingest_post(post('1'), analyze_pain(post('1')['text']))
+    assert original['opportunity_id'] is None
+
+    assert ingest_post(post('2'), attach_to=original['tweet_id']) is None
+    assert counts()['posts'] == 1
@@ -0,0 +1,104 @@
+"""Stored-feature MicroSaaS scores must match scoring the text."""
+
+import pytest
+
+from backend.features import backfill_features, backfill_seo_masks, score_opportunities_microsaas
+from backend.ingest import ingest_post
+from backend.microsaas_scoring import calculate_microsaas_score, get_scorer
+from backend.models import get_db_connection
+from backend.pain_detector import analyze_pain
+
+# (post text, opportunity title, opportunity description)
+CASES = [
+    # SEO points come only from the post's pain keywords ('frustrating')
+    ("This is so frustrating, I hate it",
+     "Project tool complaints", "Users complain about their project tool"),
+    # Phrase in both the description and the keywords counts once
+    ("So frustrating, invoice tracking is manual and slow",
+     "Invoice tracking", "Frustrating manual invoice tracking for small business"),
+    # Intent and B2B phrases from the title and description only
+    ("Any software for freight compliance reporting? Paying $99/mo already",
+     "Software for freight compliance", "Daily reporting API with a dashboard"),
+    ("Nice weather today", "Weather", "Nothing to see here"),
+]
+
+
+def ingest_cases():
+    """Store every case; return {opportunity_id: expected text-based breakdown}."""
+    scorer = get_scorer()
+    expected = {}
+
+    for i, (text, title, description) in enumerate(CASES):
+        analysis = analyze_pain(text)
+        stored = ingest_post(
+            {'tweet_id': str(1000 + i), 'text': text, 'created_at': '2026-01-01 00:00:00',
+             'source': 'twitter'},
+            analysis,
+            opportunity={'title': title, 'description': description, 'score': 50},
+        )
+        expected[stored['opportunity_id']] = scorer.score(
+            {'title': title, 'description': description},
+            {'frustration_score': analysis['frustration_score'],
+             'budget_signal_score': analysis['budget_signal_score'],
+             'pain_keywords': analysis['pain_keywords']},
+        )
+
+    return expected
+
+
+def assert_matches(expected, scores):
+    assert sorted(scores['opportunity_id'].tolist()) == sorted(expected)
+
+    for i, opportunity_id in enumerate(scores['opportunity_id'].tolist()):
+        for component, value in expected[opportunity_id].items():
+            assert scores[component][i] == pytest.approx(value), (opportunity_id, component)
+
+
+def test_stored_features_match_text_scoring(database):
+    expected = ingest_cases()
+    scores = score_opportunities_microsaas()
+
+    assert_matches(expected, scores)
+
+    first = scores['opportunity_id'].tolist().index(min(expected))
+    assert scores['seo_potential'][first] == 2
+    assert scores['total'][first] == pytest.approx(8.0)
+
+
+def test_backfilled_masks_match_text_scoring(database):
+    expected = ingest_cases()
+    score_opportunities_microsaas()
+
+    with get_db_connection() as conn:
+        conn.execute("""
+            UPDATE post_features
+            SET keyword_intent_mask = 0, keyword_problem_mask = 0, keyword_b2b_mask = 0
+        """)
+        conn.execute("UPDATE opportunity_features SET intent_mask = 0, problem_mask = 0, b2b_mask = 0")
+        conn.commit()
+
+        backfill_seo_masks(conn, pause=0)
+
+    assert_matches(expected, score_opportunities_microsaas())
+
+
+def test_backfilled_features_match_text_scoring(database):
+    expected = ingest_cases()
+
+    with get_db_connection() as conn:
+        conn.execute("DELETE FROM post_features")
+        conn.execute("DELETE FROM opportunity_features")
+        conn.commit()
+
+        assert backfill_features(conn, pause=0) == 2 * len(CASES)
+
+    assert_matches(expected, score_opportunities_microsaas())
+
+
+def test_total_matches_breakdown():
+    scorer = get_scorer()
+
+    for text, title, description in CASES:
+        opportunity = {'title': title, 'description': description}
+        analysis = analyze_pain(text)
+        assert calculate_microsaas_score(opportunity, analysis) == scorer.score(opportunity, analysis)['total']
@@ -0,0 +1,15 @@
+"""The dashboard queries must search their indexes (see backend/indexes.py)."""
+
+from backend.indexes import check_query_plans
+
+
+def test_dashboard_queries_use_their_indexes(database):
+    from init_database import add_sample_data
+
+    add_sample_data()
+
+    results = check_query_plans()
+
+    assert results
+    for result in results:
+        assert result['ok'], f"{result['name']} doesn't use {result['index']}: {result['plan']}"
@@ -0,0 +1,72 @@
+"""Daily rollup tables agree with direct COUNTs over opportunities and posts."""
+
+import pytest
+
+from backend.ingest import ingest_post
+from backend.models import Opportunity, get_db_connection
+from backend.rollups import OPPORTUNITY_KEY, POST_KEY, rebuild_rollups
+
+ANALYSIS = {'frustration_score': 5, 'budget_signal_score': 5, 'pain_keywords': []}
+
+
+def add(external_id, source, score):
+    return ingest_post(
+        {'tweet_id': external_id, 'text': f'post {external_id}', 'created_at': '2026-01-01T00:00:00',
+         'source': source, 'external_id': external_id},
+        ANALYSIS,
+        opportunity={'title': external_id, 'description': external_id, 'score': score},
+    )
+
+
+def assert_rollups_match():
+    with get_db_connection() as conn:
+        rollup = set(conn.execute("""
+            SELECT day, source, score_band, opportunities, score_sum
+            FROM opportunity_daily_stats WHERE opportunities != 0
+        """).fetchall())
+        direct = set(conn.execute(f"""
+            SELECT {OPPORTUNITY_KEY.format(row='o')}, COUNT(*), SUM(o.score)
+            FROM opportunities o GROUP BY 1, 2, 3
+        """).fetchall())
+        assert {tuple(row) for row in rollup} == {tuple(row) for row in direct}
+
+        rollup = conn.execute("SELECT day, source, posts FROM post_daily_stats WHERE posts != 0").fetchall()
+        direct = conn.execute(f"SELECT {POST_KEY.format(row='t')}, COUNT(*) FROM posts t GROUP BY 1, 2").fetchall()
+        assert {tuple(row) for row in rollup} == {tuple(row) for row in direct}
+
+
+def test_rollups_follow_inserts_updates_and_deletes(database):
+    stored = [add(str(i), source, score) for i, (source, score) in enumerate([
+        ('twitter', 42), ('twitter', 47), ('reddit', 55), ('hackernews', 91), ('reddit', 100),
+    ])]
+    assert_rollups_match()
+
+    with get_db_connection() as conn:
+        # Moves between score bands and sources
+        conn.execute("UPDATE opportunities SET score = 68 WHERE id = ?", (stored[0]['opportunity_id'],))
+        conn.execute("UPDATE opportunities SET source = 'github' WHERE id = ?", (stored[2]['opportunity_id'],))
+        conn.execute("DELETE FROM opportunities WHERE id = ?", (stored[3]['opportunity_id'],))
+        conn.execute("DELETE FROM posts WHERE id = ?", (stored[4]['tweet_id'],))
+        conn.commit()
+    assert_rollups_match()
+
+    with get_db_connection() as conn:
+        rebuild_rollups(conn, pause=0)
+    assert_rollups_match()
+
+
+@pytest.mark.parametrize('min_score', [0, 40, 45, 50, 100])
+def test_stats_match_direct_counts(database, min_score):
+    for i, (source, score) in enumerate([('twitter', 42), ('twitter', 47), ('reddit', 55),
+                                         ('hackernews', 91), ('reddit', 100)]):
+        add(str(i), source, score)
+
+    stats = Opportunity.get_stats(min_score=min_score, days=7)
+
+    with get_db_connection() as conn:
+        rows = conn.execute("SELECT source, score FROM opportunities WHERE score >= ?", (min_score,)).fetchall()
+
+    assert stats['total'] == len(rows)
+    assert stats['sources'] == {source: sum(1 for row in rows if row[0] == source)
+                                for source in {row[0] for row in rows}}
+    assert stats['avg_score'] == pytest.approx(sum(row[1] for row in rows) / len(rows) if rows else 0)
@@ -0,0 +1,27 @@
+"""Search snippets are HTML-escaped around their <mark> tags."""
+
+from backend.ingest import ingest_post
+from backend.search import search_opportunities, search_posts
+
+
+def post(external_id, text):
+    return {
+        'tweet_id': external_id, 'text': text, 'created_at': '2026-01-01T00:00:00',
+        'author_username': 'someone', 'author_followers': 0,
+        'likes': 0, 'retweets': 0, 'replies': 0,
+        'source': 'twitter', 'external_id': external_id,
+    }
+
+
+def test_snippets_escape_post_text(database):
+    text = 'Invoicing <script>alert(1)</script> is so painful & slow'
+    ingest_post(post('1', text), opportunity={'title': 'Invoicing', 'description': text, 'score': 50})
+
+    [result] = search_posts('invoicing')['results']
+    assert result['snippet'] == (
+        '<mark>Invoicing</mark> &lt;script&gt;alert(1)&lt;/script&gt; is so painful &amp; slow'
+    )
+
+    [result] = search_opportunities('painful')['results']
+    assert '<script>' not in result['snippet']
+    assert '<mark>painful</mark>' in result['snippet']